@@ -0,0 +1,63 @@
+# Throughput and latency of hipy.aio under concurrency, against a local replay server (see hipy.replay) serving
+# synthetic pages with a fixed response time, and the largest stall of the event loop while the stars are downloaded.
+# The cache is disabled, so that every page goes through HTTP.
+# Usage: python benchmarks/bench_aio.py [number of stars] [latency of the server in seconds]
+import os
+import sys
+import time
+import asyncio
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, aio, replay
+
+# Largest delay of a task that wakes up every 5 ms, until stop is set.
+async def _lag(stop, result):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        result.append(time.perf_counter() - start - 0.005)
+
+async def _run(hips, concurrency, executor=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(hip):
+        async with semaphore:
+            start = time.perf_counter()
+            await aio.get_data(hip, 'intermediate', executor=executor)
+            latencies.append(time.perf_counter() - start)
+
+    stop, lag = asyncio.Event(), []
+    ticker = asyncio.create_task(_lag(stop, lag))
+    start = time.perf_counter()
+    await asyncio.gather(*[one(hip) for hip in hips])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, np.array(latencies), max(lag)
+
+def main(n_stars=200, latency=0.05):
+    recorded = tempfile.mkdtemp(prefix='hipy-bench-')
+    cache.configure(cache_dir=recorded, offline=False)
+    hips = list(range(1, n_stars+1))
+    for hip in hips:
+        cache.store('hipiId', hip, pages.intermediate_page(hip))
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), enabled=False, pool_size=64)
+    with replay.replaying(recorded, latency=latency) as server:
+        print(f'{n_stars} intermediate data pages, server latency {latency*1000:.0f} ms')
+        for concurrency in (1, 8, 32, 64):
+            elapsed, latencies, lag = asyncio.run(_run(hips, concurrency))
+            print(f'concurrency {concurrency:3d}: {n_stars/elapsed:6.1f} stars/s, latency p50 {np.median(latencies)*1000:6.1f} ms, '
+                  f'p95 {np.percentile(latencies, 95)*1000:6.1f} ms, largest loop stall {lag*1000:5.1f} ms')
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            elapsed, latencies, lag = asyncio.run(_run(hips, 32, executor))
+        print(f'concurrency  32, parsed by {os.cpu_count()} processes: {n_stars/elapsed:6.1f} stars/s, latency p50 '
+              f'{np.median(latencies)*1000:6.1f} ms, p95 {np.percentile(latencies, 95)*1000:6.1f} ms, largest loop stall {lag*1000:5.1f} ms')
+        print(f'{server.requests} requests served')
+
+if __name__ == '__main__':
+    main(*[float(x) if i else int(x) for i, x in enumerate(sys.argv[1:])])
@@ -0,0 +1,28 @@
+# Throughput of the light-curve atlas: stars per second for PDF pages of 12 panels, on one process and on all the
+# cores, from synthetic hipepId pages served from a temporary cache, and the time extrapolated to the 118 218 stars
+# of the catalogue.
+# Usage: python benchmarks/bench_atlas.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, plot_lightcurve
+
+def main(n_stars=120):
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), offline=True)
+    for hip in range(1, n_stars+1):
+        cache.store('hipepId', hip, pages.epd_page(hip))
+    with tempfile.TemporaryDirectory() as directory:
+        plot_lightcurve.atlas(range(1, 13), directory, max_workers=1)  # warm up imports and fonts
+        for max_workers in sorted({1, os.cpu_count()}):
+            start = time.perf_counter()
+            files, index = plot_lightcurve.atlas(range(1, n_stars+1), directory, max_workers=max_workers)
+            elapsed = time.perf_counter() - start
+            print(f'{max_workers} process(es): {n_stars/elapsed:.1f} stars/s ({len(files)} pages), '
+                  f'whole catalogue in {118218/(n_stars/elapsed)/60:.0f} min')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
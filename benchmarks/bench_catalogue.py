@@ -0,0 +1,73 @@
+# Cost of the local catalogue: ingestion of a synthetic hip_main.dat, and the catalogue row of one star from the store
+# against the parse of its hipId page. Both must give the same table: the rows of a few stars (single stars and stars
+# of each DMSA solution type) are compared column by column (names, kinds of dtype, units, values, descriptions) before
+# they are timed; the text columns of the store are as wide as their longest value in the whole catalogue. Both are timed
+# as a QTable and as a structured array (best of 3 runs): the QTable build is the same for both and takes most of the
+# time, the structured array shows the lookup itself. The store must be faster than the page parser as a structured
+# array: otherwise the benchmark fails (exit status 1).
+# Usage: python benchmarks/bench_catalogue.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import numpy as np
+import pages
+from hipy import download, catalogue
+
+def same(a, b):
+    if a.colnames != b.colnames or dict(a.meta) != dict(b.meta):
+        return False
+    for name in a.colnames:
+        x, y = a[name], b[name]
+        if getattr(x, 'unit', None) != getattr(y, 'unit', None) or x.dtype.kind != y.dtype.kind:
+            return False
+        if x.dtype.kind == 'f':
+            if not np.array_equal(getattr(x, 'value', x), getattr(y, 'value', y), equal_nan=True):
+                return False
+        elif list(x) != list(y):
+            return False
+    return True
+
+def per_star(f, hips, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for hip in hips:
+            f(hip)
+        best = min(best, (time.perf_counter() - start)/len(hips))
+    return best
+
+_flags = ' CGOVX'
+
+def main(n_stars=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        flag = lambda hip: _flags[hip % len(_flags)]
+        with open(os.path.join(tmp, 'hip_main.dat'), 'w') as f:
+            for hip in range(1, n_stars+1):
+                f.write(pages.hip_main_line(hip, flag(hip)) + '\n')
+        start = time.perf_counter()
+        store = catalogue.ingest(os.path.join(tmp, 'hip_main.dat'), os.path.join(tmp, 'store'))
+        print(f'ingest: {len(store)} stars in {time.perf_counter() - start:.2f} s')
+
+        hips = range(1, min(n_stars, 2000)+1)
+        webpages = {hip:pages.catalogue_page(hip, flag(hip)) for hip in hips}
+        fetch = lambda kind, HIP: webpages[HIP]
+        for hip in list(hips)[:2*len(_flags)]:
+            assert same(store.table(hip), download._get_catalogue(hip, fetch)), f'HIP {hip}: the store and the page differ'
+
+        times = {}
+        for output in ('qtable', 'numpy'):
+            times[output] = [per_star(lambda hip: download._get_catalogue(hip, fetch, output), hips),
+                             per_star(lambda hip: store.table(hip, output), hips)]
+            print(f'one star as {output}: page parse {times[output][0]*1e6:.0f} µs, store row {times[output][1]*1e6:.0f} µs')
+        del store
+        catalogue._stores.clear()
+    parse, row = times['numpy']
+    if row >= parse:
+        print('the store is not faster than the page parser')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
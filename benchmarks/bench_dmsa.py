@@ -0,0 +1,53 @@
+# Cost of parsing the DMSA/C pages (component solutions) with the table-driven parser, against the former parser with
+# one hardcoded block per number of components (legacy_dmsa.py). Both parse the same lines, and their tables are compared
+# column by column (names, units, values, descriptions) before they are timed.
+# The pages are synthetic (pages.dmsa_page), with 2, 3 and 4 components, with and without a second solution.
+# Usage: python benchmarks/bench_dmsa.py [pages per number of components]
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import numpy as np
+import pages
+import legacy_dmsa
+from hipy import page, dmsa
+
+def same(a, b):
+    if a.colnames != b.colnames or dict(a.meta) != dict(b.meta):
+        return False
+    for name in a.colnames:
+        x, y = a[name], b[name]
+        if getattr(x, 'unit', None) != getattr(y, 'unit', None) or x.dtype != y.dtype:
+            return False
+        if x.dtype.kind == 'f':
+            if not np.allclose(getattr(x, 'value', x), getattr(y, 'value', y), rtol=0, atol=0, equal_nan=True):
+                return False
+        elif list(x) != list(y):
+            return False
+    return True
+
+# The table-driven parser: the schema and the values of the solution, then its one-row QTable, as dmsa._solution.
+def component_solution(text):
+    schema, values = dmsa._component_values(text)
+    return schema.table(schema.parse([values]))
+
+def per_page(f, texts):
+    start = time.perf_counter()
+    for text in texts:
+        f(text)
+    return (time.perf_counter() - start)/len(texts)*1e6
+
+def main(n_pages=500):
+    print(f'{n_pages} pages per number of components, µs/page')
+    print(f'{"n_c":>3s} {"table-driven":>13s} {"hardcoded (old)":>16s}')
+    for n_c in (2, 3, 4):
+        texts = [page.pre_lines(pages.dmsa_page(hip, 'C', n_c=n_c, second=hip % 2 == 0)) for hip in range(1, n_pages+1)]
+        for text in texts[:20]:
+            assert same(component_solution(text), legacy_dmsa.component_solution(text)), f'{n_c} components: tables differ'
+        new = per_page(component_solution, texts)
+        old = per_page(legacy_dmsa.component_solution, texts)
+        print(f'{n_c:3d} {new:13.1f} {old:16.1f}')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
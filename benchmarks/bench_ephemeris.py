@@ -0,0 +1,40 @@
+# Time of the earth ephemeris (cearth), the parallax factors and the date conversions (yr2jd) over many epochs,
+# array calls against the former one-call-per-epoch loop (timed on a subset and scaled up).
+# Usage: python benchmarks/bench_ephemeris.py [number of epochs]
+import os
+import sys
+import math
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hipy import download
+
+def _timed(f, *args):
+    start = time.perf_counter()
+    out = f(*args)
+    return out, time.perf_counter() - start
+
+def main(n_epochs=10**6, n_loop=10**4):
+    years = np.random.default_rng(1).uniform(1989.8, 1993.3, n_epochs)
+    ra, dec = 123.4, -56.7
+
+    xyz, t_earth = _timed(download.cearth, years)
+    (pa, pd), t_factors = _timed(download.parallax_factors, ra, dec, years)
+    jd, t_jd = _timed(download.yr2jd, years)
+
+    sub = years[:n_loop]
+    loop_xyz, t_loop_earth = _timed(lambda: np.array([download.cearth(float(t)) for t in sub]))
+    loop_jd, t_loop_jd = _timed(lambda: np.array([download.yr2jd(float(t)) for t in sub]))
+    assert np.allclose(loop_xyz, xyz[:n_loop], rtol=0, atol=1e-12)
+    assert np.allclose(loop_jd, jd[:n_loop], rtol=0, atol=1e-6)
+    d2r = math.pi/180
+    assert np.allclose(pa, xyz[:,0]*math.sin(ra*d2r) - xyz[:,1]*math.cos(ra*d2r))
+
+    scale = n_epochs/n_loop
+    print(f'{n_epochs} epochs')
+    print(f'cearth:           {t_earth*1e3:8.1f} ms   (loop: {t_loop_earth*scale*1e3:8.1f} ms)')
+    print(f'parallax_factors: {t_factors*1e3:8.1f} ms')
+    print(f'yr2jd:            {t_jd*1e3:8.1f} ms   (loop: {t_loop_jd*scale*1e3:8.1f} ms)')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,55 @@
+# Export of the epoch photometry of many stars from synthetic hipepId pages: write one dataset with export.Writer, then
+# read two of its columns back, against a pickle of the list of tables. Parquet and Arrow are timed if pyarrow is installed.
+# Usage: python benchmarks/bench_export.py [number of stars]
+import os
+import sys
+import time
+import pickle
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, export, download
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, dirs, files in os.walk(path) for f in files)
+
+def main(n_stars=2000):
+    directory = tempfile.mkdtemp(prefix='hipy-bench-')
+    cache.configure(cache_dir=directory, offline=True)
+    for hip in range(1, n_stars+1):
+        cache.store('hipepId', hip, pages.epd_page(hip))
+    tables, errors = download.get_data_many(range(1, n_stars+1), 'epd')
+    print(f'{n_stars} stars, {sum(len(t) for t in tables)} transits')
+
+    path = os.path.join(directory, 'epd.pkl')
+    start = time.perf_counter()
+    with open(path, 'wb') as f:
+        pickle.dump(tables, f)
+    written = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        pickle.load(f)
+    print(f'pickle: write {written:.2f} s, read {time.perf_counter()-start:.2f} s, {_size(path)/1e6:.1f} MB')
+
+    try:
+        import pyarrow
+        suffixes = ['', '.parquet', '.arrow']
+    except ImportError:
+        suffixes = ['']
+    for suffix in suffixes:
+        path = os.path.join(directory, 'epd' + suffix)
+        start = time.perf_counter()
+        with export.Writer(path) as writer:
+            for hip, table in enumerate(tables, 1):
+                writer.write(table, hip=hip)
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        export.read(path, columns=['hip','hp'])
+        print(f'{export._format(path)}: write {written:.2f} s, read hip and hp {time.perf_counter()-start:.3f} s, '
+              f'{_size(path)/1e6:.1f} MB')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,59 @@
+# Time and peak memory of the intermediate data table per star, with the record-array parser against the former
+# parser built on np.insert and list comprehensions (legacy_intermediate.py). Both parse the same synthetic pages, and
+# their tables are compared column by column (names, units, values, descriptions) before they are timed. The former
+# parser kept every column as strings until the end: its orbit numbers are compared as integers.
+# Usage: python benchmarks/bench_intermediate.py [number of stars] [abscissa records per star]
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import numpy as np
+import pages
+import legacy_intermediate
+from hipy import download
+
+def new(webpage):
+    return download._intermediate_table(*download._parse_intermediate(webpage))
+
+def same(a, b):
+    if a.colnames != b.colnames or dict(a.meta) != dict(b.meta):
+        return False
+    for name in a.colnames:
+        x, y = a[name], b[name]
+        if getattr(x, 'unit', None) != getattr(y, 'unit', None):
+            return False
+        x, y = np.asarray(getattr(x, 'value', x)), np.asarray(getattr(y, 'value', y))
+        if x.dtype.kind == 'f':
+            # The former parser computed obs_ra and obs_dec star by star with math: they agree to rounding.
+            if not np.allclose(x, y.astype(float), rtol=1e-13, atol=0, equal_nan=True):
+                return False
+        elif list(x) != list(y.astype(x.dtype)):
+            return False
+    return True
+
+def per_star(f, webpages):
+    f(webpages[0])  # warm up imports
+    start = time.perf_counter()
+    for webpage in webpages:
+        f(webpage)
+    elapsed = (time.perf_counter() - start)/len(webpages)
+    tracemalloc.start()
+    f(webpages[0])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main(n_stars=200, n_orbits=60):
+    webpages = [pages.intermediate_page(hip, n_orbits) for hip in range(1, n_stars+1)]
+    for webpage in webpages[:20]:
+        assert same(new(webpage), legacy_intermediate.intermediate_table(webpage)), 'tables differ'
+    n_rows = len(new(webpages[0]))
+    print(f'intermediate: {n_stars} stars, {n_rows} records/star')
+    for label, f in (('record array', new), ('np.insert (old)', legacy_intermediate.intermediate_table)):
+        elapsed, peak = per_star(f, webpages)
+        print(f'{label:16s} {elapsed*1e3:8.2f} ms/star, peak {peak/1024:6.0f} KiB/star')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,52 @@
+# Cost of the local intermediate data store: ingestion of synthetic IAD files, the records of one star from the store
+# (views of the memory maps) against the parse of its hipiId page, and vectorised passes over all the records.
+# Usage: python benchmarks/bench_intermediate_store.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import page, download, intermediate
+
+def main(n_stars=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        webpages = {hip:pages.intermediate_page(hip) for hip in range(1, n_stars+1)}
+        with open(os.path.join(tmp, 'hip_iad.dat'), 'w') as f:
+            for webpage in webpages.values():
+                f.write(page.pre_text(webpage))
+        start = time.perf_counter()
+        store = intermediate.ingest(os.path.join(tmp, 'hip_iad.dat'), os.path.join(tmp, 'store'))
+        elapsed = time.perf_counter() - start
+        print(f'ingest: {len(store)} records of {n_stars} stars in {elapsed:.1f} s ({len(store)/elapsed/1e3:.0f} k records/s)')
+
+        hips = range(1, min(n_stars, 2000)+1)
+        start = time.perf_counter()
+        for hip in hips:
+            download._parse_intermediate(webpages[hip])
+        parse = (time.perf_counter() - start)/len(hips)
+        start = time.perf_counter()
+        for hip in hips:
+            store.records_of(hip)
+        view = (time.perf_counter() - start)/len(hips)
+        print(f'one star: page parse {parse*1e6:.0f} µs, store view {view*1e6:.0f} µs')
+
+        start = time.perf_counter()
+        residuals = store.records['absc_residual']
+        rms = np.sqrt(np.mean(np.square(residuals)))
+        elapsed = time.perf_counter() - start
+        print(f'rms residual of all records: {rms:.2f} mas in {elapsed*1e3:.0f} ms')
+
+        orbit = int(store.records['orbit_number'][0])
+        store.orbit_rows(orbit)  # builds the orbit index
+        start = time.perf_counter()
+        rows = store.orbit_rows(orbit)
+        elapsed = time.perf_counter() - start
+        print(f'records of orbit {orbit}: {len(rows)} in {elapsed*1e6:.0f} µs')
+        del store, residuals
+        intermediate._stores.clear()
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,33 @@
+# Throughput of the Keplerian orbit model: (system, epoch) evaluations per second of the eccentric anomaly and of the
+# photocentre displacement, for random DMSA/O-like elements, and the largest residual of Kepler's equation.
+# Usage: python benchmarks/bench_kepler.py [number of systems] [number of epochs]
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hipy import kepler
+
+def main(n_systems=2000, n_epochs=1000):
+    rng = np.random.default_rng(0)
+    elements = {'p':rng.uniform(10, 3000, n_systems), 't':rng.uniform(2447000, 2449000, n_systems),
+                'a0':rng.uniform(1, 50, n_systems), 'e':rng.uniform(0, 0.99, n_systems),
+                'periastron_argument':rng.uniform(0, 360, n_systems), 'i':rng.uniform(0, 180, n_systems),
+                'node_position_angle':rng.uniform(0, 360, n_systems)}
+    epochs = np.linspace(2447860, 2449060, n_epochs)
+    n = n_systems*n_epochs
+
+    M = 2*np.pi*(epochs - elements['t'][:,None])/elements['p'][:,None]
+    start = time.perf_counter()
+    E = kepler.eccentric_anomaly(M, elements['e'][:,None])
+    elapsed = time.perf_counter() - start
+    error = np.abs(E - elements['e'][:,None]*np.sin(E) - (np.remainder(M + np.pi, 2*np.pi) - np.pi)).max()
+    print(f'eccentric anomaly: {n/elapsed/1e6:.1f} M evaluations/s, largest residual {error:.1e} rad')
+
+    start = time.perf_counter()
+    kepler.displacement(elements, epochs)
+    elapsed = time.perf_counter() - start
+    print(f'displacement: {n/elapsed/1e6:.1f} M evaluations/s ({n_systems} systems x {n_epochs} epochs)')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
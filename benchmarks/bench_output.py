@@ -0,0 +1,72 @@
+# Cost of the outputs of get_data, get_dmsa and propagate (see hipy.formats): the QTable with Quantity columns against
+# the structured array and the DataFrame built from the same columns, per star (page parse included) and for the
+# build step alone, and the whole local catalogue as a QTable against a structured array.
+# Usage: python benchmarks/bench_output.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import download, dmsa, propagate, catalogue, formats
+from hipy.star import Star
+
+def per_star(f, hips):
+    f(hips[0])
+    start = time.perf_counter()
+    for hip in hips:
+        f(hip)
+    return (time.perf_counter() - start)/len(hips)
+
+def main(n_stars=300):
+    hips = list(range(1, n_stars+1))
+    webpages = {'hipId':{hip:pages.catalogue_page(hip, 'O') for hip in hips},
+                'hipiId':{hip:pages.intermediate_page(hip) for hip in hips},
+                'hipepId':{hip:pages.epd_page(hip) for hip in hips},
+                'dmId':{hip:pages.dmsa_page(hip, 'O') for hip in hips}}
+    fetch = lambda kind, HIP: webpages[kind][HIP]
+    records = {hip:download._parse_intermediate(webpages['hipiId'][hip]) for hip in hips}
+    stars = {}
+    for hip in hips:
+        stars[hip] = Star(hip)
+        stars[hip]._pages = {kind:webpages[kind][hip] for kind in webpages}
+        stars[hip].intermediate_records
+
+    cases = {'catalogue':lambda hip, output: download._get_catalogue(hip, fetch, output),
+             'intermediate':lambda hip, output: download._intermediate_table(*records[hip], output=output),
+             'epd':lambda hip, output: download._get_epd(hip, fetch, output),
+             'dmsa O':lambda hip, output: dmsa._solution(hip, 'O', fetch, output),
+             'propagate':lambda hip, output: propagate._table(stars[hip], output=output)}
+    print(f'{"µs per star":14s}' + ''.join(f'{output:>10s}' for output in formats.outputs))
+    for case, f in cases.items():
+        times = [per_star(lambda hip: f(hip, output), hips) for output in formats.outputs]
+        print(f'{case:14s}' + ''.join(f'{t*1e6:10.0f}' for t in times) + f'   (numpy {times[0]/times[1]:.1f}x faster)')
+
+    # The build step alone: the columns of the intermediate data of one star are already parsed and derived.
+    p, iad = records[hips[0]]
+    table = download._intermediate_table(p, iad)
+    columns = {name:np.asarray(getattr(table[name], 'value', table[name])) for name in table.colnames}
+    schema = download.intermediate_schema
+    print('intermediate build only: ' + ', '.join(f'{output} {per_star(lambda hip: schema.output(columns, output), hips)*1e6:.0f} µs'
+                                                for output in formats.outputs))
+
+    # The whole local catalogue, from a synthetic hip_main.dat of n_stars*100 stars.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hip_main.dat')
+        row = download._get_catalogue(1, fetch, 'numpy')[0]
+        fields = ['' if str(x) == 'nan' else str(x) for x in row.tolist()]
+        with open(path, 'w') as f:
+            for hip in range(1, n_stars*100+1):
+                f.write('|'.join([fields[0], f'{hip:6d}'] + fields[2:]) + '\n')
+        store = catalogue.ingest(path, os.path.join(tmp, 'store'))
+        for output in ('qtable', 'numpy'):
+            start = time.perf_counter()
+            out = store.table(store['hip'], output)
+            print(f'whole catalogue ({len(out)} stars) as {output}: {time.perf_counter() - start:.3f} s')
+        del store, out
+        catalogue._stores.clear()
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,48 @@
+# Cost of getting the lines of the <pre> block of a page, and of the full parse, for each kind of page.
+# The former extraction (str(bytes) + BeautifulSoup + split on the escaped '\\n') is timed for comparison if bs4 is installed.
+# Usage: python benchmarks/bench_page.py [pages per kind]
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import page, download, dmsa
+
+def legacy_lines(webpage):
+    import bs4
+    soup = bs4.BeautifulSoup(str(webpage), 'html.parser')
+    return soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\n'").split('\\n')
+
+def per_page(f, webpages):
+    start = time.perf_counter()
+    for webpage in webpages:
+        f(webpage)
+    return (time.perf_counter() - start)/len(webpages)*1e6
+
+def main(n_pages=2000):
+    hips = range(1, n_pages+1)
+    kinds = {'catalogue': ([pages.catalogue_page(hip) for hip in hips], lambda w: download._get_catalogue(0, lambda kind, HIP: w)),
+             'intermediate': ([pages.intermediate_page(hip) for hip in hips], download._parse_intermediate),
+             'epd': ([pages.epd_page(hip) for hip in hips], lambda w: download._get_epd(0, lambda kind, HIP: w)),
+             'dmsa C': ([pages.dmsa_page(hip, 'C', n_c=2+hip%3) for hip in hips], lambda w: dmsa._get_dmsa(0, 'C', lambda kind, HIP: w)),
+             'dmsa O': ([pages.dmsa_page(hip, 'O') for hip in hips], lambda w: dmsa._get_dmsa(0, 'O', lambda kind, HIP: w))}
+    try:
+        import bs4
+    except ImportError:
+        bs4 = None
+    print(f'{n_pages} pages per kind, µs/page')
+    print(f'{"kind":14s} {"pre_lines":>10s} {"bs4 (old)":>10s} {"full parse":>11s}')
+    for kind, (webpages, parse) in kinds.items():
+        new = per_page(page.pre_lines, webpages)
+        old = per_page(legacy_lines, webpages) if bs4 is not None else float('nan')
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull  # the DMSA parser prints the solution type
+            try:
+                full = per_page(parse, webpages)
+            finally:
+                sys.stdout = stdout
+        print(f'{kind:14s} {new:10.1f} {old:10.1f} {full:11.1f}')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,49 @@
+# Throughput of the batched Lomb–Scargle period search (stars per second, on one process and on all the cores), on
+# synthetic sinusoidal variables with uneven numbers of transits and flagged transits, from local stores of the epoch
+# photometry and of the catalogue; and the fraction of the periods that agree with var_period.
+# Usage: python benchmarks/bench_periodogram.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, catalogue, photometry, periodogram
+
+def main(n_stars=500):
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), offline=True)
+    rng = np.random.default_rng(0)
+    periods = 10**rng.uniform(-1, 2.5, n_stars)
+    with open(os.path.join(cache.settings['cache_dir'], 'hip_ep.dat'), 'w') as f:
+        for hip, period in enumerate(periods, 1):
+            n = rng.integers(40, 150)
+            t = np.sort(rng.uniform(7860, 9060, n))
+            hp = 8 + 0.1*np.sin(2*np.pi*t/period) + rng.normal(0, 0.02, n)
+            flags = rng.choice([0, 0, 0, 1, 8], n)
+            hp[flags > 0] += rng.normal(0, 0.3, (flags > 0).sum())  # the flagged transits are outliers
+            f.write(f'HIP : {hip}\n')
+            f.writelines(f'{x:.5f}|{y:.4f}|{rng.uniform(0.01, 0.03):.4f}|{flag}\n' for x, y, flag in zip(t, hp, flags))
+    photometry.ingest(os.path.join(cache.settings['cache_dir'], 'hip_ep.dat'))
+    with open(os.path.join(cache.settings['cache_dir'], 'hip_main.dat'), 'w') as f:
+        for hip, period in enumerate(periods, 1):
+            values = pages.catalogue_values(hip)
+            values[51] = f'{period:.5f}'
+            f.write('|'.join('' if x is None else str(x) for x in values) + '\n')
+    catalogue.ingest(os.path.join(cache.settings['cache_dir'], 'hip_main.dat'))
+
+    hips = range(1, n_stars+1)
+    grid = periodogram.frequency_grid()
+    print(f'{n_stars} stars, {grid[2]*grid[3]} frequencies')
+    for max_workers in sorted({1, os.cpu_count()}):
+        start = time.perf_counter()
+        result = periodogram.search(hips, grid, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+        print(f'{max_workers} process(es): {n_stars/elapsed:.1f} stars/s, {result["agree"].mean():.1%} agree with var_period, '
+              f'median fap {np.nanmedian(result["fap"]):.1e}')
+    result = periodogram.search(hips, grid, bad_bits=[])
+    print(f'without the quality filter: {result["agree"].mean():.1%} agree with var_period')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,45 @@
+# Cost of the local epoch photometry store: ingestion of synthetic annex files, the table of one star from the store
+# (views of the memory maps) against the parse of its hipepId page, and a vectorised pass over all the transits.
+# Usage: python benchmarks/bench_photometry.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import page, download, photometry
+
+def main(n_stars=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        webpages = {hip:pages.epd_page(hip) for hip in range(1, n_stars+1)}
+        with open(os.path.join(tmp, 'hip_ep.dat'), 'w') as f:
+            for webpage in webpages.values():
+                f.write(page.pre_text(webpage))
+        start = time.perf_counter()
+        store = photometry.ingest(os.path.join(tmp, 'hip_ep.dat'), os.path.join(tmp, 'store'))
+        elapsed = time.perf_counter() - start
+        print(f'ingest: {len(store)} transits of {n_stars} stars in {elapsed:.1f} s ({len(store)/elapsed/1e6:.2f} M transits/s)')
+
+        hips = range(1, min(n_stars, 2000)+1)
+        start = time.perf_counter()
+        for hip in hips:
+            download._get_epd(hip, lambda kind, HIP: webpages[HIP])
+        parse = (time.perf_counter() - start)/len(hips)
+        start = time.perf_counter()
+        for hip in hips:
+            store.table(hip)
+        view = (time.perf_counter() - start)/len(hips)
+        print(f'one star: page parse {parse*1e6:.0f} µs, store view {view*1e6:.0f} µs')
+
+        start = time.perf_counter()
+        flags = store['quality_flag']
+        good = ~photometry.flag_mask(flags, range(photometry.n_flag_bits))
+        bits = photometry.flag_bits(flags).sum(axis=0)
+        elapsed = time.perf_counter() - start
+        print(f'flags of all transits: {elapsed*1e3:.0f} ms, {good.mean():.1%} without flag, transits per bit {bits[:4]}')
+        del store, flags
+        photometry._stores.clear()
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
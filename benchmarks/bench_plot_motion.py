@@ -0,0 +1,32 @@
+# Rendering cost of the motion plots on the Agg backend: one figure drawn in memory, and the batch export of many
+# stars to PNG files on one process and on all the cores, from synthetic pages served from a temporary cache.
+# Usage: python benchmarks/bench_plot_motion.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, plot_motion, Star
+
+def main(n_stars=50):
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), offline=True)
+    for hip in range(1, n_stars+1):
+        cache.store('hipiId', hip, pages.intermediate_page(hip))
+    star = Star(1)
+    plot_motion.figure(star, 'Both').canvas.draw()  # warm up imports and fonts
+    start = time.perf_counter()
+    for i in range(10):
+        plot_motion.figure(star, 'Both').canvas.draw()
+    print(f'one figure: {(time.perf_counter() - start)/10*1e3:.0f} ms')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for max_workers in sorted({1, os.cpu_count()}):
+            start = time.perf_counter()
+            paths, errors = plot_motion.plot_many(range(1, n_stars+1), directory=directory, max_workers=max_workers)
+            elapsed = time.perf_counter() - start
+            print(f'{max_workers} process(es): {n_stars/elapsed:.1f} PNG/s, {sum(e is not None for e in errors)} errors')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
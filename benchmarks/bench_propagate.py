@@ -0,0 +1,24 @@
+# Time of propagate_many over a catalogue-sized set of stars and a handful of epochs.
+# Usage: python benchmarks/bench_propagate.py [number of stars] [number of epochs]
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hipy import propagate
+
+def main(n_stars=118218, n_epochs=5):
+    rng = np.random.default_rng(1)
+    astrometry = np.column_stack([rng.uniform(0, 360, n_stars), rng.uniform(-90, 90, n_stars), rng.uniform(0.5, 50, n_stars),
+                                  rng.normal(0, 50, n_stars), rng.normal(0, 50, n_stars), rng.normal(0, 30, n_stars)])
+    epochs = np.linspace(1991.25, 2100, n_epochs)
+    propagate.propagate_many(astrometry[:10], epochs)  # warm up
+
+    start = time.perf_counter()
+    state = propagate.propagate_many(astrometry, epochs)
+    elapsed = time.perf_counter() - start
+    print(f'propagate_many: {n_stars} stars x {n_epochs} epochs: {elapsed*1e3:.0f} ms '
+          f'({n_stars*n_epochs/elapsed/1e6:.1f} M star-epochs/s), output {state["ra"].shape}')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
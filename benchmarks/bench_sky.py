@@ -0,0 +1,50 @@
+# Cost of the spatial index over a catalogue-sized set of stars: building it, single cone searches of several radii,
+# and nearest-neighbour queries of many positions at once. The results are checked against a brute-force search first.
+# Usage: python benchmarks/bench_sky.py [number of stars] [number of positions]
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from hipy import sky
+
+def random_sky(rng, n):
+    return rng.uniform(0, 360, n), np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+
+def main(n_stars=118218, n_positions=1000000):
+    rng = np.random.default_rng(1)
+    ra, dec = random_sky(rng, n_stars)
+    hip = np.arange(1, n_stars+1)
+
+    start = time.perf_counter()
+    index = sky.SkyIndex(ra, dec, hip)
+    print(f'build: {n_stars} stars in {(time.perf_counter() - start)*1e3:.0f} ms')
+
+    # Check against a brute-force search.
+    xyz = sky._unit(ra, dec)
+    qra, qdec = random_sky(rng, 2000)
+    cos_sep = sky._unit(qra, qdec) @ xyz.T
+    found, _ = index.nearest(qra, qdec)
+    assert (found == hip[cos_sep.argmax(axis=1)]).all(), 'nearest differs from brute force'
+    for i in range(20):
+        found, _ = index.cone_search(qra[i], qdec[i], 2.0)
+        assert set(found) == set(hip[cos_sep[i] >= np.cos(np.radians(2.0))]), 'cone_search differs from brute force'
+
+    qra, qdec = random_sky(rng, 10000)
+    for radius in (0.1, 0.5, 1.0, 5.0):
+        n = 2000 if radius < 5 else 200
+        counts = 0
+        start = time.perf_counter()
+        for i in range(n):
+            counts += len(index.cone_search(qra[i], qdec[i], radius)[0])
+        elapsed = (time.perf_counter() - start)/n
+        print(f'cone_search r = {radius:4.1f} deg: {elapsed*1e6:7.1f} µs/query, {counts/n:7.1f} stars/query')
+
+    qra, qdec = random_sky(rng, n_positions)
+    start = time.perf_counter()
+    index.nearest(qra, qdec)
+    elapsed = time.perf_counter() - start
+    print(f'nearest: {n_positions} positions in {elapsed*1e3:.0f} ms ({n_positions/elapsed/1e6:.2f} M positions/s)')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,29 @@
+# Whole-catalogue five-parameter re-solution from a local store of synthetic intermediate data: stars per second, and
+# the time extrapolated to the 118 218 stars of the Hipparcos Catalogue, with the consortium flags and with sigma-clipping.
+# Usage: python benchmarks/bench_solve.py [number of stars]
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, page, intermediate, solve
+
+def main(n_stars=10000):
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), offline=True)
+    with open(os.path.join(cache.settings['cache_dir'], 'hip_iad.dat'), 'w') as f:
+        for hip in range(1, n_stars+1):
+            f.write(page.pre_text(pages.intermediate_page(hip)))
+    store = intermediate.ingest(os.path.join(cache.settings['cache_dir'], 'hip_iad.dat'))
+    print(f'{n_stars} stars, {len(store)} abscissae')
+    for label, options in [('flags', {}), ('flags + 3-sigma clipping', {'clip':3})]:
+        start = time.perf_counter()
+        result = solve.solve_many(compare=False, **options)
+        elapsed = time.perf_counter() - start
+        print(f'{label}: {n_stars/elapsed:.0f} stars/s, whole catalogue in {118218/(n_stars/elapsed)/60:.1f} min, '
+              f'median chi2/dof {np.nanmedian(result["chi2"]/result["dof"]):.2f}')
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
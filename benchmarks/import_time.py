@@ -0,0 +1,47 @@
+# Import time of hipy and of each of its submodules, measured with `python -X importtime` in fresh processes,
+# checked against the budget in import_budget.json: the time budget (ms, best of several runs) and the heavy
+# dependencies that a submodule must not pull in.
+# Usage: python benchmarks/import_time.py [number of runs]
+# Exits with status 1 if a budget is exceeded.
+import os
+import sys
+import json
+import subprocess
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.join(here, '..')
+
+def import_time(module):
+    # Cumulative time (ms) of the top-level imports of hipy and the module, from the -X importtime report on stderr.
+    names = {'hipy', module}
+    code = f'import sys, {module}; print(" ".join(sorted(sys.modules)))'
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, env=env, check=True)
+    total = 0
+    for line in out.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if name.strip() in names and not name[1:].startswith(' '):
+                total += int(cumulative)
+    return total/1e3, set(out.stdout.split())
+
+def main(runs=5):
+    with open(os.path.join(here, 'import_budget.json')) as f:
+        budget = json.load(f)
+    failed = []
+    for module, limits in budget.items():
+        times = []
+        for _ in range(runs):
+            ms, loaded = import_time(module)
+            times.append(ms)
+        best = min(times)
+        heavy = sorted(x for x in limits.get('forbidden', []) if x in loaded)
+        ok = best <= limits['ms'] and not heavy
+        print(f'{module:22s} {best:8.1f} ms  (budget {limits["ms"]:6.0f} ms)' + (f'  imports {", ".join(heavy)}' if heavy else '') + ('' if ok else '  OVER BUDGET'))
+        if not ok:
+            failed.append(module)
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
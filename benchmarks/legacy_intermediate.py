@@ -0,0 +1,127 @@
+# The former parser of the intermediate data pages, which built the table row by row with np.insert and list
+# comprehensions on an array of strings, kept only as a reference for benchmarks/bench_intermediate.py.
+# It takes the raw bytes of a hipiId page (as returned by cache.fetch), and parses it with BeautifulSoup.
+import math
+import bs4
+import numpy as np
+from astropy.table import QTable
+from astropy import units as u
+from hipy.download import cearth, yr2jd
+
+# The five astrometric parameters of the page.
+def query(webpage):
+    webpage = str(webpage)
+    soup = bs4.BeautifulSoup(webpage,'html.parser')
+    text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
+    text = text.split('\\r\\n\\r\\n')[0].split('\\n',1)[1].split('\\n',1)[0].split('|')
+    p = [float(x) for x in text[2:7]]
+    return p
+
+def intermediate_table(webpage):
+    p = query(webpage)
+    webpage = str(webpage)
+    soup = bs4.BeautifulSoup(webpage,'html.parser')
+    text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
+    text = text.split('\\r\\n\\r\\n')
+    text_list = []
+    text_list.append(text[0].split('\\n',3)[3])
+    for line in text[1:]:
+        text_list.append(line)
+    data_list = []
+    for row in text_list:
+        row = row.replace('\\n','|').split('|')
+        if ('F' in row) or ('f' in row):
+            data = row[0:9]
+            data.append(np.nan) if row[9] == '     ' else data.append(row[9])
+            for x in row[11:14]:
+                data.append(x)
+        elif ('N' in row) or ('n' in row):
+            data = row[0:9]
+            data.append(np.nan) if row[9] == '     ' else data.append(row[9])
+            for x in row[14:]:
+                data.append(x)
+        data_list.append(data)
+    data_list_t = list(map(list, zip(*data_list)))
+    index_float = [2,3,7,8,9,10]
+    for i in index_float:
+        data_list_t[i] = [float(x) for x in list(data_list_t[i])]
+
+    epoch_time = [x+1991.25 for x in list(data_list_t[10])]
+    data_list_t = np.array(data_list_t).transpose()
+    data_list_t = np.insert(data_list_t,11,epoch_time,axis=1)
+
+    # Convert Julian years into Barycentric Julian Days.
+    jd = []
+    for yr in epoch_time:
+        jd.append(yr2jd(yr))
+    data_list_t = np.insert(data_list_t,12,jd,axis=1)
+
+    # Convert abscissa residuals into RA residuals and Dec residuals.
+    ra_residual = [float(data_list_t[i][2])*float(data_list_t[i][7]) for i in range(np.size(data_list_t,0))]
+    dec_residual = [float(data_list_t[i][3])*float(data_list_t[i][7]) for i in range(np.size(data_list_t,0))]
+    data_list_t = np.insert(data_list_t,8,ra_residual,axis=1)
+    data_list_t = np.insert(data_list_t,9,dec_residual,axis=1)
+
+    # Convert standard errors of abscissa into standard errors of RA and Dec.
+    ra_error = [float(data_list_t[i][2])*float(data_list_t[i][10]) for i in range(np.size(data_list_t,0))]
+    dec_error = [float(data_list_t[i][3])*float(data_list_t[i][10]) for i in range(np.size(data_list_t,0))]
+    data_list_t = np.insert(data_list_t,11,ra_error,axis=1)
+    data_list_t = np.insert(data_list_t,12,dec_error,axis=1)
+
+    # Get the correlation coefficients between RA and Dec.
+    ra_dec_corr = [float(data_list_t[i][2])*float(data_list_t[i][3]) for i in range(np.size(data_list_t,0))]
+    data_list_t = np.insert(data_list_t,14,ra_dec_corr,axis=1)
+
+    # Get the observational values of ra and dec in corresponding FAST/NDAC great-circle epoch time.
+    d2r = math.pi/180
+
+    i = 0
+    obs_dec_list = []
+    obs_ra_list = []
+    for year in epoch_time:
+        ret = cearth(year)
+        pa = ret[0]*math.sin(p[0]*d2r) - ret[1]*math.cos(p[0]*d2r)
+        pd = (ret[0]*math.cos(p[0]*d2r) + ret[1]*math.sin(p[0]*d2r))*math.sin(p[1]*d2r) - ret[2]*math.cos(p[1]*d2r)
+        model_dec = p[1] + (float(data_list_t[i][15])*p[4] + pd*p[2])/3600/1000
+        obs_dec = model_dec + dec_residual[i]/3600/1000
+        obs_ra = p[0] + (ra_residual[i] + (float(data_list_t[i][15])*p[3] + p[2]*pa)/math.cos(model_dec*d2r))/3600/1000
+        obs_dec_list.append(obs_dec)
+        obs_ra_list.append(obs_ra)
+        i = i + 1
+    data_list_t = np.insert(data_list_t,2,obs_ra_list,axis=1)
+    data_list_t = np.insert(data_list_t,3,obs_dec_list,axis=1)
+
+    data_list_tt = list(zip(*data_list_t))
+    # Assign units to columns.
+    index_deg = [2,3,20,21]
+    index_float = [4,5,6,7,8,15,16]
+    index_mas = [9,10,11,12,13,14]
+    for i in index_deg:
+        data_list_tt[i] = [float(x) for x in list(data_list_tt[i])] * u.deg
+    for i in index_float:
+        data_list_tt[i] = [float(x) for x in list(data_list_tt[i])]
+    for i in index_mas:
+        data_list_tt[i] = [float(x) for x in list(data_list_tt[i])] * u.mas
+    data_list_tt[17] = [float(x) for x in list(data_list_tt[17])] * u.yr
+    data_list_tt[18] = [float(x) for x in list(data_list_tt[18])] * u.yr
+    data_list_tt[19] = [float(x) for x in list(data_list_tt[19])] * u.d
+
+    # Assign names and descriptions to columns.
+    out = QTable(data_list_tt,
+        names=('orbit_number','source_absc','obs_ra','obs_dec','absc/ra','absc/dec','absc/parallax','absc/pmra','absc/pmdec','absc_residual','ra_residual',
+               'dec_residual','absc_error','ra_error','dec_error','absc_corr','ra_dec_corr','ref_great-circle_mid-epoch (yr)',
+                'ref_great-circle_epoch_time (yr)','ref_great-circle_epoch_time (bjd)','great-circle_pole_ra','dec_great-circle_pole_dec'),
+        meta={'orbit_number':'orbit number','source_absc':'source of abscissa (F or f if FAST data, N or n if NDAC data)',
+              'obs_ra':'observational value of RA in this FAST/NDAC great-circle epoch time (deg)','obs_dec':'observational value of Dec in this FAST/NDAC great-circle epoch time (deg)',
+              'absc/ra':'abscissa partial derivative with respect to RA','absc/dec':'abscissa partial derivative with respect to Dec',
+              'absc/parallax':'abscissa partial derivative with respect to parallax','absc/pmra':'abscissa partial derivative with respect to proper motion in RA direction',
+              'absc/pmdec':'abscissa partial derivative with respect to proper motion in Dec direction',
+              'absc_residual':'abscissa residual','ra_residual':'residual of right ascension','dec_residual':'residual of declination',
+              'absc_error':'standard error of the abscissa','ra_error':'standard error of right ascension','dec_error':'standard error of declination',
+              'absc_corr':'correlation coefficient between FAST and NDAC abscissae','ra_dec_corr':'correlation coefficient between right ascension and declination',
+              'ref_great-circle_mid-epoch (yr)':'FAST/NDAC reference great-circle mid-epoch, in years relative to J1991.25(TT)',
+              'ref_great-circle_epoch_time (yr)':'the epoch time of the FAST/NDAC reference great-circle, in years',
+              'ref_great-circle_epoch_time (bjd)':'the epoch time of the FAST/NDAC reference great-circle, in Barycentric Julian Days',
+              'great-circle_pole_ra':'right ascension within ICRS of the FAST/NDAC reference great-circle pole',
+              'great-circle_pole_dec':'declination within ICRS of the FAST/NDAC reference great-circle pole'})
+    return out
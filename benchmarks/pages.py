@@ -0,0 +1,161 @@
+# Synthetic HIPcatalogueSearch.pl pages for the benchmarks, so that they run without network access.
+# The pages follow the layout that the hipy parsers read (the <pre> block, its header lines, '|'-separated records),
+# with random values drawn from a generator seeded by the HIP number.
+import numpy as np
+
+
+def _html(lines, sep='\n'):
+    return ('<html><head><title>Hipparcos</title></head><body>\n<pre>\n' + sep.join(lines) + '\n</pre>\n</body></html>').encode('ascii')
+
+
+def _field(label, value, desc, width=34):
+    value = '' if value is None else str(value)
+    return f'{label:<4}: ' + value.ljust(width) + desc
+
+
+def catalogue_values(hip, flag=' ', rng=None):
+    rng = np.random.default_rng(hip) if rng is None else rng
+    v = {}
+    f = lambda lo, hi, nd=2: f'{rng.uniform(lo, hi):.{nd}f}'
+    v[0] = 'H'; v[1] = hip; v[2] = None; v[3] = '00 00 00.22'; v[4] = '+01 05 20.4'
+    v[5] = f(5, 10); v[6] = None; v[7] = 'G'
+    v[8] = f(0, 360, 8); v[9] = f(-89, 89, 8); v[10] = None
+    v[11] = f(1, 50); v[12] = f(-100, 100); v[13] = f(-100, 100)
+    for i in range(14, 19):
+        v[i] = f(0.5, 2)
+    for i in range(19, 29):
+        v[i] = f(-0.3, 0.3)
+    v[29] = '0'; v[30] = f(-1, 1); v[31] = hip
+    for i in (32, 33, 34, 35):
+        v[i] = f(0, 10, 3)
+    v[36] = None; v[37] = f(0, 1, 3); v[38] = f(0, 0.1, 3); v[39] = 'T'
+    v[40] = f(0, 1); v[41] = f(0, 0.1); v[42] = 'L'; v[43] = None
+    v[44] = f(5, 10, 4); v[45] = f(0, 0.01, 4); v[46] = f(0, 0.1, 3); v[47] = '87'; v[48] = None
+    v[49] = f(5, 10); v[50] = f(5, 10); v[51] = f(1, 100) if hip % 3 == 0 else None
+    v[52] = None; v[53] = None; v[54] = None
+    v[55] = '00001+0150' if flag != ' ' else None
+    v[56] = None; v[57] = '1'; v[58] = '2' if flag == 'C' else '1'
+    v[59] = None if flag == ' ' else flag
+    v[60] = None; v[61] = 'A'; v[62] = 'AB'
+    v[63] = f(0, 360, 0); v[64] = f(0, 10, 3); v[65] = f(0, 0.1, 3); v[66] = f(0, 3); v[67] = f(0, 0.1)
+    v[68] = 'S'; v[69] = None; v[70] = None; v[71] = str(200000 + hip); v[72] = 'B+00 5077'
+    v[73] = None; v[74] = None; v[75] = f(0, 1); v[76] = 'F5'; v[77] = 'S'
+    return [v[i] for i in range(78)]
+
+
+def hip_main_line(hip, flag=' '):
+    return '|'.join('' if x is None else str(x) for x in catalogue_values(hip, flag))
+
+
+def catalogue_page(hip, flag=' ', rng=None):
+    v = catalogue_values(hip, flag, rng)
+    lines = ['Hipparcos Catalogue, main entry']
+    for i in range(78):
+        lines.append(_field(f'H{i}', v[i], f'field h{i} description'))
+    lines += ['', 'the values above are for epoch J1991.25', 'see the catalogue documentation', '(c) esa 1997']
+    return _html(lines)
+
+
+def intermediate_page(hip, n_orbits=60, rng=None):
+    rng = np.random.default_rng(hip) if rng is None else rng
+    ra, dec = rng.uniform(0, 360), rng.uniform(-89, 89)
+    plx, pmra, pmdec = rng.uniform(1, 50), rng.uniform(-100, 100), rng.uniform(-100, 100)
+    head = [f'HIP|   {hip}|{ra:.8f}|{dec:+.8f}|{plx:.2f}|{pmra:.2f}|{pmdec:.2f}|   1.00|   0.80',
+            f' hip|{hip:>6}|{ra:12.8f}|{dec:+12.8f}|{plx:7.2f}|{pmra:8.2f}|{pmdec:8.2f}|',
+            'IA1|IA2|IA3|IA4|IA5|IA6|IA7|IA8|IA9|IA10']
+    records = []
+    orbits = np.sort(rng.choice(np.arange(40, 2600), n_orbits, replace=False))
+    for orb in orbits:
+        mid = rng.uniform(-1.3, 1.6)
+        pra, pdec = rng.uniform(0, 360), rng.uniform(-89, 89)
+        great = f'{mid:+.4f}|{pra:8.3f}|{pdec:+7.3f}|{mid + 0.001:+.4f}|{pra + 0.1:8.3f}|{pdec + 0.1:+7.3f}'
+        srcs = [('F', 'N'), ('F',), ('N',), ('f', 'N'), ('F', 'n')][rng.integers(5)]
+        for s in srcs:
+            psi = rng.uniform(0, 2 * np.pi)
+            parts = [np.sin(psi), np.cos(psi), rng.uniform(-1, 1), np.sin(psi) * mid, np.cos(psi) * mid]
+            corr = f'{rng.uniform(-1, 1):+.2f}' if len(srcs) == 2 else '     '
+            rec = f'{orb:4d}|{s}|' + '|'.join(f'{x:+.4f}' for x in parts) + \
+                  f'|{rng.normal(0, 2):+6.2f}|{rng.uniform(1, 5):5.2f}|{corr}|\n' + great
+            records.append(rec)
+    body = '\n'.join(head) + '\n' + '\r\n\r\n'.join(records)
+    return ('<html><body>\n<pre>\n' + body + '\r\n\r\n\r\n</pre>\n</body></html>').encode('ascii')
+
+
+def epd_page(hip, n=120, rng=None):
+    rng = np.random.default_rng(hip) if rng is None else rng
+    med = rng.uniform(5, 10)
+    head = ['Hipparcos Epoch Photometry Annex', f'HIP : {hip}', 'HH1 : x', 'HH2 : x', 'HH3 : x', 'HH4 : x',
+            f'Median magnitude: {med:.4f}        median hp', 'HH6 : x',
+            f'5th percentile: {med - 0.05:.4f}        max', f'95th percentile: {med + 0.05:.4f}        min',
+            'HH10: x', 'HH11: x', 'HH12: x', 'HH13: x', 'HH14: x', 'HH15: x', 'HT1|HT2|HT3|HT4']
+    t = np.sort(rng.uniform(7860, 9060, n))
+    recs = [f'{x:.4f}|{med + rng.normal(0, 0.02):.4f}|{rng.uniform(0.005, 0.02):.4f}|{int(rng.integers(0, 4))}' for x in t]
+    body = '\n'.join(head) + '\n' + '\r\n'.join(recs)
+    return ('<html><body>\n<pre>\n' + body + '\r\n</pre>\n</body></html>').encode('ascii')
+
+
+_COMP = ['sequential_comp', 'comp_identifier', 'hip', 'hp_mag', 'hp_mag_error', 'bt_mag', 'bt_mag_error', 'vt_mag',
+         'vt_mag_error', 'ra', 'dec', 'parallax', 'pmra', 'pmdec', 'ra_error', 'dec_error', 'parallax_error',
+         'pmra_error', 'pmdec_error', 'refer_comp', 'position_angle', 'angular_separation',
+         'position_angle_change_rate', 'angular_separation_change_rate', 'sequential_record', 'status_flags']
+_STR = {'sequential_comp', 'comp_identifier', 'hip', 'refer_comp', 'sequential_record', 'status_flags'}
+
+
+def _dmsa_c_solution(hip, n_c, rng, sid=1, n_s=1):
+    n_r = 2 * n_c - 3
+    lines = []
+    head = ['00001+0150', sid, 'F', 'C', 'A', None, n_s, n_c, 6 * n_c, n_r]
+    for i, x in enumerate(head):
+        lines.append(_field(f'DC{i + 1}', x, f'solution field {i + 1}'))
+    for k in range(1, n_c + 1):
+        lines.append(_field('DC11', 'COMP', 'component record'))
+        for name in _COMP:
+            if name == 'sequential_comp':
+                x = k
+            elif name == 'comp_identifier':
+                x = 'ABCD'[k - 1]
+            elif name == 'hip':
+                x = hip
+            elif name == 'status_flags':
+                x = '111111'
+            elif name in _STR:
+                x = 1
+            else:
+                x = f'{rng.uniform(0.1, 100):.3f}'
+            lines.append(_field('DC', x, name.replace('_', ' ')))
+        for j in range(10):
+            lines.append(_field('DX', None, f'extra record line {j}'))
+    for r in range(n_r):
+        lines += ['correlation record', f'record {r + 1}', 'coefficients']
+        lines += [' '.join(f'{rng.integers(-99, 99):+03d}' for _ in range(17)) for _ in range(4)]
+        if r < n_r - 1:
+            lines += [f'padding {j}' for j in range(10)]
+    return lines
+
+
+def dmsa_page(hip, flag, n_c=2, second=False, rng=None):
+    rng = np.random.default_rng(hip) if rng is None else rng
+    f = lambda lo, hi, nd=3: f'{rng.uniform(lo, hi):.{nd}f}'
+    lines = ['Double and Multiple Systems Annex']
+    if flag == 'C':
+        lines += _dmsa_c_solution(hip, n_c, rng, 1, 2 if second else 1)
+        lines.append(_field('DN', None, 'note line DN'))
+        if second:
+            lines += [f'trailer line {j}' for j in range(91)]
+    elif flag == 'G':
+        vals = [hip] + [f(-5, 5) for _ in range(4)] + ['12'] + [f(-5, 5) for _ in range(4)] + ['3', None, '9']
+        lines += [_field(f'DG{i + 1}', x, f'acceleration field {i + 1}') for i, x in enumerate(vals)]
+        lines += ['correlations', '+01 +02 -03 +04', '-05 +06 +07 +08']
+    elif flag == 'O':
+        vals = [hip, f(10, 1000), f(7000, 9000), f(1, 50), f(0, 0.9), f(0, 360), f(0, 180), f(0, 360),
+                f(0, 5), f(0, 5), f(0, 1), f(0, 0.1), f(0, 5), f(0, 5), f(0, 5), 'B', None, '111111111111']
+        lines += [_field(f'DO{i + 1}', x, f'orbit field {i + 1}') for i, x in enumerate(vals)]
+        lines += ['correlations', '+01 +02', '-03 +04', '+05 -06', '+07 +08']
+    elif flag == 'V':
+        vals = [hip, f(5, 10), f(-5, 5), f(-5, 5), f(0, 1), f(0, 1), '5', f(0, 360), f(0, 10), f(0, 10), f(0, 10), None]
+        lines += [_field(f'DV{i + 1}', x, f'vim field {i + 1}') for i, x in enumerate(vals)]
+        lines += ['correlations', '+01 +02 -03', '-05 +06 +07']
+    elif flag == 'X':
+        vals = [hip, f(1, 10), f(0, 1), None]
+        lines += [_field(f'DX{i + 1}', x, f'stochastic field {i + 1}') for i, x in enumerate(vals)]
+    return _html(lines)
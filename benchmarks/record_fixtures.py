@@ -0,0 +1,45 @@
+# Record the fixtures of the benchmark suite (suite.py): download one ESA page per fixture into benchmarks/fixtures, as
+# <name>.html, the raw bytes of the page. The suite then uses them instead of the synthetic pages of pages.py.
+# The catalogue, intermediate and epd fixtures default to one star; the DMSA fixtures need a star of each solution type
+# (and of 2, 3 and 4 components for C), checked against the dmsa_flag of its catalogue page before it is written.
+# Usage: python benchmarks/record_fixtures.py [name=HIP ...]      e.g. dmsa_O=<HIP> dmsa_C3=<HIP>
+# Needs network access. Run suite.py --update afterwards: the baselines depend on the fixtures.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from suite import fixtures, HIP
+from hipy import cache, download, dmsa, page
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+def main(*pairs):
+    hips = {'catalogue':HIP, 'intermediate':HIP, 'epd':HIP}
+    for pair in pairs:
+        name, _, value = pair.partition('=')
+        if name not in fixtures or not value.isdigit():
+            sys.exit(f'Not a fixture=HIP pair: {pair}. Fixtures: {", ".join(fixtures)}.')
+        hips[name] = int(value)
+    directory = os.path.join(here, 'fixtures')
+    os.makedirs(directory, exist_ok=True)
+    for name, hip in hips.items():
+        kind, flag, synthetic = fixtures[name]
+        webpage = cache.download(kind, hip)
+        if flag is not None:
+            found = download._get_catalogue(hip, lambda kind, HIP: cache.download(kind, HIP))['dmsa_flag'][0]
+            if found != flag:
+                sys.exit(f'HIP {hip} is not a DMSA/{flag} star (dmsa_flag {found!r}), not recorded as {name}.')
+            if flag == 'C':
+                schema, values = dmsa._component_values(page.pre_lines(webpage))
+                n_c = (len(schema.names) - len(dmsa._solution_names) - 1)//len(dmsa._component_names)
+                if f'C{n_c}' != name.split('_')[1]:
+                    sys.exit(f'HIP {hip} has {n_c} components, not recorded as {name}.')
+        with open(os.path.join(directory, f'{name}.html'), 'wb') as f:
+            f.write(webpage)
+        print(f'{name}: HIP {hip}, {len(webpage)} bytes')
+    missing = [name for name in fixtures if not os.path.exists(os.path.join(directory, f'{name}.html'))]
+    if missing:
+        print(f'Still synthetic: {", ".join(missing)}')
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,206 @@
+# Offline benchmark suite of the parsers, propagate, cearth and the plots, checked against stored baselines.
+# Every kind of page has a fixture: catalogue, intermediate, epd, and the DMSA pages C with 2, 3 and 4 components, G, O,
+# V and X. The fixtures are the pages recorded by record_fixtures.py in benchmarks/fixtures (<name>.html), or, for those
+# not recorded, the synthetic pages of pages.py. The stages of each parse (extract, parse, derive, build) are timed
+# through hipy.instrument, the other cases directly; each case is the 10th percentile of the times of one call (µs),
+# which depends less than the median on the other loads of the machine. Each call is followed by one call of a
+# calibration function that does not use hipy (plain Python and NumPy), and the baselines (baseline.json) are the times
+# relative to it, so that a machine slower or busier than when they were recorded, even for a while, does not fail them.
+# A case slower than its baseline by more than the tolerance is a regression: the suite then exits with status 1.
+# Baselines depend on the machine and on the fixtures: record them again with --update after changing either.
+# Usage: python benchmarks/suite.py [--update] [--tolerance 0.5] [--repeat 1.0] [--fixtures DIR] [case patterns ...]
+import os
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pages
+from hipy import cache, instrument, download, dmsa, propagate, plot_motion, plot_lightcurve
+from hipy.star import Star
+
+here = os.path.dirname(os.path.abspath(__file__))
+HIP = 27989
+
+# Fixtures: name → kind of page, DMSA solution type, and the synthetic page used when none has been recorded.
+fixtures = {'catalogue':('hipId', None, lambda: pages.catalogue_page(HIP)),
+            'intermediate':('hipiId', None, lambda: pages.intermediate_page(HIP)),
+            'epd':('hipepId', None, lambda: pages.epd_page(HIP)),
+            'dmsa_C2':('dmId', 'C', lambda: pages.dmsa_page(HIP, 'C', n_c=2)),
+            'dmsa_C3':('dmId', 'C', lambda: pages.dmsa_page(HIP, 'C', n_c=3)),
+            'dmsa_C4':('dmId', 'C', lambda: pages.dmsa_page(HIP, 'C', n_c=4)),
+            'dmsa_G':('dmId', 'G', lambda: pages.dmsa_page(HIP, 'G')),
+            'dmsa_O':('dmId', 'O', lambda: pages.dmsa_page(HIP, 'O')),
+            'dmsa_V':('dmId', 'V', lambda: pages.dmsa_page(HIP, 'V')),
+            'dmsa_X':('dmId', 'X', lambda: pages.dmsa_page(HIP, 'X'))}
+
+# Pages of the fixtures, and for each one whether it was recorded.
+def load(directory):
+    webpages, recorded = {}, {}
+    for name, (kind, flag, synthetic) in fixtures.items():
+        path = os.path.join(directory, f'{name}.html')
+        recorded[name] = os.path.exists(path)
+        if recorded[name]:
+            with open(path, 'rb') as f:
+                webpages[name] = f.read()
+        else:
+            webpages[name] = synthetic()
+    return webpages, recorded
+
+# Parse one fixture, as get_data and get_dmsa do.
+def _parse(name, webpage):
+    kind, flag, synthetic = fixtures[name]
+    fetch = lambda kind, HIP: webpage
+    if kind == 'hipId':
+        return download._get_catalogue(HIP, fetch)
+    if kind == 'hipiId':
+        return download._get_intermediate(HIP, fetch)
+    if kind == 'hipepId':
+        return download._get_epd(HIP, fetch)
+    return dmsa._solution(HIP, flag, fetch)
+
+def _stat(seconds):
+    return float(np.percentile(seconds, 10))*1e6
+
+# Calibration: splitting and converting text, and small NumPy operations, as the parsers do, but without hipy.
+_text = '\n'.join('|'.join(f'{i*0.37+j:.4f}' for j in range(10)) for i in range(50))
+def _calibration():
+    rows = [line.split('|') for line in _text.splitlines()]
+    x = np.array([[float(v) for v in row] for row in rows])
+    return np.sin(x).sum() + np.sqrt(x[:,:5]*x[:,5:]).mean()
+
+def _calibrate(calibration):
+    start = time.perf_counter()
+    _calibration()
+    calibration.append(time.perf_counter() - start)
+
+# Times (µs, see _stat) of each phase recorded while f is called n times, after one call to warm up, and of the
+# calibration calls in between: phase → (µs, calibration µs).
+def _phases(f, n):
+    f()
+    calibration = []
+    with instrument.recording() as recorder:
+        for _ in range(n):
+            f()
+            _calibrate(calibration)
+    seconds = {}
+    for event in recorder.events:
+        seconds.setdefault(event['phase'], []).append(event['seconds'])
+    return {phase:(_stat(x), _stat(calibration)) for phase, x in seconds.items()}
+
+# Times (µs, see _stat) of one call of f, called n times after one call to warm up, and of the calibration calls in between.
+def _time(f, n):
+    f()
+    times, calibration = [], []
+    for _ in range(n):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+        _calibrate(calibration)
+    return _stat(times), _stat(calibration)
+
+# A Star whose pages are the fixtures, so that nothing is fetched.
+def _star(webpages):
+    star = Star(HIP)
+    star._pages = {'hipId':webpages['catalogue'], 'hipiId':webpages['intermediate'], 'hipepId':webpages['epd']}
+    return star
+
+def _draw(fig):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    FigureCanvasAgg(fig).draw()
+
+def _lightcurve(star):
+    from matplotlib.figure import Figure
+    fig = Figure()
+    plot_lightcurve._draw(fig.add_subplot(), star.hip, *plot_lightcurve._lightcurve(star))
+    _draw(fig)
+
+_stages = ('extract', 'parse', 'derive', 'build', 'local')
+
+# Times of the cases (name → µs and calibration µs, see _time) matching patterns (default: all). repeat scales the number of calls of each case.
+def run(webpages, repeat=1.0, patterns=None):
+    n = lambda k: max(3, int(k*repeat))
+    want = lambda *cases: not patterns or any(fnmatch.fnmatch(case, p) for case in cases for p in patterns)
+    results = {}
+    for name, webpage in webpages.items():
+        if want(*[f'{name}/{phase}' for phase in _stages]):
+            for phase, us in _phases(lambda: _parse(name, webpage), n(300)).items():
+                results[f'{name}/{phase}'] = us
+
+    star = _star(webpages)
+    star.intermediate_records
+    if want(*[f'propagate/{phase}' for phase in _stages]):
+        for phase, us in _phases(lambda: propagate._table(star), n(300)).items():
+            results[f'propagate/{phase}'] = us
+    cases = {}
+    rng = np.random.default_rng(0)
+    astrometry = np.column_stack([rng.uniform(0, 360, 1000), rng.uniform(-89, 89, 1000), rng.uniform(1, 100, 1000),
+                                  rng.normal(0, 50, 1000), rng.normal(0, 50, 1000)])
+    epochs = np.linspace(1989.85, 1993.21, 100)
+    years = np.linspace(1989, 1994, 100000)
+    cases['propagate_many/1000x100'] = (lambda: propagate.propagate_many(astrometry, epochs), 20)
+    cases['cearth/scalar'] = (lambda: download.cearth(1991.25), 2000)
+    cases['cearth/1e5'] = (lambda: download.cearth(years), 50)
+    cases['plot_motion/figure'] = (lambda: plot_motion.figure(star, 'Both'), 10)
+    cases['plot_motion/draw'] = (lambda: _draw(plot_motion.figure(star, 'Both')), 5)
+    cases['plot_lightcurve/draw'] = (lambda: _lightcurve(star), 5)
+    for case, (f, calls) in cases.items():
+        if want(case):
+            results[case] = _time(f, n(calls))
+    return {case:times for case, times in results.items() if want(case)}
+
+def _machine():
+    return f'{platform.machine()} {platform.processor() or platform.system()}, Python {platform.python_version()}, NumPy {np.__version__}'
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite of hipy.')
+    parser.add_argument('patterns', nargs='*', help='cases to run (fnmatch patterns, e.g. "dmsa_*/parse"); default: all')
+    parser.add_argument('--update', action='store_true', help='store the times as the new baselines')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown over the baseline (0.5: 50%%)')
+    parser.add_argument('--repeat', type=float, default=1.0, help='scale of the number of calls of each case')
+    parser.add_argument('--fixtures', default=os.path.join(here, 'fixtures'), help='directory of the recorded pages')
+    parser.add_argument('--baseline', default=os.path.join(here, 'baseline.json'))
+    args = parser.parse_args()
+
+    cache.configure(cache_dir=tempfile.mkdtemp(prefix='hipy-bench-'), offline=True)  # no network and no local store
+    webpages, recorded = load(args.fixtures)
+    source = 'recorded' if all(recorded.values()) else 'synthetic' if not any(recorded.values()) else 'mixed'
+    print(f'fixtures: {source}' + (f' (recorded: {", ".join(name for name in fixtures if recorded[name])})' if source == 'mixed' else ''))
+    results = run(webpages, args.repeat, args.patterns)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('fixtures') != source or baseline.get('machine') != _machine():
+            print(f'warning: the baselines were recorded with {baseline.get("fixtures")} fixtures on {baseline.get("machine")}')
+    cases = baseline.get('cases', {})
+    regressions = []
+    # baseline: the time expected from the baseline (relative to the calibration) and the calibration of this run.
+    print(f'{"case":28s} {"µs":>12s} {"baseline":>12s} {"ratio":>7s}')
+    for case, (us, calibration) in results.items():
+        base = cases[case]*calibration if case in cases else None
+        # Below a few µs, the noise of the timer dominates.
+        slow = base is not None and us > max(base*(1 + args.tolerance), base + 5)
+        if slow:
+            regressions.append(case)
+        print(f'{case:28s} {us:12.1f} ' + (f'{base:12.1f} {us/base:7.2f}' if base else f'{"-":>12s} {"-":>7s}') +
+              ('  REGRESSION' if slow else ''))
+
+    if args.update:
+        cases.update({case:round(us/calibration, 5) for case, (us, calibration) in results.items()})
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine':_machine(), 'fixtures':source, 'cases':cases}, f, indent=1)
+            f.write('\n')
+        print(f'baselines written to {args.baseline}')
+    elif regressions:
+        print(f'{len(regressions)} regressions (tolerance {args.tolerance:.0%}): {", ".join(regressions)}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,19 @@
 #from .download import *
-from . import download
-from . import dmsa
-from . import propagate
-from . import plot_motion
-from . import plot_lightcurve
+# The submodules are imported on first use (PEP 562), so that e.g. `import hipy; hipy.propagate` does not pay for
+# matplotlib, astroquery or astropy.table.
+import importlib
+
+_submodules = ('cache', 'catalogue', 'columnar', 'resolve', 'star', 'download', 'dmsa', 'photometry', 'intermediate', 'propagate', 'sky', 'periodogram', 'solve', 'kepler', 'formats', 'export', 'aio', 'replay', 'instrument', 'plot_motion', 'plot_lightcurve')
+_attributes = {'Star':'star'}
+
+__all__ = list(_submodules) + list(_attributes)
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in _attributes:
+        return getattr(importlib.import_module(f'.{_attributes[name]}', __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,147 @@
+import asyncio
+import numbers
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from . import cache
+from . import instrument
+
+# asyncio versions of get_data, get_dmsa and propagate, for applications that run an event loop. Nothing blocks the loop:
+# - the pages are downloaded (or read from the cache) and the star names resolved by the threads of one pool of
+#   cache.settings['pool_size'] threads, the number of keep-alive connections to the server (see cache.session), so that
+#   at most that many requests are in flight; cache.settings['max_rps'] still limits the request rate;
+# - the pages are parsed by `executor`: the default executor of the loop (threads), or e.g. a ProcessPoolExecutor, so
+#   that parsing many pages at once uses all the cores instead of competing with the loop for the GIL.
+# Nothing is printed: the functions return the QTables (or the outputs, see formats), or raise the errors of get_data,
+# get_dmsa and propagate.
+#
+#   table = await hipy.aio.get_data('HIP 27989', 'epd')
+#   tables, errors = await hipy.aio.get_data_many(range(1, 1001), 'intermediate', concurrency=32)
+#
+# To measure throughput and latency without the ESA server, point cache.base_url at a replay server (see replay).
+types = ('catalogue', 'intermediate', 'epd', 'dmsa', 'propagate')
+
+# Page needed for each type of data, unless the data are served from a local store.
+_kinds = {'catalogue':'hipId', 'intermediate':'hipiId', 'epd':'hipepId', 'propagate':'hipiId', 'dmsa':'dmId'}
+
+_lock = threading.Lock()
+_pool = None
+_pool_size = None  # number of threads of _pool
+
+# Threads of the downloads, created on first use. Resized if cache.settings['pool_size'] has changed.
+def _io_pool():
+    global _pool, _pool_size
+    with _lock:
+        if _pool is None or _pool_size != cache.settings['pool_size']:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool_size = cache.settings['pool_size']
+            _pool = ThreadPoolExecutor(max_workers=_pool_size, thread_name_prefix='hipy-aio')
+        return _pool
+
+async def _io(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_pool(), function, *args)
+
+# Whether the data of one type of one star are served from a local store (see catalogue, photometry, intermediate and
+# dmsa.ingest), so that no page is needed.
+def _is_local(type, HIP, flag=None):
+    from . import catalogue, photometry, intermediate, dmsa
+    if type == 'dmsa':
+        return dmsa._is_local(HIP, flag)
+    store = {'catalogue':catalogue, 'epd':photometry, 'intermediate':intermediate, 'propagate':intermediate}[type].local()
+    return (store is not None) and (HIP in store)
+
+# Pages (kind → bytes) needed for one type of data of one star, fetched through the cache. Runs in the download threads.
+# A single star has no DMSA page: _parse then raises the LookupError of dmsa.get_dmsa.
+def _pages(type, HIP, flag=None):
+    from . import dmsa
+    if _is_local(type, HIP, flag) or (type == 'dmsa' and flag not in dmsa._descriptions):
+        return {}
+    kind = _kinds[type]
+    return {kind:cache.fetch(kind, HIP)}
+
+# Parse the pages of one star into one type of data. Runs in `executor`, so it only takes and returns picklable objects.
+def _parse(type, HIP, pages, flag=None, rv=None, output='qtable'):
+    from .star import Star
+    from . import dmsa, propagate, download
+    star = Star(HIP)
+    star._pages = dict(pages)
+    if type == 'dmsa':
+        return dmsa._solution(HIP, flag, star._fetch, output)
+    if type == 'propagate':
+        return propagate._table(star, rv, output)
+    return download._data(star, type, output)
+
+async def _hip(star_name):
+    from .star import Star
+    from . import resolve
+    if isinstance(star_name, Star):
+        return star_name.hip
+    if isinstance(star_name, numbers.Integral):
+        return star_name
+    return await _io(resolve.resolve, star_name)
+
+async def _get(HIP, type, executor, rv=None, output='qtable'):
+    loop = asyncio.get_running_loop()
+    flag = None
+    if type == 'dmsa':
+        # The solution type is read from the catalogue data.
+        flag = (await _get(HIP, 'catalogue', executor, output='numpy'))['dmsa_flag'][0]
+    pages = await _io(_pages, type, HIP, flag)
+    return await loop.run_in_executor(executor, _parse, type, HIP, pages, flag, rv, output)
+
+# Get one type of data (catalogue, intermediate or epd, see download.get_data) of one star: a name, a HIP number or a Star.
+async def get_data(star_name, type, executor=None, output='qtable'):
+    from . import formats
+    if type not in ('catalogue', 'intermediate', 'epd'):
+        raise ValueError(f'No such type of data: {type}. Please choose from catalogue, intermediate or epd.')
+    formats.check(output)
+    return await _get(await _hip(star_name), type, executor, output=output)
+
+# Solution of one star in the Double and Multiple Systems Annex (see dmsa.get_dmsa). Raises LookupError for a single star.
+async def get_dmsa(star_name, executor=None, output='qtable'):
+    from . import formats
+    formats.check(output)
+    return await _get(await _hip(star_name), 'dmsa', executor, output=output)
+
+# Propagation of one star to the mid-epochs of its intermediate data (see propagate.propagate).
+async def propagate(star_name, rv=None, executor=None, output='qtable'):
+    from . import formats
+    formats.check(output)
+    return await _get(await _hip(star_name), 'propagate', executor, rv, output)
+
+# Get the same type of data (one of types) for many stars, with at most `concurrency` stars in progress at once.
+# As download.get_data_many: results[i] is the QTable (or output) of stars[i], or None if it failed, and errors[i] is then
+# the exception.
+async def get_data_many(stars, type, concurrency=16, executor=None, output='qtable'):
+    from . import resolve
+    from . import formats
+    from .star import Star
+    if type not in types:
+        raise ValueError(f'No such type of data: {type}. Please choose from {", ".join(types)}.')
+    formats.check(output)
+    stars = list(stars)
+    results = [None]*len(stars)
+    errors = [None]*len(stars)
+    # Resolve all the star names first, with at most one Simbad query.
+    names = [i for i, star in enumerate(stars) if not isinstance(star, (Star, numbers.Integral))]
+    try:
+        hips = await _io(resolve.resolve_many, [stars[i] for i in names])
+    except Exception:
+        hips = [stars[i] for i in names]  # e.g. offline: resolve them one by one, and report the errors per star
+    for i, HIP in zip(names, hips):
+        if HIP is None:
+            errors[i] = IndexError(f'{stars[i]} has no Hipparcos Catalogue(HIP) identifier.')
+        else:
+            stars[i] = HIP
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            try:
+                results[i] = await _get(await _hip(stars[i]), type, executor, output=output)
+            except Exception as e:
+                errors[i] = e
+                instrument.error(getattr(stars[i], 'hip', stars[i]), e, type=type)
+
+    await asyncio.gather(*[one(i) for i in range(len(stars)) if errors[i] is None])
+    return results, errors
@@ -0,0 +1,234 @@
+import os
+import time
+import zlib
+import threading
+from . import instrument
+
+# All the Hipparcos data are served by the same ESA CGI. Each kind of page is selected by one query parameter:
+# catalogue data (hipId), intermediate data (hipiId), epoch photometry data (hipepId) and the Double and Multiple Systems Annex (dmId).
+base_url = 'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl'
+queries = {'hipId':'hipId={HIP}',
+           'hipiId':'noLinks=1&tabular=1&hipiId={HIP}',
+           'hipepId':'hipepId={HIP}',
+           'dmId':'dmId={HIP}'}
+
+# Settings of the on-disk cache.
+# cache_dir: where the compressed pages are kept, one file per (kind, HIP).
+# ttl: pages older than ttl seconds are downloaded again (None = never expire).
+# max_size: upper limit of the cache in bytes; the least recently used pages are evicted beyond it (None = no limit).
+# offline: never touch the network, a page missing from the cache raises OfflineError.
+# enabled: set to False to always download and never write the cache.
+# Settings of the downloads.
+# timeout: seconds to wait for the ESA server.
+# retries, backoff: transient errors (connection errors, HTTP 429 and 5xx) are retried up to `retries` times,
+#                   waiting backoff*2^n seconds in between.
+# pool_size: number of keep-alive connections kept open to the server.
+# max_rps: at most max_rps requests are sent per second, shared by all threads (None = no limit).
+settings = {'cache_dir': os.environ.get('HIPY_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'hipy')),
+            'ttl': None,
+            'max_size': 2*1024**3,
+            'offline': os.environ.get('HIPY_OFFLINE', '') not in ('', '0'),
+            'enabled': True,
+            'timeout': 60,
+            'retries': 3,
+            'backoff': 0.5,
+            'pool_size': 16,
+            'max_rps': None}
+
+# Hit/miss counters, reset by reset_stats().
+stats = {'hits':0, 'misses':0, 'expired':0, 'downloads':0, 'bytes_downloaded':0, 'evictions':0}
+
+_lock = threading.RLock()
+_size = None  # Total size of the cache in bytes, counted lazily on the first write.
+_session = None
+_limiter = None
+
+class OfflineError(LookupError):
+    pass
+
+def configure(**kwargs):
+    global _size, _session, _limiter
+    for key, value in kwargs.items():
+        if key not in settings:
+            raise KeyError(f'Unknown cache setting: {key}')
+        settings[key] = value
+    with _lock:
+        if 'cache_dir' in kwargs:
+            _size = None
+        if {'retries', 'backoff', 'pool_size'} & set(kwargs) and _session is not None:
+            _session.close()
+            _session = None
+        if 'max_rps' in kwargs:
+            _limiter = None if settings['max_rps'] is None else RateLimiter(settings['max_rps'])
+    return dict(settings)
+
+# Spread the requests evenly in time: each call of wait() returns at least 1/rate seconds after the previous one.
+class RateLimiter:
+
+    def __init__(self, rate):
+        self.interval = 1.0/rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+# One HTTP session shared by all threads, so that connections to the ESA server are kept alive and reused.
+def session():
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(total=settings['retries'], backoff_factor=settings['backoff'],
+                          status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings['pool_size'], max_retries=retry)
+            _session = requests.Session()
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def reset_stats():
+    with _lock:
+        for key in stats:
+            stats[key] = 0
+
+def page_url(kind, HIP):
+    return base_url + '?' + queries[kind].format(HIP=int(HIP))
+
+def _path(kind, HIP):
+    return os.path.join(settings['cache_dir'], kind, f'{int(HIP)}.z')
+
+def _count(key, n=1):
+    with _lock:
+        stats[key] += n
+
+# Download one page without going through the cache.
+# limiter: the RateLimiter of the request, e.g. one per batch of downloads (None = the one of settings['max_rps']).
+def download(kind, HIP, limiter=None):
+    limiter = _limiter if limiter is None else limiter
+    if limiter is not None:
+        limiter.wait()
+    response = session().get(page_url(kind, HIP), timeout=settings['timeout'])
+    response.raise_for_status()
+    payload = response.content
+    instrument.note(source='http', bytes=len(payload))
+    _count('downloads')
+    _count('bytes_downloaded', len(payload))
+    return payload
+
+# Get the raw bytes of one page, from the cache if possible. limiter: see download.
+def fetch(kind, HIP, limiter=None):
+    with instrument.phase('fetch', HIP, kind=kind):
+        return _fetch(kind, HIP, limiter)
+
+def _fetch(kind, HIP, limiter=None):
+    if kind not in queries:
+        raise KeyError(f'Unknown kind of page: {kind}')
+    if not settings['enabled']:
+        if settings['offline']:
+            raise OfflineError(f'The cache is disabled and hipy is offline, cannot get {kind}={HIP}.')
+        return download(kind, HIP, limiter)
+
+    path = _path(kind, HIP)
+    try:
+        mtime = os.stat(path).st_mtime
+        with open(path, 'rb') as f:
+            payload = zlib.decompress(f.read())
+    except (OSError, zlib.error):
+        payload = None
+    if payload is not None:
+        ttl = settings['ttl']
+        if settings['offline'] or ttl is None or time.time() - mtime < ttl:
+            # Keep the download time as mtime (for ttl) and the last access time as atime (for LRU eviction).
+            try:
+                os.utime(path, (time.time(), mtime))
+            except OSError:
+                pass
+            _count('hits')
+            instrument.note(source='cache', bytes=len(payload))
+            return payload
+        _count('expired')
+
+    _count('misses')
+    if settings['offline']:
+        raise OfflineError(f'{kind}={HIP} is not in the cache at {settings["cache_dir"]} and hipy is offline.')
+    payload = download(kind, HIP, limiter)
+    store(kind, HIP, payload)
+    return payload
+
+# Write one page into the cache, and evict the least recently used pages if the cache is too large.
+def store(kind, HIP, payload):
+    global _size
+    path = _path(kind, HIP)
+    data = zlib.compress(payload, 6)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    with _lock:
+        try:
+            old = os.stat(path).st_size
+        except OSError:
+            old = 0
+        os.replace(tmp, path)
+        if _size is not None:
+            _size += len(data) - old
+        if settings['max_size'] is not None:
+            if _size is None:
+                _size = sum(size for _, size, _ in _entries())
+            if _size > settings['max_size']:
+                _evict(settings['max_size'])
+
+def _entries():
+    root = settings['cache_dir']
+    for kind in queries:
+        folder = os.path.join(root, kind)
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith('.z'):
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_atime
+
+def _evict(limit):
+    global _size
+    entries = sorted(_entries(), key=lambda x: x[2])
+    total = sum(size for _, size, _ in entries)
+    for path, size, _ in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        stats['evictions'] += 1
+    _size = total
+
+# Remove the cached pages of one kind, or the whole cache.
+def clear(kind=None):
+    global _size
+    with _lock:
+        kinds = queries if kind is None else [kind]
+        for path, _, _ in list(_entries()):
+            if os.path.basename(os.path.dirname(path)) in kinds:
+                os.remove(path)
+        _size = None
+
+# Number of pages and bytes in the cache.
+def usage():
+    entries = list(_entries())
+    return len(entries), sum(x[1] for x in entries)
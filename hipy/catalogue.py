@@ -0,0 +1,134 @@
+import os
+import gzip
+import numpy as np
+from astropy import units as u
+from . import cache
+from . import columnar
+from . import formats
+
+# Names and descriptions of the 78 fields (H0-H77) of the Hipparcos main catalogue, in the order of hip_main.dat.
+names = ('catalogue','hip','proximity_flag','ra_hms','dec_dms','v_mag','coarse_varflag','v_mag_source',
+         'ra','dec','astrometry_flag','parallax','pmra','pmdec','ra_error','dec_error','parallax_error','pmra_error','pmdec_error',
+         'ra_dec_corr','ra_parallax_corr','dec_parallax_corr','ra_pmra_corr','dec_pmra_corr','parallax_pmra_corr','ra_pmdec_corr','dec_pmdec_corr','parallax_pmdec_corr','pmra_pmdec_corr',
+         'f1','f2','hip_number','bt_mag','bt_mag_error','vt_mag','vt_mag_error','bt_vt_flag','b_v','b_v_error','b_v_source','v_i','v_i_error','v_i_source','colour_indices_flag',
+         'hp_mag','hp_mag_error','hp_scatter','hp_number','phot_flag','hp_max','hp_min','var_period','var_type','var_tables_flag','var_light_curves_flag',
+         'ccdm','ccdm_historical_status','n_catalogue_entries','n_components','dmsa_flag','astrometric_source_flag','solution_quality','component_identifiers',
+         'position_angle','angular_separation','angular_separation_error','delta_hp','delta_hp_error',
+         'survey_flag','chart_flag','notes_flag','hd','bd','cod','cpd','v_i_mag_red','sp_type','sp_type_source')
+
+meta = {'catalogue':'Catalogue (H = Hipparcos, T = Tycho)', 'hip':'Hipparcos Catalogue(HIP) identifier', 'proximity_flag':'Proximity flag',
+        'ra_hms':'The approximate right ascension in conventional sexagesimal units with truncated precision and within the ICRS reference system, for epoch J1991.25',
+        'dec_dms':'The approximate declination in conventional sexagesimal units with truncated precision and within the ICRS reference system, for epoch J1991.25',
+        'v_mag':'The magnitude, V, in the Johnson UBV photometric system','coarse_varflag':'Coarse variability flag', 'v_mag_source':'Source of magnitude identifier',
+        'ra':'right ascension in degrees (J1991.25, ICRS)','dec':'declination in degrees (J1991.25, ICRS)','astrometry_flag':'Reference flag for astrometric parameters of double and multiple systems',
+        'parallax':'Trigonometric parallax (mas)','pmra':'proper motion in RA direction (mas/yr,J1991.25,ICRS)','pmdec':'proper motion in Dec direction (mas/yr,J1991.25,ICRS)',
+        'ra_error':'Standard error of RA (mas, J1991.25)','dec_error':'Standard error of Dec (mas, J1991.25)',
+        'parallax_error':'Standard error of parallax (mas)','pmra_error':'Standard error of proper motion in RA direction (mas/yr)','pmdec_error':'Standard error of proper motion in Dec direction (mas/yr)',
+        'ra_dec_corr':'correlation coefficient between RA and Dec','ra_parallax_corr':'correlation coefficient between RA and parallax','dec_parallax_corr':'correlation coefficient between declination and parallax',
+        'ra_pmra_corr':'correlation coefficient between RA and pmra','dec_pmra_corr':'correlation coefficient between Dec and pmra','parallax_pmra_corr':'correlation coefficient between parallax and pmra',
+        'ra_pmdec_corr':'correlation coefficient between RA and pmdec','dec_pmdec_corr':'correlation coefficient between Dec and pmdec','parallax_pmdec_corr':'correlation coefficient between parallax and pmdec','pmra_pmdec_corr':'correlation coefficient between pmra and pmdec',
+        'f1':'The percentage of rejected data','f2':'Goodness-of-fit statistic','hip_number':'Hipparcos Catalogue(HIP) identifier','bt_mag':'BT, Mean magnitude in the Tycho photometric system (mag)','bt_mag_error':'Standard error of the BT magnitude (mag)',
+        'vt_mag':'VT, Mean magnitude in the Tycho photometric system (mag)','vt_mag_error':'Standard error of the VT magnitude (mag)','bt_vt_flag':'Reference flag for BT and VT','b_v':'Colour index, B-V (mag)','b_v_error':'Standard error of the colour index (mag)','b_v_source':'Source of B-V',
+        'v_i':'Colour index, V-I (mag)','v_i_error':'Standard error of the colour index (mag)','v_i_source':'Source of the colour index, V-I','colour_indices_flag':'Reference flag for colour indices',
+        'hp_mag':'Median magnitude in the Hipparcos photometric system, Hp (mag)','hp_mag_error':'Standard error of the median Hp magnitude (mag)','hp_scatter':'Scatter of the Hp observations, s (mag)','hp_number':'Number of Hp observations, N','phot_flag':'Reference flag for the photometry parameters',
+        'hp_max':'Mag at max, Hp (5th percentile)','hp_min':'Mag at min, Hp (95th percentile)','var_period':'Variability period from Hipparcos observations (days)','var_type':'Type of variability','var_tables_flag':'Variability annex flag: tabular data','var_light_curves_flag':'Variability annex flag: light curves',
+        'ccdm':'the identifier of the Catalogue of Component of Double and Multiple Stars','ccdm_historical_status':'Historical status of the CCDM identifier','n_catalogue_entries':'Number of separate catalogue entries with the same CCDM identifier','n_components':'Number of components into which the entry was resolved',
+        'dmsa_flag':'Double and multiple systems annex flag','astrometric_source_flag':'Source of the absolute astrometry','solution_quality':'Solution quality flag','component_identifiers':'Component designation for parameters below',
+        'position_angle':'Position angle between the components, rounded (degrees,J1991.25)','angular_separation':'Angular separation between the components, rounded (arcsec,J1991.25)','angular_separation_error':'Standard error of the angular separation (arcsec)','delta_hp':'Magnitude difference of components (mag)','delta_hp_error':'Standard error of the magnitude difference (mag)',
+        'survey_flag':'Flag indicating survey star','chart_flag':'Flag indicating identification chart','notes_flag':'Flag indicating a note given at the end of the volumes','hd':'HD/HDE/HDEC identifier','bd':'DM identifier (BD)','cod':'DM identifier (CoD)','cpd':'DM identifier (CPD)',
+        'v_i_mag_red':'V-I (mag) used for photometric processing','sp_type':'Spectral type','sp_type_source':'Source of spectral type'}
+
+# Assign units to columns, by field number.
+index_mag = [5,32,33,34,35,37,38,40,41,44,45,46,49,50,66,67,75]
+index_deg = [8,9,63]
+index_mas = [11,14,15,16]
+index_mas_yr = [12,13,17,18]
+index_float = [19,20,21,22,23,24,25,26,27,28,29,30]
+units = {}
+for i in index_mag:
+    units[names[i]] = u.mag
+for i in index_deg:
+    units[names[i]] = u.deg
+for i in index_mas:
+    units[names[i]] = u.mas
+for i in index_mas_yr:
+    units[names[i]] = u.mas/u.yr
+units[names[51]] = u.d
+units[names[64]] = u.arcsec
+units[names[65]] = u.arcsec
+floats = [names[i] for i in index_float] + list(units)
+
+schema = formats.Schema(names, meta, units, copy=False)  # the columns of both parsers are new arrays
+
+# Columns (name → array) of the catalogue from its 78 columns, in the order of `names`, with the float columns converted
+# and 'nan' for the empty text fields, as in the local store (see ingest).
+def columns_of(values):
+    return {name:np.asarray(col, dtype=float) if name in floats else np.array([x if isinstance(x, str) else 'nan' for x in col])
+            for name, col in zip(names, values)}
+
+# Build the catalogue QTable, or another output (see formats), from the 78 columns, in the order of `names`.
+def table(columns, output='qtable'):
+    return schema.output(columns_of(columns), output)
+
+# Local copy of the catalogue. `ingest` reads the official fixed-width file hip_main.dat (or hip_main.dat.gz, from
+# https://cdsarc.cds.unistra.fr/ftp/I/239/) once into a columnar store, in which every column is a memory-mapped
+# array and rows are found through a HIP → row index. Afterwards `get_data(star_name, 'catalogue')` is served locally.
+def default_store_dir():
+    return os.path.join(cache.settings['cache_dir'], 'catalogue')
+
+def ingest(path, store_dir=None):
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        rows = [line.rstrip(b'\r\n').split(b'|') for line in f if line.strip()]
+    if any(len(row) < len(names) for row in rows):
+        raise ValueError(f'{path} does not look like hip_main.dat: every line should have {len(names)} fields separated by "|".')
+    fields = list(zip(*[row[:len(names)] for row in rows]))
+
+    columns = {}
+    for i, name in enumerate(names):
+        col = np.char.strip(np.array(fields[i], dtype=bytes))
+        if name in floats:
+            value = np.full(len(col), np.nan)
+            filled = col != b''
+            value[filled] = col[filled].astype(float)
+            columns[name] = value
+        else:
+            # The text columns (and the HIP numbers) as the page parser reads them: str, 'nan' for the empty fields.
+            columns[name] = np.where(col == b'', 'nan', np.char.decode(col, 'latin-1'))
+    columnar.write(store_dir, columns, units=units, meta=meta, key='hip')
+    _stores.pop(store_dir, None)
+    return open_store(store_dir)
+
+_stores = {}
+
+class CatalogueStore(columnar.Store):
+
+    # Catalogue rows of one or many HIP numbers, as a QTable with the same columns and units as get_data(..., 'catalogue'),
+    # or another output (see formats), e.g. a structured array of the whole catalogue: table(store['hip'], 'numpy').
+    def table(self, hips, output='qtable'):
+        rows = self.rows(np.atleast_1d(hips))
+        if (rows < 0).any():
+            missing = np.atleast_1d(hips)[rows < 0]
+            raise IndexError(f'HIP {", ".join(str(x) for x in missing[:10])} cannot be found in the local catalogue.')
+        if np.ndim(hips) == 0:
+            # One star: a slice of each column, copied, is cheaper than indexing 78 columns with an array of rows.
+            row = int(rows[0])
+            return schema.output({name:self[name][row:row+1].copy() for name in names}, output)
+        return schema.output(self.take(rows, names), output)
+
+def open_store(store_dir=None):
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    store = _stores.get(store_dir)
+    if store is None:
+        store = _stores[store_dir] = CatalogueStore(store_dir)
+    return store
+
+# The local catalogue if it has been ingested, otherwise None.
+def local():
+    store_dir = default_store_dir()
+    if store_dir in _stores:
+        return _stores[store_dir]
+    if columnar.exists(store_dir):
+        return open_store(store_dir)
+    return None
@@ -0,0 +1,123 @@
+import os
+import json
+import shutil
+import numpy as np
+
+# A columnar store is a folder holding one .npy file per column, a schema.json with the column names, units and descriptions,
+# and optionally an index.npy that maps HIP numbers to row numbers (-1 if the HIP number is not in the store), or a
+# ranges.npy that maps HIP numbers to the (offset, length) of their rows, for stores with many rows per star sorted by HIP.
+# Columns are opened as read-only memory maps, so only the rows that are looked up are read from disk.
+
+# Write a dict of equal-length columns into store_dir. If key is given, build the HIP → row index from that column.
+# If ranges is given, build the HIP → (offset, length) index from that column, whose equal values must be contiguous.
+def write(store_dir, columns, units=None, meta=None, key=None, ranges=None):
+    units = units or {}
+    meta = meta or {}
+    names = list(columns)
+    nrows = len(columns[names[0]]) if names else 0
+    tmp = store_dir.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    files = []
+    for i, name in enumerate(names):
+        col = np.ascontiguousarray(columns[name])
+        if len(col) != nrows:
+            raise ValueError(f'Column {name} has {len(col)} rows, expected {nrows}.')
+        files.append(f'{i:03d}.npy')
+        np.save(os.path.join(tmp, files[-1]), col)
+    if key is not None:
+        np.save(os.path.join(tmp, 'index.npy'), build_index(columns[key]))
+    if ranges is not None:
+        np.save(os.path.join(tmp, 'ranges.npy'), build_ranges(columns[ranges]))
+    schema = {'names':names, 'files':files, 'nrows':nrows, 'key':key if key is not None else ranges,
+              'units':{name:str(units[name]) for name in names if name in units},
+              'meta':{name:meta[name] for name in names if name in meta}}
+    with open(os.path.join(tmp, 'schema.json'), 'w') as f:
+        json.dump(schema, f, indent=1)
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp, store_dir)
+    return store_dir
+
+# Dense lookup table: index[HIP] is the row of HIP, or -1.
+def build_index(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    index = np.full(int(keys.max())+1 if len(keys) else 1, -1, dtype=np.int32)
+    index[keys[::-1]] = np.arange(len(keys)-1, -1, -1, dtype=np.int32)  # the first row wins for duplicated keys
+    return index
+
+# Dense lookup table: ranges[HIP] is the (offset, length) of the rows of HIP, (0, 0) if there are none.
+def build_ranges(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    ranges = np.zeros((int(keys.max())+1 if len(keys) else 1, 2), dtype=np.int64)
+    if len(keys):
+        starts = np.concatenate([[0], (keys[1:] != keys[:-1]).nonzero()[0] + 1])
+        if len(np.unique(keys[starts])) != len(starts):
+            raise ValueError('The rows of each key must be contiguous.')
+        ranges[keys[starts], 0] = starts
+        ranges[keys[starts], 1] = np.diff(np.append(starts, len(keys)))
+    return ranges
+
+def exists(store_dir):
+    return os.path.isfile(os.path.join(store_dir, 'schema.json'))
+
+class Store:
+
+    def __init__(self, store_dir):
+        self.path = store_dir
+        with open(os.path.join(store_dir, 'schema.json')) as f:
+            schema = json.load(f)
+        self.names = schema['names']
+        self.nrows = schema['nrows']
+        self.key = schema['key']
+        self.units = schema['units']
+        self.meta = schema['meta']
+        self._files = dict(zip(self.names, schema['files']))
+        self._columns = {}
+        index = os.path.join(store_dir, 'index.npy')
+        self.index = np.load(index, mmap_mode='r') if os.path.isfile(index) else None
+        ranges = os.path.join(store_dir, 'ranges.npy')
+        self.ranges = np.load(ranges, mmap_mode='r') if os.path.isfile(ranges) else None
+
+    def __len__(self):
+        return self.nrows
+
+    def __getitem__(self, name):
+        col = self._columns.get(name)
+        if col is None:
+            if name not in self._files:
+                raise KeyError(f'No column {name} in {self.path}')
+            # A plain array over the memory map: indexing an np.memmap costs several times more (its subclass hooks).
+            col = np.asarray(np.load(os.path.join(self.path, self._files[name]), mmap_mode='r'))
+            self._columns[name] = col
+        return col
+
+    def __contains__(self, hip):
+        if self.ranges is not None:
+            rows = self.slice(hip)
+            return rows.stop > rows.start
+        return self.rows(hip) >= 0
+
+    # Row numbers of one or many HIP numbers, -1 for those not in the store.
+    def rows(self, hips):
+        hips = np.asarray(hips, dtype=np.int64)
+        inside = (hips >= 0) & (hips < len(self.index))
+        return np.where(inside, self.index[np.where(inside, hips, 0)], -1)
+
+    # Rows of one HIP number in a store with ranges, as a slice (empty if the HIP number is not in the store).
+    def slice(self, hip):
+        hip = int(hip)
+        if not 0 <= hip < len(self.ranges):
+            return slice(0, 0)
+        offset, length = self.ranges[hip]
+        return slice(int(offset), int(offset + length))
+
+    # Values of some columns (default: all) of one HIP number in a store with ranges, as views of the memory maps (no copy).
+    def view(self, hip, names=None):
+        rows = self.slice(hip)
+        names = self.names if names is None else names
+        return {name:self[name][rows] for name in names}
+
+    # Values of some columns (default: all) at the given rows.
+    def take(self, rows, names=None):
+        names = self.names if names is None else names
+        return {name:self[name][rows] for name in names}
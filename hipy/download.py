@@ -1,28 +1,34 @@
-import requests
-from astroquery.simbad import Simbad
 import numpy as np
-import pandas as pd
-from astropy.table import QTable, Table, Column
 from astropy import units as u
-import urllib
+from . import cache
+from . import catalogue
+from . import photometry
+from . import intermediate
+from . import resolve
+from .star import Star, as_star
 import re
-import bs4
+from . import page
+from . import instrument
+from . import formats
 import math
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Construct functions to convert years(float) to Julian Date(float).
+# They work on scalars as well as on NumPy arrays of any shape (element by element).
 def cal2jd(yr,mn,dy):
-    y = yr - 1
-    m = mn + 12
+    y = np.asarray(yr) - 1
+    m = np.asarray(mn) + 12
 #   date1 = 4.5+31*(10+12*1582);   # Last day of Julian calendar (1582.10.04 Noon)
 #   date2 = 15.5+31*(10+12*1582);  # First day of Gregorian calendar (1582.10.15 Noon)
 #   date = dy+31*(mn+12*yr)
     b = y//400 - y//100
 #   b = math.floor(y/400) - math.floor(y/100)
-    jd = math.floor(365.25*y) + math.floor(30.6001*(m+1)) + b + 1720996.5 + dy
-    return jd
+    jd = np.floor(365.25*y) + np.floor(30.6001*(m+1)) + b + 1720996.5 + dy
+    return jd[()]
 def yr2jd(yr):  
-    iyr = math.floor(yr)
+    yr = np.asarray(yr, dtype=float)
+    iyr = np.floor(yr)
     jd0 = cal2jd(iyr,1,1)
     days = cal2jd(iyr+1,1,1)-jd0
     doy = (yr-iyr)*days+1
@@ -30,58 +36,54 @@ def yr2jd(yr):
     return jd1
 
 # This is from L. Lindegren's code to give the barycentric position of the earth in a given year between 1988 an 1993. 
+# `year` can be a scalar or an array of any shape; the result has one more axis of length 3 for x, y, z (au).
+c_earth = np.array([[.540817e+09, -.334118e+11, -.145868e+12],
+                    [-.202315e+10, .133781e+12, -.306652e+11],
+                    [-.883589e+09, .580048e+11, -.132951e+11]])
 def cearth(year):
     omega = 0.0172021240/86400
     e = 0.016714
     g0 = -0.04128
     au = 1.496e+11
-    c = [[.540817e+09, -.334118e+11, -.145868e+12],
-         [-.202315e+10, .133781e+12, -.306652e+11],
-         [-.883589e+09, .580048e+11, -.132951e+11]]
-    ret = []
-    t  = (year - 1988.0) * 365.25 * 86400.0
+    c = c_earth
+    t  = (np.asarray(year, dtype=float) - 1988.0) * 365.25 * 86400.0
     arg = omega * t + g0
-    arg = arg + e * math.sin(arg)
-    co = math.cos(arg)
-    si = math.sin(arg)
-    for i in range(3):
-        ret.append((c[i][0] + c[i][1]*co + c[i][2]*si)/au)
+    arg = arg + e * np.sin(arg)
+    co = np.cos(arg)[...,np.newaxis]
+    si = np.sin(arg)[...,np.newaxis]
+    ret = (c[:,0] + c[:,1]*co + c[:,2]*si)/au
     return ret
 
+# Parallax factors in RA and Dec of a star at (ra, dec) in degrees, at the given years (scalar or array).
+def parallax_factors(ra,dec,year):
+    d2r = math.pi/180
+    ret = cearth(year)
+    pa = ret[...,0]*math.sin(ra*d2r) - ret[...,1]*math.cos(ra*d2r)
+    pd = (ret[...,0]*math.cos(ra*d2r) + ret[...,1]*math.sin(ra*d2r))*math.sin(dec*d2r) - ret[...,2]*math.cos(dec*d2r)
+    return pa, pd
+
 # Get five astrometric parameters of an HIP entry. 
 def query(HIP):
-    url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}'
-    webpage = str(urllib.request.urlopen(url).read())
-    soup = bs4.BeautifulSoup(webpage,'html.parser')
-    text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
-    text = text.split('\\r\\n\\r\\n')[0].split('\\n',1)[1].split('\\n',1)[0].split('|')
-    p = [float(x) for x in text[2:7]]
+    text_list = page.pre_lines(cache.fetch('hipiId',HIP))
+    p = [float(x) for x in text_list[1].split('|')[2:7]]
     return p
 
-def get_data(star_name,type):
-    
-    # Convert the names of stars to HIP numbers, and get HIP numbers.
-    if star_name.startswith('HIP'):
-        HIP = int(star_name.split('HIP')[1])
+# Get the catalogue data of one HIP entry, as a QTable or another output (see formats).
+# fetch(kind, HIP) returns the raw bytes of one page: cache.fetch by default, or the memoised pages of a Star.
+def _get_catalogue(HIP, fetch=cache.fetch, output='qtable'):
+    # Serve the catalogue from the local copy of hip_main.dat if it has been ingested (see catalogue.ingest).
+    store = catalogue.local()
+    if (store is not None) and (HIP in store):
+        with instrument.phase('local', HIP, kind='hipId'):
+            out = store.table(HIP, output)
     else:
-        result_table = Simbad.query_objectids(star_name)
-        line = list(filter(lambda x: 'HIP' in str(x), result_table))
-        HIP = int(line[0][0].split('HIP')[1])
-
-    # Download 3 types of Hipparcos data: catalogue data (catalogue), intermediate data (intermediate), and epoch photometry data (epd).
-    # Download Hipparcos catalogue data.
-    if type == 'catalogue':
-        try:
-            print(f'### Query for catalogue_HIP {HIP}')
-            url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?hipId={HIP}'
-            webpage = str(urllib.request.urlopen(url).read()) # Load the webpage
-            # Parse webpage using https://www.crummy.com/software/BeautifulSoup/bs4/doc/#quick-start
-            soup = bs4.BeautifulSoup(webpage, features='html.parser')
-            # Get the text from the webpage. Note that the table is under the "pre" tag
-            text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\n'") # remove extra '\\n' 
-            text_list = text.split('\\n')
-            # Now we have each row of the table. But still need to split each row
+        webpage = fetch('hipId',HIP) # Load the webpage
+        # Get the lines of the table. Note that the table is under the "pre" tag
+        with instrument.phase('extract', HIP, kind='hipId'):
+            text_list = page.pre_lines(webpage)
+        # Now we have each row of the table. But still need to split each row
 
+        with instrument.phase('parse', HIP, kind='hipId'):
             # The first column and the first row are useless.
             # Notice that the last 4 lines are comments, thus useless.
             # `data_list` is just useful contents
@@ -96,70 +98,183 @@ def get_data(star_name,type):
             value_list_t = list(zip(*value_list)) # Transpose the value_list
             final_list = [value_list_t[0]]
             final_list_t = list(zip(*final_list))
-            
-            # Assign units to columns.
-            index_mag = [5,32,33,34,35,37,38,40,41,44,45,46,49,50,66,67,75]
-            index_deg = [8,9,63]
-            index_mas = [11,14,15,16]
-            index_mas_yr = [12,13,17,18]
-            index_float = [19,20,21,22,23,24,25,26,27,28,29,30]
-            for i in index_mag:
-                final_list_t[i] = [float(x) for x in list(final_list_t[i])] * u.mag
-            for i in index_deg:
-                final_list_t[i] = [float(x) for x in list(final_list_t[i])] * u.deg
-            for i in index_mas:
-                final_list_t[i] = [float(x) for x in list(final_list_t[i])] * u.mas
-            for i in index_mas_yr:
-                final_list_t[i] = [float(x) for x in list(final_list_t[i])] * u.mas/u.yr
-            for i in index_float:
-                final_list_t[i] = [float(x) for x in list(final_list_t[i])]
-            final_list_t[51] = [float(x) for x in list(final_list_t[51])] * u.d
-            final_list_t[64] = [float(x) for x in list(final_list_t[64])] * u.arcsec
-            final_list_t[65] = [float(x) for x in list(final_list_t[65])] * u.arcsec
-            
-            # Assign names and descriptions to columns.
-            out = QTable(final_list_t,
-                 names=('catalogue','hip','proximity_flag','ra_hms','dec_dms','v_mag','coarse_varflag','v_mag_source',
-                       'ra','dec','astrometry_flag','parallax','pmra','pmdec','ra_error','dec_error','parallax_error','pmra_error','pmdec_error',                        
-                       'ra_dec_corr','ra_parallax_corr','dec_parallax_corr','ra_pmra_corr','dec_pmra_corr','parallax_pmra_corr','ra_pmdec_corr','dec_pmdec_corr','parallax_pmdec_corr','pmra_pmdec_corr',                      
-                        'f1','f2','hip_number','bt_mag','bt_mag_error','vt_mag','vt_mag_error','bt_vt_flag','b_v','b_v_error','b_v_source','v_i','v_i_error','v_i_source','colour_indices_flag',             
-                        'hp_mag','hp_mag_error','hp_scatter','hp_number','phot_flag','hp_max','hp_min','var_period','var_type','var_tables_flag','var_light_curves_flag',                        
-                       'ccdm','ccdm_historical_status','n_catalogue_entries','n_components','dmsa_flag','astrometric_source_flag','solution_quality','component_identifiers',
-                        'position_angle','angular_separation','angular_separation_error','delta_hp','delta_hp_error',
-                        'survey_flag','chart_flag','notes_flag','hd','bd','cod','cpd','v_i_mag_red','sp_type','sp_type_source'),
-
-                 meta={'catalogue':'Catalogue (H = Hipparcos, T = Tycho)', 'hip':'Hipparcos Catalogue(HIP) identifier', 'proximity_flag':'Proximity flag',
-                       'ra_hms':'The approximate right ascension in conventional sexagesimal units with truncated precision and within the ICRS reference system, for epoch J1991.25', 
-                       'dec_dms':'The approximate declination in conventional sexagesimal units with truncated precision and within the ICRS reference system, for epoch J1991.25',
-                      'v_mag':'The magnitude, V, in the Johnson UBV photometric system','coarse_varflag':'Coarse variability flag', 'v_mag_source':'Source of magnitude identifier',
-                      'ra':'right ascension in degrees (J1991.25, ICRS)','dec':'declination in degrees (J1991.25, ICRS)','astrometry_flag':'Reference flag for astrometric parameters of double and multiple systems',
-                      'parallax':'Trigonometric parallax (mas)','pmra':'proper motion in RA direction (mas/yr,J1991.25,ICRS)','pmdec':'proper motion in Dec direction (mas/yr,J1991.25,ICRS)',
-                       'ra_error':'Standard error of RA (mas, J1991.25)','dec_error':'Standard error of Dec (mas, J1991.25)',
-                      'parallax_error':'Standard error of parallax (mas)','pmra_error':'Standard error of proper motion in RA direction (mas/yr)','pmdec_error':'Standard error of proper motion in Dec direction (mas/yr)',
-                      'ra_dec_corr':'correlation coefficient between RA and Dec','ra_parallax_corr':'correlation coefficient between RA and parallax','dec_parallax_corr':'correlation coefficient between declination and parallax',          
-                       'ra_pmra_corr':'correlation coefficient between RA and pmra','dec_pmra_corr':'correlation coefficient between Dec and pmra','parallax_pmra_corr':'correlation coefficient between parallax and pmra',
-                       'ra_pmdec_corr':'correlation coefficient between RA and pmdec','dec_pmdec_corr':'correlation coefficient between Dec and pmdec','parallax_pmdec_corr':'correlation coefficient between parallax and pmdec','pmra_pmdec_corr':'correlation coefficient between pmra and pmdec',                      
-                       'f1':'The percentage of rejected data','f2':'Goodness-of-fit statistic','hip_number':'Hipparcos Catalogue(HIP) identifier','bt_mag':'BT, Mean magnitude in the Tycho photometric system (mag)','bt_mag_error':'Standard error of the BT magnitude (mag)',
-                       'vt_mag':'VT, Mean magnitude in the Tycho photometric system (mag)','vt_mag_error':'Standard error of the VT magnitude (mag)','bt_vt_flag':'Reference flag for BT and VT','b_v':'Colour index, B-V (mag)','b_v_error':'Standard error of the colour index (mag)','b_v_source':'Source of B-V',
-                       'v_i':'Colour index, V-I (mag)','v_i_error':'Standard error of the colour index (mag)','v_i_source':'Source of the colour index, V-I','colour_indices_flag':'Reference flag for colour indices',            
-                       'hp_mag':'Median magnitude in the Hipparcos photometric system, Hp (mag)','hp_mag_error':'Standard error of the median Hp magnitude (mag)','hp_scatter':'Scatter of the Hp observations, s (mag)','hp_number':'Number of Hp observations, N','phot_flag':'Reference flag for the photometry parameters',
-                       'hp_max':'Mag at max, Hp (5th percentile)','hp_min':'Mag at min, Hp (95th percentile)','var_period':'Variability period from Hipparcos observations (days)','var_type':'Type of variability','var_tables_flag':'Variability annex flag: tabular data','var_light_curves_flag':'Variability annex flag: light curves',                       
-                       'ccdm':'the identifier of the Catalogue of Component of Double and Multiple Stars','ccdm_historical_status':'Historical status of the CCDM identifier','n_catalogue_entries':'Number of separate catalogue entries with the same CCDM identifier','n_components':'Number of components into which the entry was resolved',
-                       'dmsa_flag':'Double and multiple systems annex flag','astrometric_source_flag':'Source of the absolute astrometry','solution_quality':'Solution quality flag','component_identifiers':'Component designation for parameters below', 
-                       'position_angle':'Position angle between the components, rounded (degrees,J1991.25)','angular_separation':'Angular separation between the components, rounded (arcsec,J1991.25)','angular_separation_error':'Standard error of the angular separation (arcsec)','delta_hp':'Magnitude difference of components (mag)','delta_hp_error':'Standard error of the magnitude difference (mag)',
-                       'survey_flag':'Flag indicating survey star','chart_flag':'Flag indicating identification chart','notes_flag':'Flag indicating a note given at the end of the volumes','hd':'HD/HDE/HDEC identifier','bd':'DM identifier (BD)','cod':'DM identifier (CoD)','cpd':'DM identifier (CPD)',
-                       'v_i_mag_red':'V-I (mag) used for photometric processing','sp_type':'Spectral type','sp_type_source':'Source of spectral type'})
-            
+
+        # Assign units, names and descriptions to columns.
+        with instrument.phase('build', HIP, kind='hipId'):
+            out = catalogue.table(final_list_t, output)
+    return out
+
+# Fields of the abscissa records of the intermediate data, in the order of the hipiId page:
+# orbit number, source of abscissa, 5 partial derivatives, abscissa residual, standard error, FAST/NDAC correlation,
+# and the mid-epoch and pole of the FAST/NDAC reference great-circle.
+iad_dtype = np.dtype([('orbit_number','i4'),('source_absc','U1'),
+                      ('absc/ra','f8'),('absc/dec','f8'),('absc/parallax','f8'),('absc/pmra','f8'),('absc/pmdec','f8'),
+                      ('absc_residual','f8'),('absc_error','f8'),('absc_corr','f8'),
+                      ('mid_epoch','f8'),('pole_ra','f8'),('pole_dec','f8')])
+
+# Parse the intermediate data page of one HIP entry. Returns the five astrometric parameters of the solution
+# (ra, dec in deg, parallax in mas, pmra, pmdec in mas/yr, at J1991.25) and the abscissa records as one structured array.
+def _parse_intermediate(webpage, HIP=None):
+    with instrument.phase('extract', HIP, kind='hipiId'):
+        text_list = page.pre_lines(webpage)
+    with instrument.phase('parse', HIP, kind='hipiId'):
+        p, data_list = _intermediate_rows(text_list)
+        return p, _records(data_list)
+
+# The five astrometric parameters and the fields of the abscissa records (strings, in the order of iad_dtype),
+# from the lines of the <pre> block of an intermediate data page.
+def _intermediate_rows(text_list):
+    p = [float(x) for x in text_list[1].split('|')[2:7]]
+    # After the 3 header lines, each record is an abscissa line and a great-circle line, followed by a blank line.
+    lines = [x for x in text_list[3:] if x.strip()]
+    # Each record holds the great-circle data of both consortia: keep those of its own consortium.
+    data_list = []
+    for absc, great_circle in zip(lines[0::2], lines[1::2]):
+        row = (absc + '|' + great_circle).split('|')
+        if ('F' in row) or ('f' in row):
+            data_list.append(row[0:10] + row[11:14])
+        elif ('N' in row) or ('n' in row):
+            data_list.append(row[0:10] + row[14:17])
+    return p, data_list
+
+def _records(data_list):
+    records = np.empty(len(data_list), dtype=iad_dtype)
+    for name, column in zip(iad_dtype.names, zip(*data_list)):
+        if name == 'absc_corr':
+            column = [x if x.strip() else 'nan' for x in column]  # no correlation if only one consortium observed
+        records[name] = column
+    return records
+
+# The astrometric parameters and the abscissa records of one HIP entry, from the local store if it has been ingested
+# (see intermediate.ingest: the records are then a dict of views of the store), otherwise from its page.
+def _intermediate_records(HIP, fetch=cache.fetch):
+    store = intermediate.local()
+    if (store is not None) and (HIP in store):
+        with instrument.phase('local', HIP, kind='hipiId'):
+            return store.records_of(HIP)
+    return _parse_intermediate(fetch('hipiId',HIP), HIP)
+
+# Get the intermediate astrometric data of one HIP entry, as a QTable or another output (see formats).
+def _get_intermediate(HIP, fetch=cache.fetch, output='qtable'):
+    return _intermediate_table(*_intermediate_records(HIP, fetch), HIP=HIP, output=output)
+
+# Names, descriptions and units of the columns of the intermediate data.
+intermediate_schema = formats.Schema(
+    names=('orbit_number','source_absc','obs_ra','obs_dec','absc/ra','absc/dec','absc/parallax','absc/pmra','absc/pmdec','absc_residual','ra_residual',
+           'dec_residual','absc_error','ra_error','dec_error','absc_corr','ra_dec_corr','ref_great-circle_mid-epoch (yr)',
+           'ref_great-circle_epoch_time (yr)','ref_great-circle_epoch_time (bjd)','great-circle_pole_ra','dec_great-circle_pole_dec'),
+    meta={'orbit_number':'orbit number','source_absc':'source of abscissa (F or f if FAST data, N or n if NDAC data)',
+          'obs_ra':'observational value of RA in this FAST/NDAC great-circle epoch time (deg)','obs_dec':'observational value of Dec in this FAST/NDAC great-circle epoch time (deg)',
+          'absc/ra':'abscissa partial derivative with respect to RA','absc/dec':'abscissa partial derivative with respect to Dec',
+          'absc/parallax':'abscissa partial derivative with respect to parallax','absc/pmra':'abscissa partial derivative with respect to proper motion in RA direction',
+          'absc/pmdec':'abscissa partial derivative with respect to proper motion in Dec direction',
+          'absc_residual':'abscissa residual','ra_residual':'residual of right ascension','dec_residual':'residual of declination',
+          'absc_error':'standard error of the abscissa','ra_error':'standard error of right ascension','dec_error':'standard error of declination',
+          'absc_corr':'correlation coefficient between FAST and NDAC abscissae','ra_dec_corr':'correlation coefficient between right ascension and declination',
+          'ref_great-circle_mid-epoch (yr)':'FAST/NDAC reference great-circle mid-epoch, in years relative to J1991.25(TT)',
+          'ref_great-circle_epoch_time (yr)':'the epoch time of the FAST/NDAC reference great-circle, in years',
+          'ref_great-circle_epoch_time (bjd)':'the epoch time of the FAST/NDAC reference great-circle, in Barycentric Julian Days',
+          'great-circle_pole_ra':'right ascension within ICRS of the FAST/NDAC reference great-circle pole',
+          'great-circle_pole_dec':'declination within ICRS of the FAST/NDAC reference great-circle pole'},
+    units={'obs_ra':u.deg,'obs_dec':u.deg,'absc_residual':u.mas,'ra_residual':u.mas,'dec_residual':u.mas,
+           'absc_error':u.mas,'ra_error':u.mas,'dec_error':u.mas,'ref_great-circle_mid-epoch (yr)':u.yr,
+           'ref_great-circle_epoch_time (yr)':u.yr,'ref_great-circle_epoch_time (bjd)':u.d,
+           'great-circle_pole_ra':u.deg,'dec_great-circle_pole_dec':u.deg})
+
+# Build the QTable of the intermediate data, or another output (see formats), from the output of _parse_intermediate.
+def _intermediate_table(p, records, HIP=None, output='qtable'):
+    with instrument.phase('derive', HIP, kind='hipiId'):
+        mid_epoch = records['mid_epoch']
+        epoch_time = mid_epoch + 1991.25
+
+        # Convert Julian years into Barycentric Julian Days.
+        jd = yr2jd(epoch_time)
+
+        # Convert abscissa residuals into RA residuals and Dec residuals, and standard errors of abscissa into standard errors of RA and Dec.
+        ra_residual = records['absc/ra']*records['absc_residual']
+        dec_residual = records['absc/dec']*records['absc_residual']
+        ra_error = records['absc/ra']*records['absc_error']
+        dec_error = records['absc/dec']*records['absc_error']
+        # Get the correlation coefficients between RA and Dec.
+        ra_dec_corr = records['absc/ra']*records['absc/dec']
+
+        # Get the observational values of ra and dec in corresponding FAST/NDAC great-circle epoch time.
+        d2r = math.pi/180
+        pa, pd = parallax_factors(p[0], p[1], epoch_time)
+        model_dec = p[1] + (mid_epoch*p[4] + pd*p[2])/3600/1000
+        obs_dec = model_dec + dec_residual/3600/1000
+        obs_ra = p[0] + (ra_residual + (mid_epoch*p[3] + p[2]*pa)/np.cos(model_dec*d2r))/3600/1000
+
+    with instrument.phase('build', HIP, kind='hipiId'):
+        values = (records['orbit_number'], records['source_absc'], obs_ra, obs_dec,
+                  records['absc/ra'], records['absc/dec'], records['absc/parallax'], records['absc/pmra'], records['absc/pmdec'],
+                  records['absc_residual'], ra_residual, dec_residual, records['absc_error'], ra_error, dec_error,
+                  records['absc_corr'], ra_dec_corr, mid_epoch, epoch_time, jd, records['pole_ra'], records['pole_dec'])
+        return intermediate_schema.output(dict(zip(intermediate_schema.names, values)), output)
+
+# Get the epoch photometry data of one HIP entry, as a QTable or another output (see formats).
+def _get_epd(HIP, fetch=cache.fetch, output='qtable'):
+    # Serve the epoch photometry from the local store if it has been ingested (see photometry.ingest).
+    store = photometry.local()
+    if (store is not None) and (HIP in store):
+        with instrument.phase('local', HIP, kind='hipepId'):
+            return store.table(HIP, output)
+    webpage = fetch('hipepId',HIP)
+    with instrument.phase('extract', HIP, kind='hipepId'):
+        text_list = page.pre_lines(webpage)
+    with instrument.phase('parse', HIP, kind='hipepId'):
+        # 17 header lines, then one line per transit.
+        data_list = [x.split('|') for x in text_list[17:] if x]
+        data_list_t = list(map(list, zip(*data_list)))
+        # Assign units to columns. The quality flags are kept as integers (bit fields, see photometry.flag_mask).
+        columns = {'obs_epoch':np.array([float(x) for x in data_list_t[0]]) + 2440000,
+                   'hp':np.array([float(x) for x in data_list_t[1]]),
+                   'hp_error':np.array([float(x) for x in data_list_t[2]]),
+                   'quality_flag':np.array([int(x) for x in data_list_t[3]], dtype=np.uint16)}
+    with instrument.phase('build', HIP, kind='hipepId'):
+        return photometry.table(columns, output)
+
+# Attributes of Star holding each type of data.
+_attributes = {'catalogue':'catalogue', 'intermediate':'intermediate', 'epd':'epoch_photometry'}
+
+# One type of data of a Star as output (see formats): the QTable it keeps, or a structured array or a DataFrame
+# parsed from the pages it keeps, which is not kept.
+def _data(star, type, output='qtable'):
+    if output == 'qtable':
+        return getattr(star, _attributes[type])
+    if type == 'catalogue':
+        return _get_catalogue(star.hip, star._fetch, output)
+    if type == 'intermediate':
+        return _intermediate_table(*star._intermediate, HIP=star.hip, output=output)
+    return _get_epd(star.hip, star._fetch, output)
+
+# star_name is the name of a star, or a Star whose pages and tables are reused.
+# output: 'qtable' (default), 'numpy' for a structured array or 'pandas' for a DataFrame, without Quantity (see formats).
+def get_data(star_name,type,output='qtable'):
+    formats.check(output)
+
+    # Convert the names of stars to HIP numbers, and get HIP numbers.
+    star = as_star(star_name)
+    HIP = star.hip
+
+    # Download 3 types of Hipparcos data: catalogue data (catalogue), intermediate data (intermediate), and epoch photometry data (epd).
+    # Download Hipparcos catalogue data.
+    if type == 'catalogue':
+        try:
+            print(f'### Query for catalogue_HIP {HIP}')
+            out = _data(star, 'catalogue', output)
+            flag = out['dmsa_flag'][0]
+
             # Give the solution type of this HIP entry.
-            if final_list_t[59][0] == 'C':
+            if flag == 'C':
                 print(f'HIP {HIP} is in a component solution.')
-            elif final_list_t[59][0] == 'G':
+            elif flag == 'G':
                 print(f'HIP {HIP} is in an acceleration solution.')
-            elif final_list_t[59][0] == 'O':
+            elif flag == 'O':
                 print(f'HIP {HIP} is in an orbital solution.')
-            elif final_list_t[59][0] == 'V':
+            elif flag == 'V':
                 print(f'HIP {HIP} is in a solution of variability-induced movers.')
-            elif final_list_t[59][0] == 'X':
+            elif flag == 'X':
                 print(f'HIP {HIP} is in a stochastic solution.')
             else:
                 print(f'HIP {HIP} is in a single star solution.')
@@ -173,113 +288,7 @@ def get_data(star_name,type):
     elif type == 'intermediate':
         try:
             print(f'### Query for intermediate_HIP {HIP}')
-            url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}'
-            webpage = str(urllib.request.urlopen(url).read())
-            soup = bs4.BeautifulSoup(webpage,'html.parser')
-            text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
-            text = text.split('\\r\\n\\r\\n')
-            text_list = []
-            text_list.append(text[0].split('\\n',3)[3])
-            for line in text[1:]:
-                text_list.append(line)
-            data_list = []
-            for row in text_list:
-                row = row.replace('\\n','|').split('|')
-                if ('F' in row) or ('f' in row):
-                    data = row[0:9]
-                    data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                    for x in row[11:14]:
-                        data.append(x)
-                elif ('N' in row) or ('n' in row):
-                    data = row[0:9]
-                    data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                    for x in row[14:]:
-                        data.append(x)
-                data_list.append(data)
-            data_list_t = list(map(list, zip(*data_list)))
-            index_float = [2,3,7,8,9,10]
-            for i in index_float:
-                data_list_t[i] = [float(x) for x in list(data_list_t[i])]
-
-            epoch_time = [x+1991.25 for x in list(data_list_t[10])]
-            data_list_t = np.array(data_list_t).transpose()
-            data_list_t = np.insert(data_list_t,11,epoch_time,axis=1)
-
-            # Convert Julian years into Barycentric Julian Days.
-            jd = []
-            for yr in epoch_time:  
-                jd.append(yr2jd(yr))
-            data_list_t = np.insert(data_list_t,12,jd,axis=1)
-
-            # Convert abscissa residuals into RA residuals and Dec residuals.
-            ra_residual = [float(data_list_t[i][2])*float(data_list_t[i][7]) for i in range(np.size(data_list_t,0))]
-            dec_residual = [float(data_list_t[i][3])*float(data_list_t[i][7]) for i in range(np.size(data_list_t,0))]
-            data_list_t = np.insert(data_list_t,8,ra_residual,axis=1)
-            data_list_t = np.insert(data_list_t,9,dec_residual,axis=1)
-
-            # Convert standard errors of abscissa into standard errors of RA and Dec.
-            ra_error = [float(data_list_t[i][2])*float(data_list_t[i][10]) for i in range(np.size(data_list_t,0))]
-            dec_error = [float(data_list_t[i][3])*float(data_list_t[i][10]) for i in range(np.size(data_list_t,0))]
-            data_list_t = np.insert(data_list_t,11,ra_error,axis=1)
-            data_list_t = np.insert(data_list_t,12,dec_error,axis=1)
-
-            # Get the correlation coefficients between RA and Dec.
-            ra_dec_corr = [float(data_list_t[i][2])*float(data_list_t[i][3]) for i in range(np.size(data_list_t,0))]
-            data_list_t = np.insert(data_list_t,14,ra_dec_corr,axis=1)
-
-            # Get the observational values of ra and dec in corresponding FAST/NDAC great-circle epoch time.
-            d2r = math.pi/180
-            p = query(HIP)
-
-            i = 0
-            obs_dec_list = []
-            obs_ra_list = []
-            for year in epoch_time:
-                ret = cearth(year)
-                pa = ret[0]*math.sin(p[0]*d2r) - ret[1]*math.cos(p[0]*d2r)
-                pd = (ret[0]*math.cos(p[0]*d2r) + ret[1]*math.sin(p[0]*d2r))*math.sin(p[1]*d2r) - ret[2]*math.cos(p[1]*d2r)
-                model_dec = p[1] + (float(data_list_t[i][15])*p[4] + pd*p[2])/3600/1000
-                obs_dec = model_dec + dec_residual[i]/3600/1000
-                obs_ra = p[0] + (ra_residual[i] + (float(data_list_t[i][15])*p[3] + p[2]*pa)/math.cos(model_dec*d2r))/3600/1000 
-                obs_dec_list.append(obs_dec)
-                obs_ra_list.append(obs_ra)
-                i = i + 1 
-            data_list_t = np.insert(data_list_t,2,obs_ra_list,axis=1)
-            data_list_t = np.insert(data_list_t,3,obs_dec_list,axis=1)
-
-            data_list_tt = list(zip(*data_list_t))
-            # Assign units to columns.
-            index_deg = [2,3,20,21]
-            index_float = [4,5,6,7,8,15,16]
-            index_mas = [9,10,11,12,13,14]
-            for i in index_deg:
-                data_list_tt[i] = [float(x) for x in list(data_list_tt[i])] * u.deg
-            for i in index_float:
-                data_list_tt[i] = [float(x) for x in list(data_list_tt[i])]
-            for i in index_mas:
-                data_list_tt[i] = [float(x) for x in list(data_list_tt[i])] * u.mas
-            data_list_tt[17] = [float(x) for x in list(data_list_tt[17])] * u.yr
-            data_list_tt[18] = [float(x) for x in list(data_list_tt[18])] * u.yr
-            data_list_tt[19] = [float(x) for x in list(data_list_tt[19])] * u.d
-
-            # Assign names and descriptions to columns.
-            out = QTable(data_list_tt,
-                names=('orbit_number','source_absc','obs_ra','obs_dec','absc/ra','absc/dec','absc/parallax','absc/pmra','absc/pmdec','absc_residual','ra_residual',
-                       'dec_residual','absc_error','ra_error','dec_error','absc_corr','ra_dec_corr','ref_great-circle_mid-epoch (yr)',
-                        'ref_great-circle_epoch_time (yr)','ref_great-circle_epoch_time (bjd)','great-circle_pole_ra','dec_great-circle_pole_dec'),
-                meta={'orbit_number':'orbit number','source_absc':'source of abscissa (F or f if FAST data, N or n if NDAC data)',
-                      'obs_ra':'observational value of RA in this FAST/NDAC great-circle epoch time (deg)','obs_dec':'observational value of Dec in this FAST/NDAC great-circle epoch time (deg)',
-                      'absc/ra':'abscissa partial derivative with respect to RA','absc/dec':'abscissa partial derivative with respect to Dec',
-                      'absc/parallax':'abscissa partial derivative with respect to parallax','absc/pmra':'abscissa partial derivative with respect to proper motion in RA direction',
-                      'absc/pmdec':'abscissa partial derivative with respect to proper motion in Dec direction',
-                      'absc_residual':'abscissa residual','ra_residual':'residual of right ascension','dec_residual':'residual of declination',
-                      'absc_error':'standard error of the abscissa','ra_error':'standard error of right ascension','dec_error':'standard error of declination',
-                      'absc_corr':'correlation coefficient between FAST and NDAC abscissae','ra_dec_corr':'correlation coefficient between right ascension and declination',
-                      'ref_great-circle_mid-epoch (yr)':'FAST/NDAC reference great-circle mid-epoch, in years relative to J1991.25(TT)',
-                      'ref_great-circle_epoch_time (yr)':'the epoch time of the FAST/NDAC reference great-circle, in years',
-                      'ref_great-circle_epoch_time (bjd)':'the epoch time of the FAST/NDAC reference great-circle, in Barycentric Julian Days',
-                      'great-circle_pole_ra':'right ascension within ICRS of the FAST/NDAC reference great-circle pole',
-                      'great-circle_pole_dec':'declination within ICRS of the FAST/NDAC reference great-circle pole'})            
+            out = _data(star, 'intermediate', output)
             print(f'For more detailed information, please refer to https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}')
         # A small minority of HIP intermediate data cannot be found.
         except IndexError:
@@ -289,24 +298,7 @@ def get_data(star_name,type):
     elif type == 'epd':
         try:
             print(f'### Query for epd_HIP {HIP}')
-            url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?hipepId={HIP}'
-            webpage = str(urllib.request.urlopen(url).read())
-            soup = bs4.BeautifulSoup(webpage,'html.parser')
-            text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n'")
-            text = text.split('\\n',17)[17]
-            text_list = text.split('\\r\\n')
-            data_list = [x.split('|') for x in text_list]
-            data_list_t = list(map(list, zip(*data_list)))
-            # Assign units to columns.
-            data_list_t[0] = [float(x)+2440000 for x in list(data_list_t[0])] * u.d
-            data_list_t[1] = [float(x) for x in list(data_list_t[1])] * u.mag
-            data_list_t[2] = [float(x) for x in list(data_list_t[2])] * u.mag
-            # Assign names and descriptions to columns.
-            out = QTable(data_list_t,
-                names=('obs_epoch','hp','hp_error','quality_flag'),
-                meta={'obs_epoch':'observation epoch, in Barycentric Julian Days',
-                      'hp':'calibrated Hp magnitude for this transit','hp_error':'estimated standard error of Hp magnitude','quality_flag':'quality flag, from bit 0 to bit 8'})
-            
+            out = _data(star, 'epd', output)
             print(f'For more detailed information, please refer to https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?hipepId={HIP}')
         # A small minority of HIP epoch photometry data cannot be found.
         except IndexError:
@@ -316,3 +308,57 @@ def get_data(star_name,type):
         print('No such type of data exits. Please check your input type.')
 
     return out
+
+# Page of each type of data, and its local store (see catalogue, photometry and intermediate.ingest).
+_kinds = {'catalogue':'hipId', 'intermediate':'hipiId', 'epd':'hipepId'}
+_stores = {'catalogue':catalogue, 'intermediate':intermediate, 'epd':photometry}
+
+# One type of data of one star of get_data_many: its page, unless a local store serves it, is fetched at the rate of limiter.
+def _data_limited(star, type, output, limiter):
+    star = as_star(star)
+    store = _stores[type].local()
+    if (store is None) or (star.hip not in store):
+        star.page(_kinds[type], limiter)
+    return _data(star, type, output)
+
+# Get the same type of data for many stars at once. The pages are downloaded by max_workers threads sharing one pool of
+# keep-alive connections (see cache.session; threads beyond cache.settings['pool_size'] open connections that are not
+# kept), with retries on transient errors and at most max_rps requests per second for this call (None: the limit of
+# cache.settings['max_rps'], shared with the other downloads).
+# stars can hold names, HIP numbers or Star objects; the names are resolved together (see resolve.resolve_many).
+# Nothing is printed: results[i] is the QTable (or the output, see get_data) of stars[i], or None if it failed, and
+# errors[i] is then the exception.
+def get_data_many(stars, type, max_workers=8, max_rps=None, output='qtable'):
+    if type not in _attributes:
+        raise ValueError(f'No such type of data: {type}. Please choose from {", ".join(_attributes)}.')
+    formats.check(output)
+    limiter = None if max_rps is None else cache.RateLimiter(max_rps)
+
+    stars = list(stars)
+    results = [None]*len(stars)
+    errors = [None]*len(stars)
+    # Resolve all the star names first, with at most one Simbad query.
+    names = [i for i, star in enumerate(stars) if not isinstance(star, (Star, int, np.integer))]
+    try:
+        hips = resolve.resolve_many([stars[i] for i in names])
+    except Exception:
+        hips = [stars[i] for i in names]  # e.g. offline: resolve them one by one, and report the errors per star
+    for i, HIP in zip(names, hips):
+        if HIP is None:
+            errors[i] = IndexError(f'{stars[i]} has no Hipparcos Catalogue(HIP) identifier.')
+        else:
+            stars[i] = HIP
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_data_limited, star, type, output, limiter) if errors[i] is None else None
+                   for i, star in enumerate(stars)]
+        for i, future in enumerate(futures):
+            if future is None:
+                continue
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                errors[i] = e
+    for star, e in zip(stars, errors):
+        if e is not None:
+            instrument.error(getattr(star, 'hip', star), e, type=type)
+    return results, errors
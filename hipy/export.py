@@ -0,0 +1,206 @@
+import os
+import re
+import json
+import numpy as np
+from . import columnar
+
+# Columnar datasets of the tables of hipy (get_data, get_dmsa, propagate, solve, ...), kept with their column names,
+# units and descriptions (the meta of the tables). A dataset is a folder of parts, one part per flush of a Writer, so
+# that a batch ingest can stream the rows of each star into one dataset, and append to it later:
+#
+#   with hipy.export.Writer('epd.parquet') as writer:
+#       for hip in hips:
+#           writer.write(hipy.get_data(hip, 'epd'), hip=hip)      # constant columns, e.g. the HIP number
+#   hipy.export.read('epd.parquet', columns=['hip','hp'])        # reads these two columns only
+#
+# The format of the parts follows the suffix of the folder:
+# - .parquet: Parquet files, .arrow or .feather: Arrow IPC files; both need pyarrow, which is imported on first use.
+#   The units, descriptions and shapes of the columns are kept in the metadata of the Arrow schema.
+# - anything else: columnar stores (see columnar), one .npy per column, memory-mapped when read.
+formats = {'.parquet':'parquet', '.arrow':'arrow', '.feather':'arrow'}
+_suffixes = {'parquet':'.parquet', 'arrow':'.arrow', 'npy':''}
+
+def _format(path):
+    return formats.get(os.path.splitext(path.rstrip(os.sep))[1].lower(), 'npy')
+
+def _arrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Parquet and Arrow datasets need pyarrow: pip install pyarrow, or use a folder without '
+                          'the .parquet/.arrow suffix for a dataset of .npy files.') from None
+    return pyarrow
+
+# Parts of a dataset, in the order they were written: part-NNNNN and the suffix of the format, without the leftovers
+# of an interrupted write (part-NNNNN.tmp, see columnar.write).
+def parts(path):
+    if not os.path.isdir(path):
+        return []
+    pattern = re.compile(r'part-\d{5}' + re.escape(_suffixes[_format(path)]))
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if pattern.fullmatch(name)]
+
+# Leftovers of interrupted writes in a dataset.
+def _stale(path):
+    if not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if re.fullmatch(r'part-\d{5}.*\.tmp', name)]
+
+# Columns (name → array), units (name → unit string) and descriptions of a table, with the constant columns first.
+def _columns(table, constants):
+    n = len(table)
+    columns, units = {}, {}
+    for name, value in constants.items():
+        columns[name] = np.full(n, value)
+    for name in table.colnames:
+        col = table[name]
+        if hasattr(col, 'unit') and col.unit is not None:
+            units[name] = col.unit.to_string()
+            col = col.value
+        columns[name] = np.asarray(col)
+    meta = {name:str(table.meta[name]) for name in columns if name in table.meta}
+    return columns, units, meta
+
+# Writer of one dataset. Rows are buffered, and written as one part every rows_per_part rows and on close.
+# append: add parts to an existing dataset, whose columns must then be the same; otherwise the dataset is replaced.
+class Writer:
+
+    def __init__(self, path, append=False, rows_per_part=1 << 20):
+        self.path = path
+        self.format = _format(path)
+        self.rows_per_part = rows_per_part
+        if self.format != 'npy':
+            _arrow()
+        for part in _stale(path):
+            _remove(part)
+        existing = parts(path)
+        if existing and not append:
+            for part in existing:
+                _remove(part)
+            existing = []
+        os.makedirs(path, exist_ok=True)
+        self.names = _schema(existing[0], self.format)[0] if existing else None
+        self.count = len(existing)
+        self._buffer = []
+        self._rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Add the rows of a table (a QTable or Table), with constant columns given as keywords (e.g. hip=27989).
+    def write(self, table, **constants):
+        columns, units, meta = _columns(table, constants)
+        if self.names is None:
+            self.names = list(columns)
+        elif list(columns) != self.names:
+            raise ValueError(f'The columns {list(columns)} differ from those of the dataset {self.path}: {self.names}.')
+        self._buffer.append((columns, units, meta))
+        self._rows += len(table)
+        if self._rows >= self.rows_per_part:
+            self.flush()
+
+    # Write the buffered rows as one part.
+    def flush(self):
+        if not self._buffer:
+            return
+        columns = {name:np.concatenate([c[name] for c, units, meta in self._buffer]) for name in self.names}
+        units, meta = {}, {}
+        for c, u, m in self._buffer:
+            units.update(u)
+            meta.update(m)
+        part = os.path.join(self.path, f'part-{self.count:05d}{_suffixes[self.format]}')
+        _write_part(part, self.format, columns, units, meta)
+        self.count += 1
+        self._buffer = []
+        self._rows = 0
+
+    def close(self):
+        self.flush()
+
+# Write a table into a dataset (see Writer), with constant columns given as keywords.
+def write(table, path, append=False, **constants):
+    with Writer(path, append=append) as writer:
+        writer.write(table, **constants)
+    return path
+
+def _remove(part):
+    import shutil
+    if os.path.isdir(part):
+        shutil.rmtree(part)
+    else:
+        os.remove(part)
+
+def _write_part(part, format, columns, units, meta):
+    if format == 'npy':
+        columnar.write(part, columns, units=units, meta=meta)
+        return
+    pa = _arrow()
+    arrays, shapes = [], {}
+    for name, col in columns.items():
+        if col.ndim > 1:  # e.g. covariance matrices: fixed-size lists of the flattened values
+            shapes[name] = list(col.shape[1:])
+            arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(col.reshape(-1)), int(np.prod(col.shape[1:]))))
+        else:
+            arrays.append(pa.array(col))
+    schema = pa.schema([pa.field(name, array.type) for name, array in zip(columns, arrays)],
+                       metadata={'hipy':json.dumps({'units':units, 'meta':meta, 'shapes':shapes})})
+    table = pa.Table.from_arrays(arrays, schema=schema)
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, part)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, part, compression='uncompressed')  # uncompressed: memory-mapped when read
+
+# Column names, units, descriptions and shapes of one part.
+def _schema(part, format):
+    if format == 'npy':
+        store = columnar.Store(part)
+        return store.names, store.units, store.meta, {}
+    pa = _arrow()
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(part)
+    else:
+        schema = pa.ipc.open_file(pa.memory_map(part)).schema
+    info = json.loads(schema.metadata[b'hipy'])
+    return schema.names, info['units'], info['meta'], info['shapes']
+
+# Values of some columns of one part, as NumPy arrays. Only these columns are read from disk.
+def _read_part(part, format, names, shapes):
+    if format == 'npy':
+        store = columnar.Store(part)
+        return {name:store[name] for name in names}
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(part, columns=names)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(part, columns=names, memory_map=True)
+    columns = {}
+    for name in names:
+        col = table.column(name).combine_chunks()
+        if name in shapes:
+            columns[name] = col.flatten().to_numpy(zero_copy_only=False).reshape([len(col)] + shapes[name])
+        else:
+            col = col.to_numpy(zero_copy_only=False)
+            columns[name] = col.astype(str) if col.dtype == object else col  # strings come back as Python objects
+    return columns
+
+# Read some columns (default: all) of a dataset, across all its parts, as a QTable with the units and descriptions
+# of the tables that were written.
+def read(path, columns=None):
+    from astropy.table import QTable
+    from astropy import units as u
+    format = _format(path)
+    files = parts(path)
+    if not files:
+        raise FileNotFoundError(f'No dataset at {path}.')
+    names, units, meta, shapes = _schema(files[0], format)
+    names = list(names) if columns is None else list(columns)
+    values = [_read_part(part, format, names, shapes) for part in files]
+    out = [np.concatenate([v[name] for v in values]) for name in names]
+    out = [col*u.Unit(units[name]) if name in units else col for name, col in zip(names, out)]
+    return QTable(out, names=names, meta={name:meta[name] for name in names if name in meta})
@@ -0,0 +1,69 @@
+import functools
+import numpy as np
+
+# Outputs of get_data, get_dmsa and propagate (output=...), built from the same columns (name → NumPy array, in the
+# units of the schema of the table):
+# - 'qtable' (default): an astropy QTable, with Quantity columns and the descriptions of the columns as its meta;
+# - 'numpy': a NumPy structured array, one field per column;
+# - 'pandas': a pandas DataFrame, one column per column (pandas is imported on first use).
+# The last two build no Quantity and no QTable. Their units (as strings) and descriptions are the metadata of the
+# schema, built once per schema and shared by all the arrays and DataFrames of that schema:
+#
+#   epd = hipy.download.get_data('HIP 27989', 'epd', output='numpy')
+#   epd['hp'], epd.dtype.metadata['units']['hp']     # magnitudes, 'mag'
+#   df = hipy.download.get_data('HIP 27989', 'intermediate', output='pandas')
+#   df.attrs['units'], df.attrs['meta']
+outputs = ('qtable', 'numpy', 'pandas')
+
+def check(output):
+    if output not in outputs:
+        raise ValueError(f'No such output: {output}. Please choose from {", ".join(outputs)}.')
+
+# Names, descriptions (meta) and units (name → astropy unit) of the columns of one kind of table.
+# copy: whether the QTables copy the columns; otherwise they share the memory of the columns (e.g. views of a local store).
+class Schema:
+
+    def __init__(self, names, meta, units=None, copy=True):
+        self.names = tuple(names)
+        self.meta = meta
+        self.units = units or {}
+        self.copy = copy
+
+    # Units (name → unit string) and descriptions of the columns, shared by the outputs without Quantity.
+    @functools.cached_property
+    def metadata(self):
+        return {'units':{name:unit.to_string() for name, unit in self.units.items()}, 'meta':self.meta}
+
+    # QTable from the columns, with the units and descriptions of the schema.
+    def table(self, columns, names=None):
+        from astropy.table import QTable
+        from astropy import units as u
+        meta = dict(self.meta) if names is None else {name:self.meta[name] for name in names}  # not shared with the schema
+        names = self.names if names is None else names
+        columns = [u.Quantity(columns[name], self.units[name], copy=self.copy) if name in self.units else columns[name]
+                   for name in names]
+        return QTable(columns, names=names, meta=meta, copy=self.copy)
+
+    # Structured array from the columns. Columns of more than one dimension become subarray fields.
+    def numpy(self, columns, names=None):
+        names = self.names if names is None else names
+        columns = [np.asarray(columns[name]) for name in names]
+        dtype = np.dtype([(name, col.dtype, col.shape[1:]) for name, col in zip(names, columns)], metadata=self.metadata)
+        out = np.empty(len(columns[0]) if columns else 0, dtype=dtype)
+        for name, col in zip(names, columns):
+            out[name] = col
+        return out
+
+    # DataFrame from the columns. Columns of more than one dimension hold one array per row.
+    def pandas(self, columns, names=None):
+        import pandas as pd
+        names = self.names if names is None else names
+        columns = {name:columns[name] if np.ndim(columns[name]) < 2 else list(columns[name]) for name in names}
+        out = pd.DataFrame(columns, columns=list(names))
+        out.attrs.update(self.metadata)
+        return out
+
+    # The columns as one of outputs.
+    def output(self, columns, output='qtable', names=None):
+        check(output)
+        return getattr(self, 'table' if output == 'qtable' else output)(columns, names)
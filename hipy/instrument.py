@@ -0,0 +1,170 @@
+import time
+import numbers
+import json
+import threading
+import contextlib
+
+# Opt-in instrumentation of the queries. While a Recorder is recording, each phase of the work on a star is timed:
+#   resolve   star name → HIP number (local index or Simbad)
+#   fetch     one page through the cache; source 'cache' or 'http', and the bytes of the page
+#   extract   <pre> block of a page (see page)
+#   parse     values of the fields
+#   derive    derived columns (e.g. BJD, RA/Dec residuals, propagated astrometry)
+#   build     QTable with the units and descriptions
+#   local     table served by a local store (see catalogue, photometry, intermediate and dmsa.ingest)
+# and the failures of the stars of the batch functions (download.get_data_many, aio.get_data_many) are kept.
+# Each phase is one event, a dict: phase, hip, start (time.time()), seconds, thread, and extra fields such as kind,
+# source and bytes; with error, the type of the exception that ended the phase.
+#
+#   with hipy.instrument.recording() as recorder:
+#       hipy.download.get_data_many(range(1, 5001), 'intermediate')
+#   print(recorder.report())             # per phase: calls, total, mean, p50, p95 and max seconds, and the counters
+#   recorder.summary()                   # the same as a QTable
+#   recorder.write('profile.jsonl')      # the events, one JSON object per line
+#
+# Without any recorder, each phase costs one test. The phases of worker processes (e.g. plot_many) are not recorded.
+
+_recorders = []
+_lock = threading.Lock()
+_local = threading.local()
+_null = contextlib.nullcontext()
+
+class _Phase:
+    __slots__ = ('event', 'start')
+
+    def __init__(self, name, HIP, fields):
+        self.event = {'phase':name, 'hip':_hip(HIP), **fields}
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.event)
+        self.event['start'] = time.time()
+        self.start = time.perf_counter()
+        return self.event
+
+    def __exit__(self, type, value, traceback):
+        self.event['seconds'] = time.perf_counter() - self.start
+        self.event['thread'] = threading.current_thread().name
+        if type is not None:
+            self.event['error'] = type.__name__
+        _local.stack.pop()
+        _emit(self.event)
+
+# HIP number of an event: None for a star name that could not be resolved.
+def _hip(HIP):
+    return int(HIP) if isinstance(HIP, numbers.Integral) else None
+
+def _emit(event):
+    for recorder in list(_recorders):
+        recorder._add(event)
+
+# Time one phase of the work on star HIP (None if unknown), inside a `with` block.
+def phase(name, HIP=None, **fields):
+    if not _recorders:
+        return _null
+    return _Phase(name, HIP, fields)
+
+# Add fields (e.g. source, bytes) to the innermost phase of this thread.
+def note(**fields):
+    if not _recorders:
+        return
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1].update(fields)
+
+# Keep the failure of one star (e.g. in download.get_data_many): a HIP number, or the name that could not be resolved.
+def error(HIP, exception, **fields):
+    if not _recorders:
+        return
+    if not isinstance(HIP, numbers.Integral) and HIP is not None:
+        fields = {'star':str(HIP), **fields}
+    _emit({'phase':'error', 'hip':_hip(HIP), 'start':time.time(), 'seconds':0.0,
+           'thread':threading.current_thread().name, 'error':type(exception).__name__, 'message':str(exception), **fields})
+
+# Events of the phases recorded between start and stop (or inside `with recording()`).
+# callback: also called with each event as soon as it is recorded, from the thread of the phase.
+class Recorder:
+
+    def __init__(self, callback=None):
+        self.events = []
+        self.callback = callback
+
+    def _add(self, event):
+        self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def start(self):
+        with _lock:
+            if self not in _recorders:
+                _recorders.append(self)
+        return self
+
+    def stop(self):
+        with _lock:
+            if self in _recorders:
+                _recorders.remove(self)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Failures: one event per star and error (phase 'error', or the phase that raised).
+    @property
+    def errors(self):
+        return [event for event in self.events if 'error' in event]
+
+    # Number of stars, pages from the cache and from HTTP, bytes of the pages and errors.
+    def counters(self):
+        fetches = [event for event in self.events if event['phase'] == 'fetch']
+        return {'stars':len({event['hip'] for event in self.events if event['hip'] is not None}),
+                'cache_hits':sum(event.get('source') == 'cache' for event in fetches),
+                'downloads':sum(event.get('source') == 'http' for event in fetches),
+                'bytes_downloaded':sum(event.get('bytes', 0) for event in fetches if event.get('source') == 'http'),
+                'bytes_from_cache':sum(event.get('bytes', 0) for event in fetches if event.get('source') == 'cache'),
+                'errors':sum(event['phase'] == 'error' for event in self.events)}
+
+    # Durations of each phase: calls, total, mean, p50, p95 and max (s), in the order of the phases.
+    def summary(self):
+        import numpy as np
+        from astropy.table import QTable
+        from astropy import units as u
+        seconds = {}
+        for event in self.events:
+            if event['phase'] != 'error':
+                seconds.setdefault(event['phase'], []).append(event['seconds'])
+        phases = sorted(seconds, key=lambda name: _order.get(name, len(_order)))
+        values = [np.array(seconds[name]) for name in phases]
+        columns = [phases, [len(x) for x in values]] + [np.array([f(x) for x in values], dtype=float)*u.s for f in
+                   (np.sum, np.mean, np.median, lambda x: np.percentile(x, 95), np.max)]
+        return QTable(columns, names=('phase','calls','total','mean','p50','p95','max'),
+                      meta={'phase':'phase of the queries (see instrument)', 'calls':'number of times the phase was run',
+                            'total':'total duration', 'mean':'mean duration', 'p50':'median duration',
+                            'p95':'95th percentile of the durations', 'max':'longest duration'})
+
+    # Text report of summary and counters.
+    def report(self):
+        lines = [f'{"phase":<8} {"calls":>8} {"total (s)":>10} {"mean (ms)":>10} {"p50 (ms)":>10} {"p95 (ms)":>10} {"max (ms)":>10}']
+        for row in self.summary():
+            lines.append(f'{row["phase"]:<8} {row["calls"]:>8d} {row["total"].value:>10.3f} ' +
+                         ' '.join(f'{row[name].value*1000:>10.3f}' for name in ('mean','p50','p95','max')))
+        lines.append(', '.join(f'{key} {value}' for key, value in self.counters().items()))
+        return '\n'.join(lines)
+
+    # Write the events to a file, one JSON object per line.
+    def write(self, path):
+        with open(path, 'w') as f:
+            for event in self.events:
+                f.write(json.dumps(event) + '\n')
+        return path
+
+_order = {name:i for i, name in enumerate(('resolve','fetch','extract','parse','derive','build','local'))}
+
+# Record the phases inside a `with` block (see Recorder).
+def recording(callback=None):
+    return Recorder(callback)
@@ -0,0 +1,131 @@
+import os
+import gzip
+import functools
+import numpy as np
+from . import cache
+from . import columnar
+
+# Local copy of the intermediate astrometric data (IAD). `ingest` reads the abscissa records of all the stars once into
+# two columnar stores in one folder:
+# - records: one row per abscissa record, with the fields of download.iad_dtype and the HIP number, the records of each
+#   star in contiguous rows, and a HIP → (offset, length) index;
+# - astrometry: one row per star, with the five astrometric parameters of its solution at J1991.25, and a HIP → row index.
+# Afterwards get_data(star_name, 'intermediate'), propagate and plot_motion are served locally: the records of one star
+# are views of the memory-mapped columns (no copy). Whole-catalogue analyses read the contiguous columns directly,
+# e.g. store.records['absc_residual'], and the records of one orbit across all the stars with orbit_rows.
+#
+# The input files are text files (or .gz) holding the <pre> blocks of intermediate data pages (hipiId) one after the
+# other: each star starts with its 'HIP|...' header line, followed by the line of its solution and its records.
+astrometry_names = ('ra','dec','parallax','pmra','pmdec')
+
+def default_store_dir():
+    return os.path.join(cache.settings['cache_dir'], 'intermediate')
+
+def _files(path):
+    if not os.path.isdir(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if os.path.isfile(os.path.join(path, name))]
+
+def _is_header(line):
+    return line.split('|', 1)[0].strip() == 'HIP'
+
+# Lines of each star of one file, from its header line on.
+def _blocks(f):
+    block = []
+    for line in f:
+        line = line.decode('latin-1').rstrip('\r\n')
+        if _is_header(line):
+            if block:
+                yield block
+            block = [line]
+        elif block:
+            block.append(line)
+    if block:
+        yield block
+
+def ingest(path, store_dir=None):
+    from . import download
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    hips, solutions, rows, counts = [], [], [], []
+    for name in _files(path):
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(name, 'rb') as f:
+            for block in _blocks(f):
+                p, data_list = download._intermediate_rows(block)
+                hips.append(int(block[1].split('|')[1]))
+                solutions.append(p)
+                rows += data_list
+                counts.append(len(data_list))
+    if not hips:
+        raise ValueError(f'No intermediate data found in {path}.')
+    hips = np.array(hips, dtype=np.int32)
+    records = download._records(rows)
+    record_hips = np.repeat(hips, counts)
+    order = np.argsort(record_hips, kind='stable')  # the records of each star in contiguous rows, in the order of the files
+    columns = {'hip':record_hips[order]}
+    for name in download.iad_dtype.names:
+        columns[name] = records[name][order]
+    columnar.write(os.path.join(store_dir, 'records'), columns, ranges='hip')
+    solutions = np.array(solutions, dtype=float)
+    columns = {'hip':hips}
+    for i, name in enumerate(astrometry_names):
+        columns[name] = solutions[:,i]
+    columnar.write(os.path.join(store_dir, 'astrometry'), columns, key='hip')
+    _stores.pop(store_dir, None)
+    return open_store(store_dir)
+
+_stores = {}
+
+class IntermediateStore:
+
+    def __init__(self, store_dir):
+        self.path = store_dir
+        self.records = columnar.Store(os.path.join(store_dir, 'records'))
+        self.astrometry = columnar.Store(os.path.join(store_dir, 'astrometry'))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, hip):
+        return hip in self.records
+
+    # Astrometric parameters (list of ra, dec, parallax, pmra, pmdec) and abscissa records (dict of views of the store,
+    # with the fields of download.iad_dtype) of one HIP number, as returned by download._parse_intermediate.
+    def records_of(self, HIP):
+        row = int(self.astrometry.rows(HIP))
+        if row < 0 or HIP not in self.records:
+            raise IndexError(f'HIP {HIP} cannot be found in the local intermediate data.')
+        p = [float(self.astrometry[name][row]) for name in astrometry_names]
+        return p, self.records.view(HIP, [name for name in self.records.names if name != 'hip'])
+
+    # HIP numbers of the stars in the store.
+    def hips(self):
+        return (np.asarray(self.records.ranges[:,1]) > 0).nonzero()[0]
+
+    # Orbit index: the orbit numbers in sorted order, and the rows in that order.
+    @functools.cached_property
+    def _orbit_index(self):
+        order = np.argsort(self.records['orbit_number'], kind='stable')
+        return self.records['orbit_number'][order], order
+
+    # Rows of the records of one orbit (or of a range of orbits, first to last included), in the order of the store.
+    def orbit_rows(self, first, last=None):
+        keys, order = self._orbit_index
+        last = first if last is None else last
+        return np.sort(order[np.searchsorted(keys, first, 'left'):np.searchsorted(keys, last, 'right')])
+
+def open_store(store_dir=None):
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    store = _stores.get(store_dir)
+    if store is None:
+        store = _stores[store_dir] = IntermediateStore(store_dir)
+    return store
+
+# The local intermediate data if they have been ingested, otherwise None.
+def local():
+    store_dir = default_store_dir()
+    if store_dir in _stores:
+        return _stores[store_dir]
+    if columnar.exists(os.path.join(store_dir, 'records')):
+        return open_store(store_dir)
+    return None
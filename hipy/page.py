@@ -0,0 +1,28 @@
+import re
+import html
+
+# All the data of an ESA HIPcatalogueSearch.pl page are in its <pre> block. These functions decode the raw bytes of a page
+# (as returned by cache.fetch) and cut out that block with one scan, instead of parsing the whole page as HTML.
+
+_pre_start = re.compile(rb'<pre\b[^>]*>', re.IGNORECASE)
+_pre_end = re.compile(rb'</pre\s*>', re.IGNORECASE)
+_tag = re.compile(r'<[^>]*>')
+
+# Text of the first <pre> block of a page, with the HTML tags (e.g. links) removed and the entities decoded.
+# Raises IndexError if the page has no <pre> block, as for a HIP entry that cannot be found.
+def pre_text(webpage):
+    webpage = bytes(webpage)
+    start = _pre_start.search(webpage)
+    if start is None:
+        raise IndexError('The page has no <pre> block.')
+    end = _pre_end.search(webpage, start.end())
+    text = webpage[start.end():end.start() if end else len(webpage)].decode('latin-1')
+    if '<' in text:
+        text = _tag.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    return text
+
+# Lines of the <pre> block, without the blank lines around it and without line terminators (\n or \r\n).
+def pre_lines(webpage):
+    return pre_text(webpage).strip('\r\n').splitlines()
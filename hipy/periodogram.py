@@ -0,0 +1,183 @@
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from astropy import units as u
+
+# Period search over the epoch photometry: generalised Lomb–Scargle periodogram (floating mean, weights 1/hp_error²,
+# Zechmeister & Kürster 2009), with the standard normalisation (power from 0 to 1) and Baluev's (2008) false-alarm
+# probability of the highest peak.
+#
+# The frequencies form a regular grid f0 + k df with k = a*n_b + b, so that exp(2πi f t) = A[a] B[b] with
+# A[a] = exp(2πi (f0 + a n_b df) t) and B[b] = exp(2πi b df t): the sums over the transits of all the frequencies are
+# matrix products (n_a × n) @ (n × n_b), and only n_a + n_b complex exponentials are computed per transit.
+# Stars are processed in batches, their transits padded to the longest star of the batch with zero weights.
+#
+#   hipy.periodogram.search(range(1, 1001))        # best periods of 1000 stars, against var_period of the catalogue
+#   frequency, power = hipy.periodogram.power('HIP 8102')
+names = ('hip','n_transits','period','frequency','power','fap','var_period','period_ratio','agree')
+meta = {'hip':'Hipparcos Catalogue(HIP) identifier', 'n_transits':'Number of transits used',
+        'period':'Period of the highest peak', 'frequency':'Frequency of the highest peak',
+        'power':'Lomb–Scargle power of the highest peak (0 to 1)', 'fap':'False-alarm probability of the highest peak (Baluev 2008)',
+        'var_period':'Variability period from Hipparcos observations (days)', 'period_ratio':'period / var_period',
+        'agree':'period matches var_period, or var_period/2 (see search)'}
+units = {'period':u.d, 'frequency':1/u.d, 'var_period':u.d}
+
+# Days between the first and the last transits of the mission.
+mission_span = 1200.
+
+# Regular frequency grid (1/d) from 1/max_period to 1/min_period, with oversampling points per peak width 1/span,
+# as (f0, df, n_a, n_b): n_a*n_b frequencies f0 + k df.
+def frequency_grid(min_period=0.05, max_period=mission_span, oversampling=5, span=mission_span):
+    f0 = 1/max_period
+    df = 1/(oversampling*span)
+    n = int(math.ceil((1/min_period - f0)/df)) + 1
+    n_b = int(math.ceil(math.sqrt(n)))
+    return f0, df, int(math.ceil(n/n_b)), n_b
+
+def frequencies(grid):
+    f0, df, n_a, n_b = grid
+    return f0 + df*np.arange(n_a*n_b)
+
+# Transits kept for the period search: finite values and positive errors, without any of the quality flag bits bad_bits.
+def _clean(columns, bad_bits):
+    from . import photometry
+    t, y, dy = (np.asarray(getattr(columns[name], 'value', columns[name]), dtype=float) for name in ('obs_epoch','hp','hp_error'))
+    good = np.isfinite(t) & np.isfinite(y) & (dy > 0)
+    if len(bad_bits):
+        good &= ~photometry.flag_mask(columns['quality_flag'], bad_bits)
+    return t[good], y[good], dy[good]
+
+# Padded arrays (stars × longest star) of the times (centred), magnitudes (weighted mean removed) and normalised weights.
+def _pad(stars):
+    n = max([len(t) for t, y, dy in stars] + [1])
+    T, Y, W = np.zeros((len(stars), n)), np.zeros((len(stars), n)), np.zeros((len(stars), n))
+    for i, (t, y, dy) in enumerate(stars):
+        if len(t):
+            w = 1/dy**2
+            w /= w.sum()
+            T[i,:len(t)] = t - 0.5*(t.min() + t.max())
+            Y[i,:len(t)] = y - np.dot(w, y)
+            W[i,:len(t)] = w
+    return T, Y, W
+
+# Factors B and B² of the grid (stars × transits × n_b), shared by all its rows.
+def _columns(T, grid):
+    f0, df, n_a, n_b = grid
+    B = np.exp(2j*np.pi*df*np.arange(n_b)[None,None,:]*T[...,None])
+    return B, B*B
+
+# Power of rows a of the grid (stars × len(a) × n_b), from the padded arrays and the factors of _columns.
+def _power(T, Y, W, grid, a, B, B2):
+    f0, df, n_a, n_b = grid
+    A = np.exp(2j*np.pi*(f0 + np.asarray(a)[None,None,:]*n_b*df)*T[...,None])
+    WA = W[...,None]*A
+    S1 = np.matmul(WA.transpose(0,2,1), B)  # Σ w exp(ix)
+    SY = np.matmul((Y[...,None]*WA).transpose(0,2,1), B)  # Σ w y exp(ix)
+    S2 = np.matmul((WA*A).transpose(0,2,1), B2)  # Σ w exp(2ix)
+    C, S = S1.real, S1.imag
+    CC = 0.5*(1 + S2.real) - C*C
+    SS = 0.5*(1 - S2.real) - S*S
+    CS = 0.5*S2.imag - C*S
+    YC, YS = SY.real, SY.imag
+    YY = np.einsum('ij,ij,ij->i', W, Y, Y)[:,None,None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (SS*YC*YC + CC*YS*YS - 2*CS*YC*YS)/(YY*(CC*SS - CS*CS))
+
+# False-alarm probability of the peak power z of N transits with times t and weights w, over frequencies up to fmax
+# (Baluev 2008, as in astropy.timeseries for the standard normalisation).
+def _fap(z, N, fmax, t, w):
+    if N < 4 or not np.isfinite(z):
+        return np.nan
+    var_t = np.dot(w, t*t) - np.dot(w, t)**2
+    tau = (math.sqrt(2/(N-1))*math.exp(math.lgamma((N-1)/2) - math.lgamma((N-2)/2)) * fmax*math.sqrt(4*math.pi*var_t) *
+           (1 - z)**(0.5*(N-4)) * math.sqrt(0.5*(N-1)*z))
+    single = (1 - z)**(0.5*(N-3))
+    return 1 - (1 - single)*math.exp(-tau)
+
+# Frequency, power and false-alarm probability of the highest peak of each star of one batch, a list of (t, y, dy).
+# rows: rows of the grid computed at once, to bound the memory to about 50*len(stars)*rows*n_b bytes.
+def _search_batch(stars, grid, rows=32):
+    f0, df, n_a, n_b = grid
+    T, Y, W = _pad(stars)
+    B, B2 = _columns(T, grid)
+    best = np.full(len(stars), -1.)
+    k = np.zeros(len(stars), dtype=np.int64)
+    for start in range(0, n_a, rows):
+        p = _power(T, Y, W, grid, np.arange(start, min(start+rows, n_a)), B, B2).reshape(len(stars), -1)
+        p = np.where(np.isfinite(p), p, -1)
+        i = p.argmax(axis=1)
+        better = p[np.arange(len(stars)),i] > best
+        best[better] = p[better,i[better]]
+        k[better] = start*n_b + i[better]
+    frequency = f0 + df*k
+    fmax = f0 + df*(n_a*n_b - 1)
+    fap = np.array([_fap(z, len(t), fmax, T[j,:len(t)], W[j,:len(t)]) for j, (z, (t, y, dy)) in enumerate(zip(best, stars))])
+    bad = (best < 0) | np.array([len(t) < 4 for t, y, dy in stars])
+    return np.where(bad, np.nan, frequency), np.where(bad, np.nan, best), np.where(bad, np.nan, fap)
+
+# Epoch photometry (columns obs_epoch, hp, hp_error, quality_flag) of many HIP numbers: from the local store if it has
+# been ingested (see photometry.ingest), otherwise from the hipepId pages. Missing stars are None.
+def _photometry(hips):
+    from . import photometry, download
+    store = photometry.local()
+    columns = [store.view(hip, photometry.names) if store is not None and hip in store else None for hip in hips]
+    missing = [i for i, c in enumerate(columns) if c is None]
+    if missing:
+        tables, errors = download.get_data_many([hips[i] for i in missing], 'epd')
+        for i, table in zip(missing, tables):
+            columns[i] = table
+    return columns
+
+# var_period (d) of many HIP numbers: from the local catalogue if it has been ingested, otherwise from the hipId pages.
+def _var_period(hips):
+    from . import catalogue, download
+    store = catalogue.local()
+    if store is not None:
+        rows = store.rows(hips)
+        return np.where(rows >= 0, store['var_period'][np.maximum(rows, 0)], np.nan)
+    tables, errors = download.get_data_many(hips, 'catalogue')
+    return np.array([np.nan if table is None else table['var_period'][0].to_value(u.d) for table in tables])
+
+# Best period of each star of hips, from its epoch photometry, as a QTable (see names and meta).
+# bad_bits: transits with any of these quality flag bits set are left out (default: all the flagged transits).
+# The period agrees with var_period within the relative tolerance, or with var_period/2: the strongest peak of an
+# eclipsing binary with equal minima is at half its period.
+# Batches of batch_size stars of similar numbers of transits run on max_workers processes (default: all the cores).
+def search(hips, grid=None, bad_bits=range(9), tolerance=0.01, batch_size=16, max_workers=None):
+    from astropy.table import QTable
+    hips = [int(hip) for hip in hips]
+    grid = frequency_grid() if grid is None else grid
+    bad_bits = list(bad_bits)
+    stars = []
+    for columns in _photometry(hips):
+        stars.append((np.empty(0),)*3 if columns is None else _clean(columns, bad_bits))
+    order = np.argsort([len(t) for t, y, dy in stars], kind='stable')
+    batches = [order[i:i+batch_size] for i in range(0, len(order), batch_size)]
+    frequency, power, fap = np.full(len(hips), np.nan), np.full(len(hips), np.nan), np.full(len(hips), np.nan)
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    if max_workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_search_batch, [[stars[i] for i in batch] for batch in batches], [grid]*len(batches)))
+    else:
+        results = [_search_batch([stars[i] for i in batch], grid) for batch in batches]
+    for batch, (f, p, a) in zip(batches, results):
+        frequency[batch], power[batch], fap[batch] = f, p, a
+
+    var_period = _var_period(hips)
+    period = 1/frequency
+    with np.errstate(invalid='ignore'):
+        ratio = period/var_period
+        agree = (np.abs(ratio - 1) < tolerance) | (np.abs(2*ratio - 1) < tolerance)
+    columns = {'hip':np.array(hips), 'n_transits':np.array([len(t) for t, y, dy in stars]), 'period':period,
+               'frequency':frequency, 'power':power, 'fap':fap, 'var_period':var_period, 'period_ratio':ratio, 'agree':agree}
+    return QTable([columns[name]*units[name] if name in units else columns[name] for name in names], names=names, meta=meta)
+
+# Periodogram of one star: frequencies (1/d) and powers on the grid.
+def power(star_name, grid=None, bad_bits=range(9)):
+    from .star import as_star
+    grid = frequency_grid() if grid is None else grid
+    t, y, dy = _clean(as_star(star_name).epoch_photometry, list(bad_bits))
+    T, Y, W = _pad([(t, y, dy)])
+    p = _power(T, Y, W, grid, np.arange(grid[2]), *_columns(T, grid)).ravel()
+    return frequencies(grid)/u.d, p
@@ -0,0 +1,131 @@
+import io
+import os
+import re
+import gzip
+import numpy as np
+from astropy import units as u
+from . import cache
+from . import columnar
+from . import formats
+
+# Columns of the epoch photometry, as returned by get_data(star_name, 'epd').
+names = ('obs_epoch','hp','hp_error','quality_flag')
+meta = {'obs_epoch':'observation epoch, in Barycentric Julian Days',
+        'hp':'calibrated Hp magnitude for this transit','hp_error':'estimated standard error of Hp magnitude','quality_flag':'quality flag, from bit 0 to bit 8'}
+units = {'obs_epoch':u.d, 'hp':u.mag, 'hp_error':u.mag}
+n_flag_bits = 9
+
+# Build the epoch photometry QTable, or another output (see formats), from a dict of columns. The columns are not copied
+# by the QTable, so that the table of a star in the local store is a view of its memory maps.
+schema = formats.Schema(names, meta, units, copy=False)
+
+def table(columns, output='qtable'):
+    return schema.output(columns, output)
+
+# The quality flags are bit fields (bit 0 to bit 8), stored as integers.
+# Boolean mask of the transits with any of the given bits set, e.g. flag_mask(flags, [0, 3]).
+def flag_mask(flags, bits):
+    mask = np.bitwise_or.reduce(np.left_shift(1, np.atleast_1d(bits)))
+    return (np.asarray(flags) & mask) != 0
+
+# All the bits of the quality flags: boolean array of shape flags.shape + (9,), [..., b] is bit b.
+def flag_bits(flags):
+    return (np.asarray(flags)[..., np.newaxis] >> np.arange(n_flag_bits)) & 1 == 1
+
+# Local copy of the epoch photometry. `ingest` reads the whole Epoch Photometry Annex once into one columnar store,
+# with the transits of each star in contiguous rows and a HIP → (offset, length) index. Afterwards
+# `get_data(star_name, 'epd')` is served locally, as views of the memory-mapped columns, and whole-catalogue analyses
+# can read the contiguous columns directly (store['hp'], store['quality_flag'], ...).
+#
+# The input files are text files (or .gz), each in one of two layouts:
+# - blocks of one star, as on the hipepId pages: a header line 'HIP : <number>' (or 'HH1: <number>'),
+#   then one line per transit, 'epoch|Hp|sigma|flag' with the epoch in BJD - 2440000;
+# - one line per transit with the HIP number first, 'HIP|epoch|Hp|sigma|flag'.
+def default_store_dir():
+    return os.path.join(cache.settings['cache_dir'], 'epoch_photometry')
+
+def _files(path):
+    if not os.path.isdir(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if os.path.isfile(os.path.join(path, name))]
+
+_header = re.compile(rb'^[ \t]*(?:HIP|HH1)[ \t]*:[ \t]*(\d+)', re.M)
+_transit = re.compile(rb'^(\d[^|\r\n]*(?:\|[^|\r\n]*){3})\r?$', re.M)
+_flat = re.compile(rb'^[ \t]*(\d+)[ \t]*\|(\d[^|\r\n]*(?:\|[^|\r\n]*){3})\r?$', re.M)
+
+# HIP numbers and fields (epoch, Hp, sigma, flag) of the transits of one file, read by chunks of whole lines.
+def _read(f, chunk=1 << 26):
+    HIP = None
+    while True:
+        lines = f.readlines(chunk)
+        if not lines:
+            break
+        data = b''.join(lines)
+        parts = _header.split(data)
+        hips, records = [], []
+        # The text before the first header of the chunk belongs to the last star of the previous chunk.
+        for hip, body in [(HIP, parts[0])] + list(zip(parts[1::2], parts[2::2])):
+            HIP = hip
+            if hip is not None:
+                found = _transit.findall(body)
+                hips.append(np.full(len(found), int(hip), dtype=np.int32))
+                records += found
+        if HIP is None:  # no header so far: one line per transit, with the HIP number first
+            for hip, record in _flat.findall(data):
+                hips.append(np.array([int(hip)], dtype=np.int32))
+                records.append(record)
+        if records:
+            yield np.concatenate(hips), np.loadtxt(io.BytesIO(b'\n'.join(records)), delimiter='|', dtype=float, ndmin=2)
+
+def ingest(path, store_dir=None):
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    hips, fields = [], []
+    for name in _files(path):
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(name, 'rb') as f:
+            for h, x in _read(f):
+                hips.append(h)
+                fields.append(x)
+    if not fields:
+        raise ValueError(f'No epoch photometry records found in {path}.')
+    hips = np.concatenate(hips)
+    fields = np.concatenate(fields)
+    order = np.argsort(hips, kind='stable')  # the transits of each star in contiguous rows, in the order of the files
+    columns = {'hip':hips[order],
+               'obs_epoch':fields[order,0] + 2440000,
+               'hp':fields[order,1],
+               'hp_error':fields[order,2],
+               'quality_flag':fields[order,3].astype(np.uint16)}
+    columnar.write(store_dir, columns, units=units, meta=meta, ranges='hip')
+    _stores.pop(store_dir, None)
+    return open_store(store_dir)
+
+_stores = {}
+
+class PhotometryStore(columnar.Store):
+
+    # Epoch photometry of one HIP number, as a QTable of views of the store (no copy), or another output (see formats).
+    def table(self, HIP, output='qtable'):
+        if HIP not in self:
+            raise IndexError(f'HIP {HIP} cannot be found in the local epoch photometry.')
+        return table(self.view(HIP, names), output)
+
+    # HIP numbers of the stars in the store.
+    def hips(self):
+        return (np.asarray(self.ranges[:,1]) > 0).nonzero()[0]
+
+def open_store(store_dir=None):
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    store = _stores.get(store_dir)
+    if store is None:
+        store = _stores[store_dir] = PhotometryStore(store_dir)
+    return store
+
+# The local epoch photometry if it has been ingested, otherwise None.
+def local():
+    store_dir = default_store_dir()
+    if store_dir in _stores:
+        return _stores[store_dir]
+    if columnar.exists(store_dir):
+        return open_store(store_dir)
+    return None
@@ -1,58 +1,145 @@
-import requests
-from astroquery.simbad import Simbad
+import os
 import numpy as np
-import pandas as pd
-from astropy.table import QTable, Table, Column
-from astropy import units as u
-import urllib
-import re
-import bs4
+from .star import as_star
 import math
-import matplotlib.pyplot as plt
+from . import page
 
-def plot(star_name):
+# Light curve of one star: median magnitude, 5th and 95th percentiles (mag), then the observation epochs
+# (BJD - 2440000), calibrated Hp and its standard errors of the transits. They come from the local epoch photometry
+# and catalogue if both have been ingested (see photometry.ingest and catalogue.ingest), otherwise from one parse of
+# the hipepId page.
+def _lightcurve(star):
+    from . import photometry, catalogue
+    store, main = photometry.local(), catalogue.local()
+    if store is not None and star.hip in store and main is not None and main.rows(star.hip) >= 0:
+        row = int(main.rows(star.hip))
+        label_list = [float(main[name][row]) for name in ('hp_mag','hp_max','hp_min')]
+        columns = store.view(star.hip, ('obs_epoch','hp','hp_error'))
+        return label_list, columns['obs_epoch'] - 2440000, columns['hp'], columns['hp_error']
 
+    text = page.pre_lines(star.page('hipepId'))
+    label = [text[6],text[8],text[9]]
+    label_list = [x.split(':',1)[1].strip().split('        ')[0] for x in label]
+    label_list = [float(x) for x in label_list]
+    # 17 header lines, then one line per transit.
+    data = np.array([x.split('|')[:3] for x in text[17:] if x], dtype=float).reshape(-1, 3)
+    return label_list, data[:,0], data[:,1], data[:,2]
+
+# Draw one light curve on ax. size: font size of the title and of the axis labels (default: those of matplotlib).
+def _draw(ax, HIP, label_list, epoch, hp, hp_error, size=None):
+    fontdict = None if size is None else {'size':size}
+    ax.set_title(f'Epoch photometry data of HIP {HIP}', fontdict=fontdict)
+    ax.set_xlabel('Observation epoch (BJD - 2440000)', fontdict=fontdict)
+    ax.set_ylabel('Calibrated Hp (mag)', fontdict=fontdict)
+    ax.invert_yaxis()
+    ax.axhline(y=label_list[0],color='red')
+    ax.scatter(epoch,hp,s=10,color='blue')
+    ax.errorbar(epoch,hp,yerr=hp_error,fmt='none',ecolor='cyan')
+
+# Plot the light curve of one star. By default the figure is drawn with pyplot, on its current figure. With ax, it is
+# drawn on these axes; with file, it is saved to that file (PNG, PDF, ... from its extension); with show=False, it is
+# only drawn. Except with pyplot, the figure is returned.
+def plot(star_name,ax=None,file=None,show=True):
     # Convert the names of stars to HIP numbers, and get HIP numbers.
-    if star_name.startswith('HIP'):
-        HIP = int(star_name.split('HIP')[1])
-    else:
-        result_table = Simbad.query_objectids(star_name)
-        line = list(filter(lambda x: 'HIP' in str(x), result_table))
-        HIP = int(line[0][0].split('HIP')[1])
+    star = as_star(star_name)
+    HIP = star.hip
 
     try:
-        url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?hipepId={HIP}'
-        webpage = str(urllib.request.urlopen(url).read())
-        soup = bs4.BeautifulSoup(webpage,'html.parser')
-        text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n'")
-        text = text.split('\\n',17)
-        label = [text[6],text[8],text[9]]
-        label_list = [x.split(':',1)[1].strip().split('        ')[0] for x in label]
-        label_list = [float(x) for x in label_list]
-        print('Median Magnitude(red line) (mag):',label_list[0])
-        print('5th percentile (max) (mag):',label_list[1])
-        print('95th percentile (min) (mag):',label_list[2])
-        text_list = text[17].split('\\r\\n')
-        data_list = [x.split('|') for x in text_list]
-        data_list_t = list(map(list, zip(*data_list)))
-        index_float = [0,1,2]
-        for i in index_float:
-            data_list_t[i] = [float(x) for x in list(data_list_t[i])]
-
-        text_list = text[17].split('\\r\\n')
-        data_list = [x.split('|') for x in text_list]
-        data_list_t = list(map(list, zip(*data_list)))
-        index_float = [0,1,2]
-        for i in index_float:
-            data_list_t[i] = [float(x) for x in list(data_list_t[i])]
-
-        plt.title(f'Epoch photometry data of HIP {HIP}')
-        plt.xlabel('Observation epoch (BJD - 2440000)')
-        plt.ylabel('Calibrated Hp (mag)')
-        plt.gca().invert_yaxis()
-        plt.axhline(y=label_list[0],color='red')
-        plt.scatter(data_list_t[0],data_list_t[1],s=10,color='blue')
-        plt.errorbar(data_list_t[0],data_list_t[1],yerr=data_list_t[2],fmt='none',ecolor='cyan')
-
+        label_list, epoch, hp, hp_error = _lightcurve(star)
     except IndexError:
-        print(f'The data of HIP {HIP} cannot be found.')
\ No newline at end of file
+        print(f'The data of HIP {HIP} cannot be found.')
+        return None
+    print('Median Magnitude(red line) (mag):',label_list[0])
+    print('5th percentile (max) (mag):',label_list[1])
+    print('95th percentile (min) (mag):',label_list[2])
+    if ax is None and (file is not None or not show):
+        from matplotlib.figure import Figure
+        ax = Figure().add_subplot()
+    if ax is None:
+        import matplotlib.pyplot as plt
+        _draw(plt.gca(), HIP, label_list, epoch, hp, hp_error)
+        return None
+    _draw(ax, HIP, label_list, epoch, hp, hp_error)
+    if file is not None:
+        ax.figure.savefig(file)
+    return ax.figure
+
+# Atlas of light curves: pages of rows × columns panels, one star per panel, in the order of the stars.
+# Each page is drawn by one worker process on its own Figure (no pyplot), saved, and dropped before the next one, so
+# that the memory does not grow with the number of pages.
+
+# Draw and save one page of the atlas. Returns one line of the index per star: HIP, file, panel (from 0, by rows),
+# number of transits and median magnitude, and the error if its light curve cannot be drawn.
+def _atlas_page(hips, path, rows, columns, dpi):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(5*columns, 3.5*rows))
+    # Fixed margins: a layout engine would draw the page twice.
+    axes = fig.subplots(rows, columns, squeeze=False, gridspec_kw={'left':0.07, 'right':0.98, 'bottom':0.06, 'top':0.96,
+                                                                   'wspace':0.3, 'hspace':0.55}).ravel()
+    index = []
+    for panel, (ax, HIP) in enumerate(zip(axes, hips)):
+        try:
+            label_list, epoch, hp, hp_error = _lightcurve(as_star(HIP))
+            _draw(ax, HIP, label_list, epoch, hp, hp_error, size=9)
+            ax.tick_params(labelsize=8)
+            index.append((HIP, os.path.basename(path), panel, len(hp), label_list[0], ''))
+        except Exception as e:
+            ax.set_axis_off()
+            ax.set_title(f'HIP {HIP}: no data', fontdict={'size':9})
+            index.append((HIP, os.path.basename(path), panel, 0, math.nan, f'{type(e).__name__}: {e}'))
+    for ax in axes[len(hips):]:
+        ax.set_axis_off()
+    fig.savefig(path, dpi=dpi)
+    return index
+
+# HIP number of one star name, or None if it cannot be resolved.
+def _resolve_one(star_name):
+    from . import resolve
+    try:
+        return resolve.resolve(star_name)
+    except Exception:
+        return None
+
+# Save the light curves of many stars (names, HIP numbers or Star objects) in directory, as pages of rows × columns
+# panels (page_0001.pdf, ...; format: pdf, png, svg, ...), drawn on max_workers processes (default: all the cores).
+# The index of the atlas, index.csv, has one line per star: hip, file, panel, n_transits, median_hp and error (empty
+# if it was drawn). Returns the files of the pages and the path of the index.
+def atlas(stars, directory='.', rows=4, columns=3, format='pdf', dpi=100, max_workers=None):
+    import csv
+    from concurrent.futures import ProcessPoolExecutor
+    from . import resolve
+    os.makedirs(directory, exist_ok=True)
+    stars = list(stars)
+    unresolved = []
+    # Resolve the star names first, with at most one Simbad query; the workers only get HIP numbers.
+    names = [i for i, star in enumerate(stars) if not isinstance(star, (int, np.integer)) and not hasattr(star, 'hip')]
+    try:
+        hips = resolve.resolve_many([stars[i] for i in names])
+    except Exception:
+        hips = [_resolve_one(stars[i]) for i in names]  # e.g. offline: resolve them one by one
+    for i, HIP in zip(names, hips):
+        if HIP is None:
+            unresolved.append(stars[i])
+        stars[i] = HIP
+    hips = [int(star.hip if hasattr(star, 'hip') else star) for star in stars if star is not None]
+
+    per_page = rows*columns
+    pages = [hips[i:i+per_page] for i in range(0, len(hips), per_page)]
+    paths = [os.path.join(directory, f'page_{k+1:04d}.{format}') for k in range(len(pages))]
+    arguments = (pages, paths, [rows]*len(pages), [columns]*len(pages), [dpi]*len(pages))
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    if max_workers > 1 and len(pages) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_atlas_page, *arguments))
+    else:
+        results = list(map(_atlas_page, *arguments))
+
+    index = os.path.join(directory, 'index.csv')
+    with open(index, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('hip','file','panel','n_transits','median_hp','error'))
+        for lines in results:
+            writer.writerows(lines)
+        for name in unresolved:
+            writer.writerow(('', '', '', 0, math.nan, f'{name} has no Hipparcos Catalogue(HIP) identifier.'))
+    return paths, index
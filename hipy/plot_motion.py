@@ -1,264 +1,161 @@
-import requests
-from astroquery.simbad import Simbad
+import os
 import numpy as np
-import pandas as pd
-from astropy.table import QTable, Table, Column
-from astropy import units as u
-import urllib
-import re
-import bs4
-import math
-import matplotlib.pyplot as plt 
+from .star import as_star
 
-# This is from L. Lindegren's code to give the barycentric position of the earth in a given year between 1988 an 1993. 
-def cearth(year):
-    omega = 0.0172021240/86400
-    e = 0.016714
-    g0 = -0.04128
-    au = 1.496e+11
-    c = [[.540817e+09, -.334118e+11, -.145868e+12],
-         [-.202315e+10, .133781e+12, -.306652e+11],
-         [-.883589e+09, .580048e+11, -.132951e+11]]
-    ret = []
-    t  = (year - 1988.0) * 365.25 * 86400.0
-    arg = omega * t + g0
-    arg = arg + e * math.sin(arg)
-    co = math.cos(arg)
-    si = math.sin(arg)
-    for i in range(3):
-        ret.append((c[i][0] + c[i][1]*co + c[i][2]*si)/au) 
-    return ret
+# The barycentric position of the earth (L. Lindegren), the parallax factors and the astrometric parameters of an
+# HIP entry, shared with download.
+from .download import cearth, parallax_factors, yr2jd, query
 
-# Get five astrometric parameters of an HIP entry. 
-def query(HIP):
-    url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}'
-    webpage = str(urllib.request.urlopen(url).read())
-    soup = bs4.BeautifulSoup(webpage,'html.parser')
-    text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
-    text = text.split('\\r\\n\\r\\n')[0].split('\\n',1)[1].split('\\n',1)[0].split('|')
-    p = [float(x) for x in text[2:7]]
-    return p
+# Consortia to draw for each value of `consortium`, and the name of the figure.
+_choices = {'F':'F','f':'F','FAST':'F','N':'N','n':'N','NDAC':'N','Both':'FN','both':'FN','None':'','none':''}
+_titles = {'F':'FAST','N':'NDAC','FN':'Both','':'None'}
+# Source of the fitted and the rejected abscissae, colour and name of each consortium.
+_consortia = {'F':('F','f','blue','FAST'), 'N':('N','n','red','NDAC')}
 
-def plot(star_name,consortium):
+# Barycentric motion, solution and abscissa records of one star, relative to its position at J1991.25 (mas).
+# orbit: for a star of DMSA/O, add its photocentre orbit to the solution and subtract it from the residuals (see kepler).
+def _motion(star, orbit=False):
+    # Get the barycentric and observed lines(solution) of motion for Hipparcos data.
+    p = star.astrometry
+    t0 = 1991.25
+    year = np.linspace(1989.8,1993.3,341,endpoint=True)
+    pa, pd = parallax_factors(p[0], p[1], year)
+    m = {'barycentric_dra':(year-t0)*p[3], 'barycentric_ddec':(year-t0)*p[4],
+         'model_dra':(year-t0)*p[3] + p[2]*pa, 'model_ddec':(year-t0)*p[4] + p[2]*pd}
 
+    # Get the abscissa records of the intermediate data, and the fitted points on the observed line(solution).
+    records = star.intermediate_records
+    mid_epoch = np.asarray(records['mid_epoch'])
+    absc_residual = records['absc_residual']
+    pa, pd = parallax_factors(p[0], p[1], mid_epoch+t0)
+    m['fit_dra'] = mid_epoch*p[3] + p[2]*pa
+    m['fit_ddec'] = mid_epoch*p[4] + p[2]*pd
+    if orbit:
+        from . import kepler
+        elements = kepler.elements(star)
+        dra, ddec = kepler.displacement(elements, yr2jd(year))
+        m['model_dra'] = m['model_dra'] + dra
+        m['model_ddec'] = m['model_ddec'] + ddec
+        dra, ddec = kepler.displacement(elements, yr2jd(mid_epoch+t0))
+        m['fit_dra'] = m['fit_dra'] + dra
+        m['fit_ddec'] = m['fit_ddec'] + ddec
+        absc_residual = absc_residual - (records['absc/ra']*dra + records['absc/dec']*ddec)
+
+    # Derive residuals and standard errors.
+    m['source_absc'] = np.asarray(records['source_absc'])
+    m['ra_residual'] = records['absc/ra']*absc_residual
+    m['dec_residual'] = records['absc/dec']*absc_residual
+    m['ra_error'] = records['absc/ra']*records['absc_error']
+    m['dec_error'] = records['absc/dec']*records['absc_error']
+    return m
+
+# Draw the motion of one star (see _motion) on ax, with the records of the consortia (a string of F and N).
+# The residuals and the error bars of each consortium are one LineCollection.
+def _draw(ax, m, HIP, consortia):
+    from matplotlib.collections import LineCollection
+    handles, labels = [], []
+    for c in consortia:
+        fitted, rejected, color, name = _consortia[c]
+        source = m['source_absc']
+        keep = (source == fitted) | (source == rejected)
+        x, y = m['fit_dra'][keep], m['fit_ddec'][keep]
+        rx, ry = x + m['ra_residual'][keep], y + m['dec_residual'][keep]
+        ex, ey = m['dec_error'][keep], m['ra_error'][keep]
+        residuals = np.stack([np.stack([x, y], axis=-1), np.stack([rx, ry], axis=-1)], axis=1)
+        errors = np.stack([np.stack([rx+ex, ry-ey], axis=-1), np.stack([rx-ex, ry+ey], axis=-1)], axis=1)
+        ax.add_collection(LineCollection(np.concatenate([residuals, errors]), colors=color))
+        fit = source[keep] == fitted
+        if fit.any():
+            handles.append(ax.scatter(x[fit], y[fit], s=10, color=color))
+            labels.append(f'{name} Data Fitted')
+        if (~fit).any():
+            handles.append(ax.scatter(x[~fit], y[~fit], s=100, facecolors='none', edgecolors=color))
+            labels.append(f'{name} Data Rejected')
+
+    ax.set_title(f'Apparent motion of HIP {HIP} ({_titles[consortia]})',fontdict={'weight':'normal','size': 20})
+    ax.set_ylabel(r'$\Delta\delta$'+' [mas]',fontdict={'weight':'normal','size': 15})
+    ax.set_xlabel(r'$\Delta\alpha$'+r'$ cos(\delta)$'+' [mas]',fontdict={'weight':'normal','size': 15})
+    ax.tick_params(labelsize=15)
+    handles += ax.plot(m['barycentric_dra'],m['barycentric_ddec'],color='violet',label='Barycentric motion')
+    handles += ax.plot(m['model_dra'],m['model_ddec'],color='lime',label='Solution')
+    labels += ['Barycentric motion','Solution']
+    ax.legend(handles,labels,fontsize='x-large')
+    ax.autoscale_view()
+
+def _figure(m, HIP, consortia):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10,10))
+    _draw(fig.add_subplot(), m, HIP, consortia)
+    return fig
+
+# Figure of the motion of one star, without pyplot: it can be drawn in any thread or process, on any backend.
+def figure(star_name, consortium, orbit=False):
+    star = as_star(star_name)
+    return _figure(_motion(star, orbit), star.hip, _choices[consortium])
+
+# Plot the apparent motion of one star. consortium: 'F' (FAST), 'N' (NDAC), 'Both' or 'None'.
+# orbit: for a star of DMSA/O, add its photocentre orbit to the solution and subtract it from the residuals (see kepler).
+# By default the figure is shown with pyplot. With ax, it is drawn on these axes; with file, it is saved to that file
+# (PNG, PDF, ... from its extension); with show=False, it is only drawn. Except when shown, the figure is returned.
+def plot(star_name,consortium,orbit=False,ax=None,file=None,show=True):
     # Convert the names of stars to HIP numbers, and get HIP numbers.
-    if star_name.startswith('HIP'):
-        HIP = int(star_name.split('HIP')[1])
-    else:
-        result_table = Simbad.query_objectids(star_name)
-        line = list(filter(lambda x: 'HIP' in str(x), result_table))
-        HIP = int(line[0][0].split('HIP')[1])
+    star = as_star(star_name)
+    HIP = star.hip
+    if consortium not in _choices:
+        print('No such consortium exits. Please check your input consortium.')
+        return None
 
     try:
-        # Get the barycentric and observed lines(solution) of motion for Hipparcos data.
-        d2r = math.pi/180
-        p = query(HIP)
-        t0 = 1991.25
-        year = np.linspace(1989.8,1993.3,341,endpoint=True)
-        barycentric_ddec_list = []
-        barycentric_dra_list = []
-        model_ddec_list = []
-        model_dra_list = []
-        for t in year:
-            ret = cearth(t)
-            pa = ret[0]*math.sin(p[0]*d2r) - ret[1]*math.cos(p[0]*d2r)
-            pd = (ret[0]*math.cos(p[0]*d2r) + ret[1]*math.sin(p[0]*d2r))*math.sin(p[1]*d2r) - ret[2]*math.cos(p[1]*d2r)
-            barycentric_ddec = (t-t0)*p[4]
-            barycentric_dra = (t-t0)*p[3]
-            barycentric_ddec_list.append(barycentric_ddec)
-            barycentric_dra_list.append(barycentric_dra)
-            model_ddec = (t-t0)*p[4] + p[2]*pd
-            model_dra = (t-t0)*p[3] + p[2]*pa
-            model_ddec_list.append(model_ddec)
-            model_dra_list.append(model_dra)
+        m = _motion(star, orbit)
+    except IndexError:
+        print(f'The data of HIP {HIP} cannot be found.')
+        return None
+    if ax is not None:
+        _draw(ax, m, HIP, _choices[consortium])
+        fig = ax.figure
+    elif file is not None or not show:
+        fig = _figure(m, HIP, _choices[consortium])
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(10,10))
+        _draw(fig.gca(), m, HIP, _choices[consortium])
+        plt.show()
+        return None
+    if file is not None:
+        fig.savefig(file)
+    return fig
 
-        # Get text from webpage. 
-        url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}'
-        webpage = str(urllib.request.urlopen(url).read())
-        soup = bs4.BeautifulSoup(webpage,'html.parser')
-        text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
-        text = text.split('\\r\\n\\r\\n')
-        text_list = []
-        text_list.append(text[0].split('\\n',3)[3])
-        for line in text[1:]:
-            text_list.append(line)
-        data_list = []
-        for row in text_list:
-            row = row.replace('\\n','|').split('|')
-            if ('F' in row) or ('f' in row):
-                data = row[0:9]
-                data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                for x in row[11:14]:
-                    data.append(x)
-            elif ('N' in row) or ('n' in row):
-                data = row[0:9]
-                data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                for x in row[14:]:
-                    data.append(x)
-            data_list.append(data)
-        data_list_t = np.array(list(map(list,zip(*data_list))))
-        # Derive residuals and standard errors.
-        source_absc = data_list_t[1].tolist()
-        mid_epoch = [float(x) for x in data_list_t[10].tolist()]
-        ra_residual = [float(data_list_t[2][i])*float(data_list_t[7][i]) for i in range(np.size(data_list_t,1))]
-        dec_residual = [float(data_list_t[3][i])*float(data_list_t[7][i]) for i in range(np.size(data_list_t,1))]
-        ra_error = [float(data_list_t[2][i])*float(data_list_t[8][i]) for i in range(np.size(data_list_t,1))]
-        dec_error = [float(data_list_t[3][i])*float(data_list_t[8][i]) for i in range(np.size(data_list_t,1))]
+# Save the motion plot of one star in directory, as HIP<number>.<format>. Runs in the worker processes of plot_many.
+def _save(star_name, consortium, orbit, directory, format, dpi):
+    star = as_star(star_name)
+    path = os.path.join(directory, f'HIP{star.hip}.{format}')
+    figure(star, consortium, orbit).savefig(path, dpi=dpi)
+    return path
 
-        # Separate source of abscissa, mid_epoch, RA/Dec residual, RA/Dec standard error of the FAST consortium and the NDAC consortium.
-        f_source_absc = []
-        f_mid_epoch = []
-        f_ra_residual = []
-        f_dec_residual = []
-        f_ra_error = []
-        f_dec_error = []
-        n_source_absc = []
-        n_mid_epoch = []
-        n_ra_residual = []
-        n_dec_residual = []
-        n_ra_error = []
-        n_dec_error = []
-        for i in range(len(source_absc)):
-            if source_absc[i] == 'F' or source_absc[i] == 'f':
-                f_source_absc.append(source_absc[i])
-                f_mid_epoch.append(mid_epoch[i])
-                f_ra_residual.append(ra_residual[i])
-                f_dec_residual.append(dec_residual[i])
-                f_ra_error.append(ra_error[i])
-                f_dec_error.append(dec_error[i])
-            elif source_absc[i] == 'N' or source_absc[i] == 'n':
-                n_source_absc.append(source_absc[i])
-                n_mid_epoch.append(mid_epoch[i])
-                n_ra_residual.append(ra_residual[i])
-                n_dec_residual.append(dec_residual[i])
-                n_ra_error.append(ra_error[i])
-                n_dec_error.append(dec_error[i])
-        # Get the fitted and rejected points on the observed line(solution).
-        f_fit_ddec_list = []
-        f_fit_dra_list = []
-        n_fit_ddec_list = []
-        n_fit_dra_list = []
-        for f in f_mid_epoch:
-            ret = cearth(f+t0)
-            pa = ret[0]*math.sin(p[0]*d2r) - ret[1]*math.cos(p[0]*d2r)
-            pd = (ret[0]*math.cos(p[0]*d2r) + ret[1]*math.sin(p[0]*d2r))*math.sin(p[1]*d2r) - ret[2]*math.cos(p[1]*d2r)
-            f_fit_ddec = f*p[4] + p[2]*pd
-            f_fit_dra = f*p[3] + p[2]*pa
-            f_fit_ddec_list.append(f_fit_ddec)
-            f_fit_dra_list.append(f_fit_dra)
-        for n in n_mid_epoch:
-            ret = cearth(n+t0)
-            pa = ret[0]*math.sin(p[0]*d2r) - ret[1]*math.cos(p[0]*d2r)
-            pd = (ret[0]*math.cos(p[0]*d2r) + ret[1]*math.sin(p[0]*d2r))*math.sin(p[1]*d2r) - ret[2]*math.cos(p[1]*d2r)
-            n_fit_ddec = n*p[4] + p[2]*pd
-            n_fit_dra = n*p[3] + p[2]*pa
-            n_fit_ddec_list.append(n_fit_ddec)
-            n_fit_dra_list.append(n_fit_dra)
-        # Plot the figure.
-        if consortium == 'F' or consortium == 'f' or consortium == 'FAST':
-            try:
-                plt.figure(figsize=(10,10))
-                for i in range(len(f_mid_epoch)):
-                    plt.plot([f_fit_dra_list[i],f_fit_dra_list[i]+f_ra_residual[i]],[f_fit_ddec_list[i],f_fit_ddec_list[i]+f_dec_residual[i]],color='blue')
-                    plt.plot([f_fit_dra_list[i]+f_ra_residual[i]+f_dec_error[i],f_fit_dra_list[i]+f_ra_residual[i]-f_dec_error[i]],
-                             [f_fit_ddec_list[i]+f_dec_residual[i]-f_ra_error[i],f_fit_ddec_list[i]+f_dec_residual[i]+f_ra_error[i]],color='blue')
-                    if f_source_absc[i] == 'F':
-                        type1 = plt.scatter(f_fit_dra_list[i],f_fit_ddec_list[i],s=10,color='blue')
-                    elif f_source_absc[i] == 'f':
-                        type2 = plt.scatter(f_fit_dra_list[i],f_fit_ddec_list[i],s=100,facecolors='none',edgecolors='blue')
-            except IndexError:
-                print(f'The intermediate data of HIP {HIP} has no source of abscissa from F or f.')
-            finally:
-                plt.title(f'Apparent motion of HIP {HIP} (FAST)',fontdict={'weight':'normal','size': 20})
-                plt.ylabel(r'$\Delta\delta$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xlabel(r'$\Delta\alpha$'+r'$ cos(\delta)$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xticks(size = 15)
-                plt.yticks(size = 15)
-                type5 = plt.plot(barycentric_dra_list,barycentric_ddec_list,color='violet',label='Barycentric motion')
-                type6 = plt.plot(model_dra_list,model_ddec_list,color='lime',label='Solution')
-                try:
-                    plt.legend((type1,type2,type5[0],type6[0]),('FAST Data Fitted','FAST Data Rejected','Barycentric motion','Solution'),fontsize='x-large')
-                except NameError:
-                    plt.legend((type1,type5[0],type6[0]),('FAST Data Fitted','Barycentric motion','Solution'),fontsize='x-large')
-                plt.show()
-        elif consortium == 'N' or consortium == 'n' or consortium == 'NDAC':
-            try:
-                plt.figure(figsize=(10,10))
-                for j in range(len(n_mid_epoch)):
-                    plt.plot([n_fit_dra_list[j],n_fit_dra_list[j]+n_ra_residual[j]],[n_fit_ddec_list[j],n_fit_ddec_list[j]+n_dec_residual[j]],color='red')
-                    plt.plot([n_fit_dra_list[j]+n_ra_residual[j]+n_dec_error[j],n_fit_dra_list[j]+n_ra_residual[j]-n_dec_error[j]],
-                             [n_fit_ddec_list[j]+n_dec_residual[j]-n_ra_error[j],n_fit_ddec_list[j]+n_dec_residual[j]+n_ra_error[j]],color='red')
-                    if n_source_absc[j] == 'N':
-                        type3 = plt.scatter(n_fit_dra_list[j],n_fit_ddec_list[j],s=10,color='red')
-                    elif n_source_absc[j] == 'n':
-                        type4 = plt.scatter(n_fit_dra_list[j],n_fit_ddec_list[j],s=100,facecolors='none',edgecolors='red')
-            except IndexError:
-                print(f'The intermediate data of HIP {HIP} has no source of abscissa from N or n.')
-            finally:
-                plt.title(f'Apparent motion of HIP {HIP} (NDAC)',fontdict={'weight':'normal','size': 20})
-                plt.ylabel(r'$\Delta\delta$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xlabel(r'$\Delta\alpha$'+r'$ cos(\delta)$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xticks(size = 15)
-                plt.yticks(size = 15)
-                type5 = plt.plot(barycentric_dra_list,barycentric_ddec_list,color='violet',label='Barycentric motion')
-                type6 = plt.plot(model_dra_list,model_ddec_list,color='lime',label='Solution')
+# Save the motion plots of many stars (names, HIP numbers or Star objects) in directory, one file HIP<number>.<format>
+# per star (format: png, pdf, svg, ...), on max_workers processes (default: all the cores). Nothing is printed: paths[i]
+# is the file of stars[i], or None if it failed, and errors[i] is then the exception (see download.get_data_many).
+def plot_many(stars, consortium='Both', directory='.', format='png', orbit=False, dpi=100, max_workers=None):
+    from concurrent.futures import ProcessPoolExecutor
+    if consortium not in _choices:
+        raise ValueError(f'No such consortium: {consortium}. Please choose from F, N, Both or None.')
+    os.makedirs(directory, exist_ok=True)
+    stars = [star.hip if hasattr(star, 'hip') else star for star in stars]  # the pages of Star objects are not sent to the workers
+    paths = [None]*len(stars)
+    errors = [None]*len(stars)
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_save, star, consortium, orbit, directory, format, dpi) for star in stars]
+            for i, future in enumerate(futures):
                 try:
-                    plt.legend((type3,type4,type5[0],type6[0]),('NDAC Data Fitted','NDAC Data Rejected','Barycentric motion','Solution'),fontsize='x-large')
-                except NameError:
-                    plt.legend((type3,type5[0],type6[0]),('NDAC Data Fitted','Barycentric motion','Solution'),fontsize='x-large')
-                plt.show()
-        elif consortium == 'Both' or consortium == 'both':
-            try:
-                plt.figure(figsize=(10,10))
-                for i in range(len(f_mid_epoch)):
-                    plt.plot([f_fit_dra_list[i],f_fit_dra_list[i]+f_ra_residual[i]],[f_fit_ddec_list[i],f_fit_ddec_list[i]+f_dec_residual[i]],color='blue')
-                    plt.plot([f_fit_dra_list[i]+f_ra_residual[i]+f_dec_error[i],f_fit_dra_list[i]+f_ra_residual[i]-f_dec_error[i]],
-                             [f_fit_ddec_list[i]+f_dec_residual[i]-f_ra_error[i],f_fit_ddec_list[i]+f_dec_residual[i]+f_ra_error[i]],color='blue')
-                    if f_source_absc[i] == 'F':
-                        type1 = plt.scatter(f_fit_dra_list[i],f_fit_ddec_list[i],s=10,color='blue')
-                    elif f_source_absc[i] == 'f':
-                        type2 = plt.scatter(f_fit_dra_list[i],f_fit_ddec_list[i],s=100,facecolors='none',edgecolors='blue')
-            except IndexError:
-                print(f'The intermediate data of HIP {HIP} has no source of abscissa from F or f.')
+                    paths[i] = future.result()
+                except Exception as e:
+                    errors[i] = e
+    else:
+        for i, star in enumerate(stars):
             try:
-                for j in range(len(n_mid_epoch)):
-                    plt.plot([n_fit_dra_list[j],n_fit_dra_list[j]+n_ra_residual[j]],[n_fit_ddec_list[j],n_fit_ddec_list[j]+n_dec_residual[j]],color='red')
-                    plt.plot([n_fit_dra_list[j]+n_ra_residual[j]+n_dec_error[j],n_fit_dra_list[j]+n_ra_residual[j]-n_dec_error[j]],
-                             [n_fit_ddec_list[j]+n_dec_residual[j]-n_ra_error[j],n_fit_ddec_list[j]+n_dec_residual[j]+n_ra_error[j]],color='red')
-                    if n_source_absc[j] == 'N':
-                        type3 = plt.scatter(n_fit_dra_list[j],n_fit_ddec_list[j],s=10,color='red')
-                    elif n_source_absc[j] == 'n':
-                        type4 = plt.scatter(n_fit_dra_list[j],n_fit_ddec_list[j],s=100,facecolors='none',edgecolors='red')
-            except IndexError:
-                print(f'The intermediate data of HIP {HIP} has no source of abscissa from N or n.')    
-            finally:
-                plt.title(f'Apparent motion of HIP {HIP} (Both)',fontdict={'weight':'normal','size': 20})
-                plt.ylabel(r'$\Delta\delta$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xlabel(r'$\Delta\alpha$'+r'$ cos(\delta)$'+' [mas]',fontdict={'weight':'normal','size': 15})
-                plt.xticks(size = 15)
-                plt.yticks(size = 15)
-                type5 = plt.plot(barycentric_dra_list,barycentric_ddec_list,color='violet',label='Barycentric motion')
-                type6 = plt.plot(model_dra_list,model_ddec_list,color='lime',label='Solution')
-                try:
-                    plt.legend((type1,type2,type3,type4,type5[0],type6[0]),('FAST Data Fitted','FAST Data Rejected','NDAC Data Fitted','NDAC Data Rejected','Barycentric motion','Solution'))
-                except NameError:
-                    try:
-                        plt.legend((type1,type3,type4,type5[0],type6[0]),('FAST Data Fitted','NDAC Data Fitted','NDAC Data Rejected','Barycentric motion','Solution'),fontsize='x-large')
-                    except NameError:
-                        plt.legend((type1,type3,type5[0],type6[0]),('FAST Data Fitted','NDAC Data Fitted','Barycentric motion','Solution'),fontsize='x-large')
-                plt.show()
-        elif consortium == 'None' or consortium == 'none':
-            plt.figure(figsize=(10,10))
-            plt.title(f'Apparent motion of HIP {HIP} (None)',fontdict={'weight':'normal','size': 20})
-            plt.ylabel(r'$\Delta\delta$'+' [mas]',fontdict={'weight':'normal','size': 15})
-            plt.xlabel(r'$\Delta\alpha$'+r'$ cos(\delta)$'+' [mas]',fontdict={'weight':'normal','size': 15})
-            plt.xticks(size = 15)
-            plt.yticks(size = 15)
-            type5 = plt.plot(barycentric_dra_list,barycentric_ddec_list,color='violet',label='Barycentric motion')
-            type6 = plt.plot(model_dra_list,model_ddec_list,color='lime',label='Solution')
-            plt.legend((type5[0],type6[0]),('Barycentric motion','Solution'),fontsize='x-large')
-            plt.show()
-        else:
-            print('No such consortium exits. Please check your input consortium.')
-    except IndexError:
-        print(f'The data of HIP {HIP} cannot be found.')
\ No newline at end of file
+                paths[i] = _save(star, consortium, orbit, directory, format, dpi)
+            except Exception as e:
+                errors[i] = e
+    return paths, errors
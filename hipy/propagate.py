@@ -1,28 +1,33 @@
-import requests
-from astroquery.simbad import Simbad
 import numpy as np
-import pandas as pd
-from astropy.table import QTable, Table, Column
 from astropy import units as u
-import urllib
-import re
-import bs4
+from . import instrument
+from . import formats
+from .star import as_star
 import math
-# Convert RA, Dec to Cartesian coordinates.
+# Convert RA, Dec to Cartesian coordinates. Works on scalars and on arrays of any shape.
 def radec2xyz(dec,ra):
-    x = math.cos(dec)*math.cos(ra)
-    y = math.cos(dec)*math.sin(ra)
-    z = math.sin(dec)
+    x = np.cos(dec)*np.cos(ra)
+    y = np.cos(dec)*np.sin(ra)
+    z = np.sin(dec)
     return [x,y,z]
-# Convert Cartesian coordinates to RA, Dec.
+# Convert Cartesian coordinates to RA, Dec. Works on scalars and on arrays of any shape.
 def xyz2radec(x,y,z):
-    dec = math.atan(z/math.sqrt(x*x+y*y))  # rad
-    ra = math.atan(y/x)                    # rad
-    if x < 0:
-        ra = ra + math.pi                  # rad
-    if (x >= 0) and (y < 0):
-        ra = ra + 2*math.pi                # rad
+    dec = np.arctan2(z,np.hypot(x,y))       # rad
+    ra = np.arctan2(y,x) % (2*math.pi)      # rad, in [0, 2pi)
     return [dec,ra]
+# Rotations O-xyz → O-x'y'z' (about z by ra) then → O-x''y''z'' (about y' by dec), stacked over the shape of ra and dec.
+# The rotated axes point to the radial direction, to the east and to the north.
+def rotation(ra,dec):
+    ra, dec = np.broadcast_arrays(np.asarray(ra,dtype=float), np.asarray(dec,dtype=float))
+    rotz = np.zeros(ra.shape+(3,3))
+    rotz[...,0,0] = np.cos(ra);  rotz[...,0,1] = np.sin(ra)
+    rotz[...,1,0] = -np.sin(ra); rotz[...,1,1] = np.cos(ra)
+    rotz[...,2,2] = 1.0
+    roty = np.zeros(ra.shape+(3,3))
+    roty[...,0,0] = np.cos(dec);  roty[...,0,2] = np.sin(dec)
+    roty[...,1,1] = 1.0
+    roty[...,2,0] = -np.sin(dec); roty[...,2,2] = np.cos(dec)
+    return roty @ rotz
 
 d2r = math.pi/180
 kpcmyr2auyr = 1e3*206265/1e6        # kpc/(10^6 yr) → au/yr
@@ -31,124 +36,89 @@ auyr2kms = 1.5*1e8/(365.25*24*3600) # au/yr → km/s
 kpcmyr2kms = kpcmyr2auyr*auyr2kms   # kpc/(10^6 yr) → km/s
 rv0 = 0  # km/s
 
-# observational linear propagation
-def propagate(star_name):
-    
+# Linear propagation of the astrometry of N stars to M epochs.
+# astrometry: array of shape (N, 5) or (N, 6) with ra (deg), dec (deg), parallax (mas), pmra (mas/yr), pmdec (mas/yr)
+#             and optionally rv (km/s), at ref_epoch (Julian year). A single star can be given as a 1-D array.
+# epochs: Julian years (e.g. 1991.25 or 2016.0), scalar or 1-D array of length M.
+# rv: radial velocities (km/s, scalar or length N), used instead of the sixth column; rv0 if neither is given.
+# Returns a dict of (N, M) Quantities: ra, dec, parallax, pmra, pmdec and rv. Stars without a positive parallax get NaN.
+def propagate_many(astrometry,epochs,rv=None,ref_epoch=1991.25):
+    state = _propagate_many(astrometry, epochs, rv, ref_epoch)
+    return {name:value*schema.units[name] for name, value in state.items()}
+
+# As propagate_many, but the arrays are in deg, mas, mas/yr and km/s, without Quantity.
+def _propagate_many(astrometry,epochs,rv=None,ref_epoch=1991.25):
+    a = np.atleast_2d(np.asarray(astrometry, dtype=float))
+    if a.shape[1] not in (5,6):
+        raise ValueError(f'astrometry must have 5 or 6 columns, got {a.shape[1]}.')
+    if rv is None:
+        rv = a[:,5] if a.shape[1] == 6 else rv0
+    rv = np.broadcast_to(np.asarray(rv, dtype=float), (len(a),))
+    t = np.atleast_1d(np.asarray(epochs, dtype=float)) - ref_epoch  # yr
+    ra0 = a[:,0:1]*d2r     # rad, (N, 1)
+    dec0 = a[:,1:2]*d2r    # rad
+    plx0 = a[:,2:3]        # mas
+    pmra0 = a[:,3:4]       # mas/yr
+    pmdec0 = a[:,4:5]      # mas/yr
+    # Propagate observables to states.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d0 = np.where(plx0 > 0, 1/plx0, np.nan)  # kpc
+    r = radec2xyz(dec0,ra0)
+    vdec = pmdec0*d0                  # au/yr  # mas/yr*kpc = au/yr, the definition of parsec: 1 pc = 1 au / 1 arcsecond
+    vra = pmra0*d0                    # au/yr
+    vr = rv[:,np.newaxis]/auyr2kms    # au/yr, positive if the star is moving away from the Sun
+    vx = vr*np.cos(dec0)*np.cos(ra0) - vdec*np.sin(dec0)*np.cos(ra0) - vra*np.sin(ra0)  # au/yr
+    vy = vr*np.cos(dec0)*np.sin(ra0) - vdec*np.sin(dec0)*np.sin(ra0) + vra*np.cos(ra0)  # au/yr
+    vz = vr*np.sin(dec0) + vdec*np.cos(dec0)  # au/yr
+    x = r[0]*d0*1e3 + vx*t/pc2au      # pc, (N, M)
+    y = r[1]*d0*1e3 + vy*t/pc2au      # pc
+    z = r[2]*d0*1e3 + vz*t/pc2au      # pc
+    # Convert time-varying states to observables.
+    dec, ra = xyz2radec(x,y,z)        # rad
+    d = np.sqrt(x*x+y*y+z*z)*1e-3     # kpc
+    # velocity → proper motion and radial velocity, in the local frame of each star at each epoch
+    c = np.stack(np.broadcast_arrays(vx,vy,vz), axis=-1)  # au/yr, (N, 1, 3)
+    v = (rotation(ra,dec) @ c[...,np.newaxis])[...,0]     # (N, M, 3)
+    return {'ra':ra/d2r,
+            'dec':dec/d2r,
+            'parallax':1.0/d,
+            'pmra':v[...,1]/d,
+            'pmdec':v[...,2]/d,
+            'rv':v[...,0]*auyr2kms}
+
+# Names, descriptions and units of the columns of propagate.
+schema = formats.Schema(
+    names=('orbit_number','source_absc','ra','dec','parallax','pmra','pmdec','rv','mid_epoch'),
+    meta={'orbit_number':'orbit number','source_absc':'source of abscissa (F or f if FAST data, N or n if NDAC data)',
+          'ra':'Right ascension in model','dec':'Declination in model','parallax':'parallax','pmra':'proper motion in RA','pmdec':'proper motion in Dec',
+          'rv':'Radial velocity','mid_epoch':'FAST/NDAC reference great-circle mid-epoch, in years relative to J1991.25(TT)'},
+    units={'ra':u.deg,'dec':u.deg,'parallax':u.mas,'pmra':u.mas/u.yr,'pmdec':u.mas/u.yr,'rv':u.km/u.s,'mid_epoch':u.yr})
+
+# QTable (or another output, see formats) of the propagation of one star (a Star) to the mid-epochs of its intermediate
+# data, without printing.
+def _table(star,rv=None,output='qtable'):
+    # Get RA, Dec, parallax, proper motion in RA and Dec at epoch J1991.25, and the mid-epochs of the great circles.
+    p, records = star.astrometry, star.intermediate_records
+    with instrument.phase('derive', star.hip, kind='propagate'):
+        mid_epoch = records['mid_epoch']  # yr
+        state = _propagate_many(p, mid_epoch + 1991.25, rv=rv)
+    with instrument.phase('build', star.hip, kind='propagate'):
+        columns = {'orbit_number':records['orbit_number'], 'source_absc':records['source_absc'],
+                   **{name:value[0] for name, value in state.items()}, 'mid_epoch':mid_epoch}
+        return schema.output(columns, output)
+
+# observational linear propagation of one star to the mid-epochs of its intermediate data
+# star_name is the name of a star, or a Star whose pages and tables are reused.
+# output: 'qtable' (default), 'numpy' for a structured array or 'pandas' for a DataFrame, without Quantity (see formats).
+def propagate(star_name,rv=None,output='qtable'):
+    formats.check(output)
     # Convert the names of stars to HIP numbers, and get HIP numbers.
-    if star_name.startswith('HIP'):
-        HIP = int(star_name.split('HIP')[1])
-    else:
-        result_table = Simbad.query_objectids(star_name)
-        line = list(filter(lambda x: 'HIP' in str(x), result_table))
-        HIP = int(line[0][0].split('HIP')[1])
+    star = as_star(star_name)
+    HIP = star.hip
 
     print(f'### Propagation of HIP {HIP}')
     try:
-        # Get RA, Dec, parallax, proper motion in RA and Dec at epoch J1991.25. 
-        url = f'https://hipparcos-tools.cosmos.esa.int/cgi-bin/HIPcatalogueSearch.pl?noLinks=1&tabular=1&hipiId={HIP}'
-        webpage = str(urllib.request.urlopen(url).read())
-        soup = bs4.BeautifulSoup(webpage,'html.parser')
-        text = soup.find(name='pre').get_text().lstrip("\\n").rstrip("\\r\\n\\r\\n\\r\\n'")
-        text = text.split('\\r\\n\\r\\n')
-        value_list = []
-        value_list.append(text[0].split('\\n',2)[1].split('|'))
-        ra0 = float(value_list[0][2])     # deg
-        dec0 = float(value_list[0][3])    # deg
-        plx0 = float(value_list[0][4])    # mas
-        pmra0 = float(value_list[0][5])   # mas/yr
-        pmdec0 = float(value_list[0][6])  # mas/yr
-        ra0 = ra0*d2r                     # rad
-        dec0 = dec0*d2r                   # rad
-        # Get orbit number, source of abscissa, mid-epoch.
-        text_list = []
-        text_list.append(text[0].split('\\n',3)[3])
-        for line in text[1:]:
-            text_list.append(line)
-        data_list = []
-        for row in text_list:
-            row = row.replace('\\n','|').split('|')
-            if ('F' in row) or ('f' in row):
-                data = row[0:9]
-                data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                for x in row[11:14]:
-                    data.append(x)
-            elif ('N' in row) or ('n' in row):
-                data = row[0:9]
-                data.append(np.nan) if row[9] == '     ' else data.append(row[9])
-                for x in row[14:]:
-                    data.append(x)
-            data_list.append(data)
-        data_list_t = list(map(list, zip(*data_list)))
-        orbit_number = data_list_t[0]
-        source_absc = data_list_t[1]
-        mid_epoch = [float(x) for x in data_list_t[10]]  # yr
-        # Propagate observables to states.
-        d0 = 1/plx0              # kpc
-        r = radec2xyz(dec0,ra0) 
-        x0 = r[0]*d0*1e3         # pc
-        y0 = r[1]*d0*1e3         # pc
-        z0 = r[2]*d0*1e3         # pc
-        vdec = pmdec0*d0          # au/yr  # mas/yr*kpc = au/yr, the definition of parsec: 1 pc = 1 au / 1 arcsecond
-        vra = pmra0*d0           # au/yr
-        vp = math.sqrt(vra*vra + vdec*vdec)  # au/yr
-        vr = rv0/auyr2kms    # au/yr
-        vx = vr*math.cos(dec0)*math.cos(ra0) - vdec*math.sin(dec0)*math.cos(ra0) - vra*math.sin(ra0)  # au/yr          
-        # note: vr is positive if the star is moving away from the Sun
-        vy = vr*math.cos(dec0)*math.sin(ra0) - vdec*math.sin(dec0)*math.sin(ra0) + vra*math.cos(ra0)  # au/yr
-        vz = vr*math.sin(dec0) + vdec*math.cos(dec0)  # au/yr
-        x_list = []
-        y_list = []
-        z_list = []
-        d_list = []
-        ra_list = []
-        dec_list = []
-        plx_list = []
-        for t in mid_epoch:
-            x = x0 + vx*t/pc2au
-            y = y0 + vy*t/pc2au
-            z = z0 + vz*t/pc2au
-            # Convert time-varying states to observables.
-            ra = xyz2radec(x,y,z)[1]/d2r    # deg
-            dec = xyz2radec(x,y,z)[0]/d2r   # deg
-            d = math.sqrt(x*x+y*y+z*z)*1e-3 # kpc
-            plx = 1.0/d                     # mas
-            x_list.append(x)
-            y_list.append(y)
-            z_list.append(z)
-            ra_list.append(ra)
-            dec_list.append(dec)
-            d_list.append(d)
-            plx_list.append(plx)
-        # velocity → proper motion
-        # vequ = []
-        pmra_list = []
-        pmdec_list = []
-        rv_list = []
-        for j in range(len(mid_epoch)):
-            rotz = np.matrix([[math.cos(ra_list[j]),math.sin(ra_list[j]),0.0],[-math.sin(ra_list[j]),math.cos(ra_list[j]),0.0],[0.0,0.0,1.0]])  # O-xyz → O-x'y'z'
-            roty = np.matrix([[math.cos(dec_list[j]),0.0,math.sin(dec_list[j])],[0.0,1.0,0.0],[-math.sin(dec_list[j]),0.0,math.cos(dec_list[j])]])  # O-x'y'z' → O-x''y''z''
-            c = np.array([vx,vy,vz]).reshape((-1,1))
-            v = np.dot(np.dot(roty,rotz),c)
-        #   vequ.append(v)
-            pmra = v[1]/d_list[j]   # mas/yr
-            pmdec = v[2]/d_list[j]  # mas/yr
-            rv = v[0]*auyr2kms      # km/s
-            pmra_list.append(pmra)
-            pmdec_list.append(pmdec)
-            rv_list.append(rv)
-        final_list = [orbit_number,source_absc,ra_list,dec_list,plx_list,pmra_list,pmdec_list,rv_list,mid_epoch]
-        final_list[2] = [float(x) for x in list(final_list[2])] * u.deg
-        final_list[3] = [float(x) for x in list(final_list[3])] * u.deg
-        final_list[4] = [float(x) for x in list(final_list[4])] * u.mas
-        final_list[5] = [float(x) for x in list(final_list[5])] * u.mas/u.yr
-        final_list[6] = [float(x) for x in list(final_list[6])] * u.mas/u.yr
-        final_list[7] = [float(x) for x in list(final_list[7])] * u.km/u.s
-        final_list[8] = [float(x) for x in list(final_list[8])] * u.yr
-        out = QTable(final_list,
-                    names=('orbit_number','source_absc','ra','dec','parallax','pmra','pmdec','rv','mid_epoch'),
-                    meta={'orbit_number':'orbit number','source_absc':'source of abscissa (F or f if FAST data, N or n if NDAC data)',
-                         'ra':'Right ascension in model','dec':'Declination in model','parallax':'parallax','pmra':'proper motion in RA','pmdec':'proper motion in Dec',
-                         'rv':'Radial velocity','mid_epoch':'FAST/NDAC reference great-circle mid-epoch, in years relative to J1991.25(TT)'})
+        out = _table(star, rv, output)
     except IndexError:
         print(f'The intermediate data of HIP {HIP} cannot be found.')
     return out
@@ -0,0 +1,106 @@
+import os
+import time
+import zlib
+import threading
+import contextlib
+from urllib.parse import urlsplit, parse_qs
+from . import cache
+
+# Local HTTP server replaying recorded pages of HIPcatalogueSearch.pl, to measure the throughput and the latency of the
+# downloads (see aio and download.get_data_many) under concurrency without the ESA server. The pages are those of a
+# cache directory (see cache: one compressed file per kind of page and HIP number), e.g. one filled by earlier queries,
+# and are served with the same query parameters (hipId, hipiId, hipepId, dmId). A missing page is a 404.
+#
+#   with hipy.replay.replaying('/path/to/recorded/cache', latency=0.2):
+#       tables, errors = await hipy.aio.get_data_many(hips, 'epd')    # with a cache elsewhere, or disabled
+#
+# latency: seconds to wait before each response, to stand for the response time of the ESA server.
+class Server:
+
+    def __init__(self, pages_dir, host='127.0.0.1', port=0, latency=0):
+        from http.server import ThreadingHTTPServer
+        self.pages_dir = pages_dir
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # URL to use as cache.base_url.
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/cgi-bin/HIPcatalogueSearch.pl'
+
+    # Raw bytes of one recorded page, or None.
+    def page(self, kind, HIP):
+        try:
+            with open(os.path.join(self.pages_dir, kind, f'{int(HIP)}.z'), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='hipy-replay', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def _handler(server):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, as the ESA server
+        disable_nagle_algorithm = True  # the headers and the page are sent apart: do not wait for the ACK of the headers
+
+        def do_GET(self):
+            with server._lock:
+                server.requests += 1
+            query = parse_qs(urlsplit(self.path).query)
+            payload = None
+            for kind in cache.queries:
+                if kind in query:
+                    try:
+                        payload = server.page(kind, query[kind][0])
+                    except ValueError:
+                        pass
+                    break
+            if server.latency:
+                time.sleep(server.latency)
+            if payload is None:
+                self.send_response(404)
+                payload = b'Not recorded'
+            else:
+                self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+# Serve the recorded pages of pages_dir inside a `with` block, with cache.base_url pointing at the server.
+@contextlib.contextmanager
+def replaying(pages_dir, latency=0, port=0):
+    old = cache.base_url
+    with Server(pages_dir, port=port, latency=latency) as server:
+        cache.base_url = server.url
+        try:
+            yield server
+        finally:
+            cache.base_url = old
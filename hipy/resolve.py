@@ -0,0 +1,189 @@
+import os
+import re
+import json
+import threading
+from . import cache
+from . import instrument
+
+# Resolution of star names into HIP numbers, cheapest first:
+# 1. 'HIP <number>' is read directly;
+# 2. names resolved before are kept in a memo, stored as names.json in the cache folder (see cache.settings);
+# 3. HD, BD, CD/CoD, CPD and CCDM identifiers are looked up in the cross-identifiers of the local catalogue
+#    (see catalogue.ingest), without any network access;
+# 4. other names are sent to Simbad. resolve_many sends them all in one query.
+
+_lock = threading.RLock()
+_memo = None    # normalised name → HIP number, or None if Simbad knows the star but not as a HIP entry
+_memo_file = None
+_index = None   # normalised cross-identifier → HIP number, from the local catalogue
+_index_store = None
+_simbad = None
+
+_hip_pattern = re.compile(r'^HIP\s*(\d+)$')
+_patterns = [(re.compile(r'^HD[EC]?\s*(\d+)$'), lambda m: f'HD {int(m[1])}'),
+             (re.compile(r'^(BD|CD|COD|CPD)\s*([+-])\s*(\d+)\s+(\d+)$'),
+              lambda m: f'{"CD" if m[1] == "COD" else m[1]}{m[2]}{int(m[3]):02d} {int(m[4])}'),
+             (re.compile(r'^CCDM\s*J?\s*(\d{5}[+-]\d{4})$'), lambda m: f'CCDM J{m[1]}')]
+
+# Normalised form of a star name: upper case, single spaces, and a canonical spelling of the catalogue identifiers,
+# so that e.g. 'hd 1234', 'HDE1234' and 'HD 1234' are the same name.
+def normalise(star_name):
+    name = ' '.join(str(star_name).upper().split())
+    for pattern, canonical in _patterns:
+        m = pattern.match(name)
+        if m:
+            return canonical(m)
+    return name
+
+def _memo_path():
+    return os.path.join(cache.settings['cache_dir'], 'names.json')
+
+def _load_memo():
+    global _memo, _memo_file
+    if _memo is None or _memo_file != _memo_path():
+        _memo_file = _memo_path()
+        try:
+            with open(_memo_file) as f:
+                _memo = json.load(f)
+        except (OSError, ValueError):
+            _memo = {}
+    return _memo
+
+def _save_memo():
+    path = _memo_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(_memo, f, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+def remember(resolved):
+    with _lock:
+        memo = _load_memo()
+        memo.update(resolved)
+        if cache.settings['enabled']:
+            _save_memo()
+
+# Forget the resolved names, in memory and on disk.
+def clear():
+    global _memo
+    with _lock:
+        _memo = None
+        try:
+            os.remove(_memo_path())
+        except OSError:
+            pass
+
+# Cross-identifier index of the local catalogue: HD, BD, CD, CPD and CCDM identifiers → HIP number.
+# A CCDM identifier is shared by all the entries of one system; it resolves to the first of them.
+def cross_index():
+    global _index, _index_store
+    from . import catalogue
+    store = catalogue.local()
+    if store is None:
+        return {}
+    with _lock:
+        if _index is None or _index_store is not store:
+            index = {}
+            hips = store['hip']
+            prefixes = {'hd':'HD ', 'bd':'BD', 'cod':'CD', 'cpd':'CPD', 'ccdm':'CCDM J'}
+            for name, prefix in prefixes.items():
+                col = store[name]
+                for row in (col != 'nan').nonzero()[0]:
+                    value = str(col[row])
+                    if name in ('bd', 'cod', 'cpd'):
+                        value = value.lstrip('BCP')
+                    index.setdefault(normalise(prefix + value), int(hips[row]))
+            _index, _index_store = index, store
+        return _index
+
+# HIP number of one name without any network access, or -1 if unknown, or None if the star is known not to be in Hipparcos.
+def _local(name):
+    m = _hip_pattern.match(name)
+    if m:
+        return int(m[1])
+    with _lock:
+        memo = _load_memo()
+        if name in memo:
+            return memo[name]
+    return cross_index().get(name, -1)
+
+def _hip_of_ids(ids):
+    for x in ids.split('|'):
+        x = x.strip()
+        if x.startswith('HIP'):
+            return int(x.split('HIP')[1])
+    return None
+
+def _not_found(star_name):
+    return IndexError(f'{star_name} has no Hipparcos Catalogue(HIP) identifier.')
+
+# HIP number of one star name. Raises IndexError if the star is not in the Hipparcos Catalogue.
+def resolve(star_name):
+    with instrument.phase('resolve', star=str(star_name)):
+        HIP = _resolve(star_name)
+        instrument.note(hip=HIP)
+        return HIP
+
+def _resolve(star_name):
+    name = normalise(star_name)
+    HIP = _local(name)
+    if HIP is None:
+        raise _not_found(star_name)
+    if HIP >= 0:
+        return HIP
+    if cache.settings['offline']:
+        raise cache.OfflineError(f'{star_name} cannot be resolved without Simbad and hipy is offline.')
+    from astroquery.simbad import Simbad
+    result_table = Simbad.query_objectids(star_name)
+    if not result_table:
+        raise _not_found(star_name)  # unknown to Simbad: not memoised, it may be a typo
+    line = list(filter(lambda x: 'HIP' in str(x), result_table))
+    HIP = int(line[0][0].split('HIP')[1]) if line else None
+    remember({name:HIP})
+    if HIP is None:
+        raise _not_found(star_name)
+    return HIP
+
+def _bulk_simbad():
+    global _simbad
+    with _lock:
+        if _simbad is None:
+            from astroquery.simbad import Simbad
+            simbad = Simbad()
+            simbad.add_votable_fields('ids')
+            _simbad = simbad
+        return _simbad
+
+# HIP numbers of many star names, in the same order: None for the stars that are not in the Hipparcos Catalogue.
+# The names that cannot be resolved locally are sent to Simbad in one single query.
+def resolve_many(star_names):
+    with instrument.phase('resolve'):
+        hips = _resolve_many(star_names)
+        instrument.note(names=len(hips))
+        return hips
+
+def _resolve_many(star_names):
+    names = [normalise(x) for x in star_names]
+    hips = [_local(name) for name in names]
+    unknown = {}  # one Simbad name per normalised name
+    for x, name, HIP in zip(star_names, names, hips):
+        if HIP is not None and HIP < 0:
+            unknown.setdefault(name, str(x))
+    unknown = list(unknown.values())
+    if unknown:
+        if cache.settings['offline']:
+            raise cache.OfflineError(f'{len(unknown)} names cannot be resolved without Simbad and hipy is offline.')
+        result_table = _bulk_simbad().query_objects(unknown)
+        columns = {x.lower():x for x in result_table.colnames}
+        if 'user_specified_id' in columns:
+            users = [str(x) for x in result_table[columns['user_specified_id']]]
+        else:
+            users = unknown  # older versions of astroquery keep the order of the query
+        resolved = {}
+        for user, ids in zip(users, result_table[columns['ids']]):
+            if str(ids).strip('- '):  # names unknown to Simbad (empty or masked '--') are not memoised
+                resolved[normalise(user)] = _hip_of_ids(str(ids))
+        remember(resolved)
+        hips = [resolved.get(name) if HIP is not None and HIP < 0 else HIP for name, HIP in zip(names, hips)]
+    return hips
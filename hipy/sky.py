@@ -0,0 +1,246 @@
+import math
+import threading
+import numpy as np
+from astropy import units as u
+
+# Positional queries over the catalogue: cone searches and nearest neighbours.
+# The sky is cut into zones of declination of equal height h, and each zone into cells of right ascension at least h wide
+# (fewer cells towards the poles). The stars are sorted by cell and by right ascension within each cell, so that the
+# stars of a zone, or of a range of right ascension in one zone, are one slice found by binary search. Distances are
+# computed exactly from unit vectors, the cells only select the candidates.
+#
+#   hipy.sky.cone_search(86.5, -32.3, 0.5)                    # HIP numbers and separations within 0.5 deg
+#   hipy.sky.nearest(ra, dec, epoch=2016.0, max_separation=5*u.arcsec)   # cross-match of many positions at once
+
+# Cut of the sphere into zones of height h (deg), and cells of right ascension.
+class _Grid:
+
+    def __init__(self, h):
+        self.n_zones = max(1, math.ceil(180/h))
+        self.h = 180/self.n_zones  # every point within h of a cell lies in the cell or in one of its 8 neighbours
+        lo = -90 + self.h*np.arange(self.n_zones)
+        far = np.minimum(90, np.maximum(np.abs(lo), np.abs(lo + self.h)) + self.h)
+        self.n_ra = np.maximum(1, np.floor(360*np.cos(np.radians(far))/self.h)).astype(np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.n_ra)])
+        self.n_cells = int(self.offsets[-1])
+
+    def zone(self, dec):
+        return np.clip(np.floor((np.asarray(dec) + 90)/self.h).astype(np.int64), 0, self.n_zones-1)
+
+    # Cell of right ascension ra (deg) in zone z.
+    def ra_cell(self, ra, z):
+        return np.floor(np.asarray(ra)*self.n_ra[z]/360).astype(np.int64) % self.n_ra[z]
+
+    def cell(self, ra, dec):
+        z = self.zone(dec)
+        return self.offsets[z] + self.ra_cell(ra, z)
+
+# The stars sorted by the cells of one grid.
+class _Level:
+
+    def __init__(self, grid, ra, dec):
+        self.grid = grid
+        cells = grid.cell(ra, dec)
+        self.order = np.lexsort((ra, cells))
+        self.ra = ra[self.order]
+        self.starts = np.searchsorted(cells[self.order], np.arange(grid.n_cells+1))
+
+    # Candidate cells of each query: the cell of the query and its neighbours, in the zones above and below too.
+    # Returns (query number, sorted position of the first star, number of stars) for every distinct candidate cell.
+    def neighbours(self, ra, dec):
+        grid = self.grid
+        z = grid.zone(dec)
+        queries, cells = [], []
+        for dz in (-1, 0, 1):
+            zz = z + dz
+            inside = (zz >= 0) & (zz < grid.n_zones)
+            q = inside.nonzero()[0]
+            zz = zz[q]
+            c = grid.ra_cell(ra[q], zz)
+            for dc in (-1, 0, 1):
+                # In the zones with fewer than 3 cells, the neighbours wrap around onto the same cells: keep each cell once.
+                keep = (dc == 0) | (grid.n_ra[zz] >= 3) | ((dc == 1) & (grid.n_ra[zz] == 2))
+                queries.append(q[keep])
+                cells.append(grid.offsets[zz[keep]] + (c[keep] + dc) % grid.n_ra[zz[keep]])
+        queries = np.concatenate(queries)
+        cells = np.concatenate(cells)
+        order = np.argsort(queries, kind='stable')
+        queries, cells = queries[order], cells[order]
+        starts = self.starts[cells]
+        return queries, starts, self.starts[cells+1] - starts
+
+class SkyIndex:
+
+    # ra, dec: positions of the stars (deg), hip: their HIP numbers. Stars without a position are left out.
+    # cell: height of the zones (deg), by default such that a cell holds about 1.5 stars on average.
+    def __init__(self, ra, dec, hip, cell=None):
+        ra = np.asarray(ra, dtype=float) % 360
+        dec = np.asarray(dec, dtype=float)
+        keep = np.isfinite(ra) & np.isfinite(dec)
+        ra, dec, hip = ra[keep], dec[keep], np.asarray(hip)[keep]
+        if cell is None:
+            cell = min(10.0, max(0.05, math.sqrt(41253*1.5/max(len(ra), 1))))
+        self._levels = [_Level(_Grid(cell), ra, dec)]
+        order = self._levels[0].order
+        self.hip = hip[order]
+        self.ra = ra[order]
+        self.dec = dec[order]
+        self.xyz = _unit(self.ra, self.dec)
+        self._positions = (ra, dec)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.hip)
+
+    # The level of grid number n (each 4 times coarser than the previous one), in the order of the stars of level 0.
+    def _level(self, n):
+        with self._lock:
+            while len(self._levels) <= n:
+                ra, dec = self._positions
+                level = _Level(_Grid(self._levels[-1].grid.h*4), ra, dec)
+                # Express the order of the new level in the sorted positions of level 0.
+                rank = np.empty(len(ra), dtype=np.int64)
+                rank[self._levels[0].order] = np.arange(len(ra))
+                level.order = rank[level.order]
+                self._levels.append(level)
+        return self._levels[n]
+
+    # Stars within radius (deg) of one position (deg), sorted by separation.
+    # Returns the HIP numbers and the separations (deg).
+    def cone_search(self, ra, dec, radius):
+        level = self._levels[0]
+        grid = level.grid
+        ra, dec, radius = float(ra) % 360, float(dec), float(radius)
+        if dec + radius >= 90 or dec - radius <= -90:
+            half_width = 180.0
+        else:
+            half_width = math.degrees(math.asin(min(1.0, math.sin(math.radians(radius))/math.cos(math.radians(dec)))))
+        pieces = []
+        for z in range(int(grid.zone(dec - radius)), int(grid.zone(dec + radius)) + 1):
+            start, stop = level.starts[grid.offsets[z]], level.starts[grid.offsets[z+1]]
+            if half_width >= 180:
+                pieces.append(np.arange(start, stop))
+                continue
+            zone_ra = level.ra[start:stop]
+            lo, hi = (ra - half_width) % 360, (ra + half_width) % 360
+            if lo <= hi:
+                ranges = [(lo, hi)]
+            else:
+                ranges = [(lo, 360.0), (0.0, hi)]
+            for a, b in ranges:
+                pieces.append(np.arange(start + np.searchsorted(zone_ra, a, 'left'), start + np.searchsorted(zone_ra, b, 'right')))
+        rows = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int64)
+        target = _unit(ra, dec)
+        cos_sep = self.xyz[rows] @ target
+        inside = cos_sep >= math.cos(math.radians(radius))
+        rows, cos_sep = rows[inside], cos_sep[inside]
+        rows = rows[np.argsort(-cos_sep, kind='stable')]
+        return self.hip[rows], _separation(self.xyz[rows], target)
+
+    # Nearest star of each of many positions (deg, arrays of the same shape).
+    # Returns the HIP numbers and the separations (deg), -1 and NaN where the separation is larger than max_separation.
+    def nearest(self, ra, dec, max_separation=None, chunk=10000):
+        ra, dec = np.broadcast_arrays(np.asarray(ra, dtype=float) % 360, np.asarray(dec, dtype=float))
+        shape = ra.shape
+        ra, dec = ra.ravel(), dec.ravel()
+        best = np.full(len(ra), -1, dtype=np.int64)
+        if not len(self):  # no star: none is found
+            return best.reshape(shape), np.full(shape, np.nan)
+        for start in range(0, len(ra), chunk):
+            part = slice(start, start + chunk)
+            best[part] = self._nearest(ra[part], dec[part])
+        found = best >= 0
+        hip = np.where(found, self.hip[np.maximum(best, 0)], -1)
+        separation = np.where(found, _separation(self.xyz[np.maximum(best, 0)], _unit(ra, dec)), np.nan)
+        if max_separation is not None:
+            far = ~(separation <= max_separation)
+            hip[far] = -1
+            separation[far] = np.nan
+        return hip.reshape(shape), separation.reshape(shape)
+
+    def _nearest(self, ra, dec):
+        xyz = _unit(ra, dec)
+        best = np.full(len(ra), -1, dtype=np.int64)
+        cos_best = np.full(len(ra), -2.0)
+        todo = (np.isfinite(ra) & np.isfinite(dec)).nonzero()[0]
+        n = 0
+        # The nearest star found in the neighbouring cells is the true one if it is closer than the height of the cells;
+        # otherwise the query is repeated on a coarser grid, and finally against all the stars.
+        while len(todo) and n < 3 and len(self):
+            level = self._level(n)
+            todo = todo[np.argsort(level.grid.cell(ra[todo], dec[todo]), kind='stable')]  # neighbouring queries read neighbouring stars
+            queries, starts, counts = level.neighbours(ra[todo], dec[todo])
+            total = counts.sum()
+            if total:
+                owner = np.repeat(queries, counts)
+                first = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+                rows = level.order[first + np.arange(total)] if n else first + np.arange(total)
+                cos_sep = np.einsum('ij,ij->i', self.xyz[rows], xyz[todo[owner]])
+                # Largest cosine of each query: the candidates of one query are contiguous, as the queries are sorted.
+                segments = np.concatenate([[0], (owner[1:] != owner[:-1]).nonzero()[0] + 1])
+                found = owner[segments]
+                largest = np.maximum.reduceat(cos_sep, segments)
+                hits = (cos_sep == np.repeat(largest, np.diff(np.append(segments, total)))).nonzero()[0]
+                hits = hits[np.concatenate([[True], owner[hits[1:]] != owner[hits[:-1]]])]  # the first one of each query
+                best[todo[found]] = rows[hits]
+                cos_best[todo[found]] = largest
+            done = cos_best[todo] >= math.cos(math.radians(level.grid.h))
+            todo = todo[~done]
+            n += 1
+        for i in todo:
+            cos_sep = self.xyz @ xyz[i]
+            best[i] = np.argmax(cos_sep)
+        return best
+
+def _unit(ra, dec):
+    ra, dec = np.radians(ra), np.radians(dec)
+    return np.stack([np.cos(dec)*np.cos(ra), np.cos(dec)*np.sin(ra), np.sin(dec)], axis=-1)
+
+# Angular distance (deg) between unit vectors, from the chord, accurate down to small separations.
+def _separation(a, b):
+    return np.degrees(2*np.arcsin(np.clip(np.linalg.norm(a - b, axis=-1)/2, 0, 1)))
+
+def _deg(x):
+    return u.Quantity(x, u.deg).value
+
+_indexes = {}
+_lock = threading.Lock()
+
+# Spatial index of the local catalogue (see catalogue.ingest), at J1991.25 or propagated to epoch (Julian year).
+# Stars without a positive parallax are moved by their proper motion only; radial velocities are taken as rv0.
+def index(epoch=None):
+    from . import catalogue
+    store = catalogue.local()
+    if store is None:
+        raise LookupError('The catalogue has not been ingested, see catalogue.ingest.')
+    key = (store.path, None if epoch is None else float(epoch))
+    with _lock:
+        sky = _indexes.get(key)
+        if sky is None or sky._store is not store:
+            ra, dec = np.asarray(store['ra']), np.asarray(store['dec'])
+            if epoch is not None:
+                from . import propagate
+                # The direction of a star moved by its proper motion does not depend on its distance when rv = 0.
+                parallax = np.asarray(store['parallax'])
+                parallax = np.where(parallax > 0, parallax, 1.0)
+                astrometry = np.column_stack([ra, dec, parallax, np.asarray(store['pmra']), np.asarray(store['pmdec'])])
+                astrometry[:,3:] = np.nan_to_num(astrometry[:,3:])
+                state = propagate.propagate_many(astrometry, float(epoch))
+                ra, dec = state['ra'].value[:,0], state['dec'].value[:,0]
+            sky = SkyIndex(ra, dec, store['hip'].astype(np.int32))  # the HIP numbers are stored as text
+            sky._store = store
+            _indexes[key] = sky
+    return sky
+
+# HIP numbers and separations (Quantity, deg) of the catalogue stars within radius of (ra, dec), nearest first.
+# ra, dec and radius are in degrees, or Quantities.
+def cone_search(ra, dec, radius, epoch=None):
+    hip, separation = index(epoch).cone_search(_deg(ra), _deg(dec), _deg(radius))
+    return hip, separation*u.deg
+
+# Nearest catalogue star of each of many positions: HIP numbers and separations (Quantity, deg),
+# -1 and NaN where the nearest star is farther than max_separation.
+def nearest(ra, dec, epoch=None, max_separation=None):
+    max_separation = None if max_separation is None else _deg(max_separation)
+    hip, separation = index(epoch).nearest(_deg(ra), _deg(dec), max_separation)
+    return hip, separation*u.deg
@@ -0,0 +1,177 @@
+import numpy as np
+from astropy import units as u
+
+# Five-parameter astrometric re-solution from the intermediate astrometric data (IAD). The abscissa residuals of the IAD
+# are relative to the catalogue solution, so the weighted least-squares fit of
+#     absc_residual = Σ (absc/p) Δp,    p = ra*, dec, parallax, pmra, pmdec
+# gives the corrections Δp (mas, mas/yr) to the catalogue values, with their covariance and the χ² of the fit.
+# The FAST and NDAC abscissae of one orbit are correlated (absc_corr): each such pair is decorrelated through the
+# Cholesky factor of its 2×2 correlation matrix before the normal equations are formed.
+#
+# Stars are solved in batches: the normal equations of all the records of a batch are formed at once and summed per
+# star (np.add.reduceat), and the 5×5 systems of all the stars of the batch are solved together.
+#
+#   hipy.solve.solve('HIP 27989')                 # one star
+#   hipy.solve.solve_many()                       # every star of the local IAD store (see intermediate.ingest)
+derivatives = ('absc/ra','absc/dec','absc/parallax','absc/pmra','absc/pmdec')
+parameters = ('ra','dec','parallax','pmra','pmdec')
+_fields = ('orbit_number','source_absc') + derivatives + ('absc_residual','absc_error','absc_corr')
+
+names = (('hip','n_obs','n_rejected') + parameters + tuple(f'delta_{p}' for p in parameters) + tuple(f'{p}_error' for p in parameters) +
+         ('covariance','chi2','dof') + tuple(f'{p}_error_catalogue' for p in parameters))
+meta = {'hip':'Hipparcos Catalogue(HIP) identifier', 'n_obs':'Number of abscissae used', 'n_rejected':'Number of abscissae rejected',
+        'ra':'Right ascension at J1991.25 (ICRS)', 'dec':'Declination at J1991.25 (ICRS)', 'parallax':'Trigonometric parallax',
+        'pmra':'Proper motion mu_alpha.cos(delta)', 'pmdec':'Proper motion mu_delta',
+        'delta_ra':'Correction to the catalogue ra, times cos(dec)', 'delta_dec':'Correction to the catalogue dec',
+        'delta_parallax':'Correction to the catalogue parallax', 'delta_pmra':'Correction to the catalogue pmra',
+        'delta_pmdec':'Correction to the catalogue pmdec',
+        'ra_error':'Standard error of ra*cos(dec)', 'dec_error':'Standard error of dec', 'parallax_error':'Standard error of parallax',
+        'pmra_error':'Standard error of pmra', 'pmdec_error':'Standard error of pmdec',
+        'covariance':'Covariance of (ra*, dec, parallax, pmra, pmdec), in mas and mas/yr',
+        'chi2':'Chi-square of the fit', 'dof':'Degrees of freedom of the fit (n_obs - 5)'}
+for p in parameters:
+    meta[f'{p}_error_catalogue'] = f'Standard error of {p} in the catalogue'
+units = {'ra':u.deg, 'dec':u.deg, 'parallax':u.mas, 'pmra':u.mas/u.yr, 'pmdec':u.mas/u.yr,
+         'delta_ra':u.mas, 'delta_dec':u.mas, 'delta_parallax':u.mas, 'delta_pmra':u.mas/u.yr, 'delta_pmdec':u.mas/u.yr}
+for p in parameters:
+    units[f'{p}_error'] = units[f'{p}_error_catalogue'] = units[f'delta_{p}']
+
+# Design matrix and residuals, in units of the abscissa errors, with the correlated pairs of abscissae decorrelated and
+# the abscissae that are not good set to zero. starts: first row of each star.
+def _whiten(columns, starts, good):
+    sigma = np.asarray(columns['absc_error'], dtype=float)
+    A = np.stack([columns[name] for name in derivatives], axis=1)/sigma[:,None]
+    r = columns['absc_residual']/sigma
+    orbit = np.asarray(columns['orbit_number'])
+    rho = np.asarray(columns['absc_corr'], dtype=float)
+    first = np.zeros(len(r), dtype=bool)
+    first[starts] = True
+    pair = np.zeros(len(r), dtype=bool)
+    with np.errstate(invalid='ignore'):
+        pair[1:] = ~first[1:] & (orbit[1:] == orbit[:-1]) & good[1:] & good[:-1] & (np.abs(rho[1:]) < 1)
+    i = pair.nonzero()[0]
+    s = np.sqrt(1 - rho[i]**2)
+    A[i] = (A[i] - rho[i,None]*A[i-1])/s[:,None]
+    r[i] = (r[i] - rho[i]*r[i-1])/s
+    A[~good] = 0
+    r[~good] = 0
+    return A, r
+
+# Corrections, covariances and χ² of the stars of one batch of records (see solve_many).
+# use_flags: leave out the abscissae rejected by their consortium (source_absc f or n).
+# clip: then leave out, iteratively, the abscissae whose post-fit residual exceeds clip times their error.
+def _solve_batch(columns, starts, use_flags=True, clip=None, max_iter=10):
+    n = len(columns['absc_residual'])
+    lengths = np.diff(np.append(starts, n))
+    star = np.repeat(np.arange(len(starts)), lengths)
+    source = np.asarray(columns['source_absc'])
+    good = np.isfinite(columns['absc_residual']) & (columns['absc_error'] > 0)
+    if use_flags:
+        good &= (source == 'F') | (source == 'N')
+    for iteration in range(max_iter if clip else 1):
+        A, r = _whiten(columns, starts, good)
+        N = np.add.reduceat(A[:,:,None]*A[:,None,:], starts)
+        b = np.add.reduceat(A*r[:,None], starts)
+        n_obs = np.add.reduceat(good.astype(np.int64), starts)
+        solvable = (n_obs >= 5) & (np.linalg.matrix_rank(N) == 5)
+        N[~solvable] = np.eye(5)
+        cov = np.linalg.inv(N)
+        x = np.einsum('ijk,ik->ij', cov, b)
+        e = r - np.einsum('ij,ij->i', A, x[star])
+        chi2 = np.add.reduceat(e*e, starts)
+        if not clip:
+            break
+        model = np.einsum('ij,ij->i', np.stack([columns[name] for name in derivatives], axis=1), x[star])
+        with np.errstate(invalid='ignore'):
+            keep = good & (np.abs(columns['absc_residual'] - model) <= clip*columns['absc_error'])
+        if (keep == good).all():
+            break
+        good = keep
+    x[~solvable] = np.nan
+    cov[~solvable] = np.nan
+    chi2[~solvable] = np.nan
+    return x, cov, chi2, n_obs, lengths - n_obs
+
+# Batches of at most chunk_rows records (whole stars): HIP numbers, catalogue parameters, columns of the records and
+# first row of each star. Consecutive stars of the local store are slices of its memory maps (no copy).
+def _batches(hips, chunk_rows, fetch=None):
+    from . import cache, intermediate, download
+    fetch = cache.fetch if fetch is None else fetch
+    store = intermediate.local()
+    batch, rows = [], 0
+    for hip in list(hips) + [None]:
+        if hip is not None:
+            p, records = download._intermediate_records(hip, fetch)
+            batch.append((hip, p, records))
+            rows += len(records['absc_residual'])
+        if batch and (hip is None or rows >= chunk_rows):
+            slices = [store.records.slice(h) for h, p, records in batch] if store is not None and all(h in store for h, p, records in batch) else None
+            if slices and all(a.stop == b.start for a, b in zip(slices[:-1], slices[1:])):
+                columns = store.records.take(slice(slices[0].start, slices[-1].stop), _fields)
+            else:
+                columns = {name:np.concatenate([records[name] for h, p, records in batch]) for name in _fields}
+            lengths = [len(records['absc_residual']) for h, p, records in batch]
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+            yield [h for h, p, records in batch], np.array([p for h, p, records in batch], dtype=float), columns, starts, lengths
+            batch, rows = [], 0
+
+# Standard errors of the five parameters in the catalogue: from the local catalogue if it has been ingested, otherwise
+# from the catalogue tables of stars (Star objects, default: the hipId pages of hips), NaN where they cannot be found.
+def _catalogue_errors(hips, stars=None):
+    from . import catalogue, download
+    error_names = [f'{p}_error' for p in parameters]
+    store = catalogue.local()
+    if store is not None:
+        rows = store.rows(hips)
+        return np.stack([np.where(rows >= 0, store[name][np.maximum(rows, 0)], np.nan) for name in error_names], axis=1)
+    tables, errors = download.get_data_many(hips if stars is None else stars, 'catalogue')
+    return np.array([[np.nan]*5 if table is None else [table[name][0].value for name in error_names] for table in tables])
+
+# Re-solve the five astrometric parameters of many stars (default: every star of the local IAD store) from their
+# intermediate data, as a QTable (see names and meta). The records come from the local store if it has been ingested,
+# otherwise from the hipiId pages (through fetch, default cache.fetch). use_flags, clip: see _solve_batch.
+# compare: add the standard errors of the catalogue.
+def solve_many(hips=None, use_flags=True, clip=None, compare=True, chunk_rows=1 << 20, fetch=None):
+    from astropy.table import QTable
+    from . import intermediate
+    if hips is None:
+        store = intermediate.local()
+        if store is None:
+            raise LookupError('No local intermediate data: ingest them first (see intermediate.ingest), or give the HIP numbers.')
+        hips = store.hips()
+    hips = [int(hip) for hip in hips]
+    results = [(np.empty((0, 5)), np.empty((0, 5)), np.empty((0, 5, 5)), np.empty(0), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int64))]
+    for batch, p, columns, starts, lengths in _batches(hips, chunk_rows, fetch):
+        # The stars without records are left out of the batch, and get NaN.
+        n = len(batch)
+        x, cov, chi2 = np.full((n, 5), np.nan), np.full((n, 5, 5), np.nan), np.full(n, np.nan)
+        n_obs, n_rejected = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        filled = np.asarray(lengths) > 0
+        if filled.any():
+            x[filled], cov[filled], chi2[filled], n_obs[filled], n_rejected[filled] = _solve_batch(columns, starts[filled], use_flags, clip)
+        results.append((p, x, cov, chi2, n_obs, n_rejected))
+    p, x, cov, chi2, n_obs, n_rejected = (np.concatenate(c) for c in zip(*results))
+    columns = {'hip':np.array(hips), 'n_obs':n_obs, 'n_rejected':n_rejected,
+               'ra':p[:,0] + x[:,0]/np.cos(np.radians(p[:,1]))/3.6e6, 'dec':p[:,1] + x[:,1]/3.6e6,
+               'parallax':p[:,2] + x[:,2], 'pmra':p[:,3] + x[:,3], 'pmdec':p[:,4] + x[:,4],
+               'covariance':cov, 'chi2':chi2, 'dof':n_obs - 5}
+    errors = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    catalogue_errors = _catalogue_errors(hips) if compare else np.full((len(hips), 5), np.nan)
+    for i, name in enumerate(parameters):
+        columns[f'delta_{name}'] = x[:,i]
+        columns[f'{name}_error'] = errors[:,i]
+        columns[f'{name}_error_catalogue'] = catalogue_errors[:,i]
+    return QTable([columns[name]*units[name] if name in units else columns[name] for name in names], names=names, meta=meta)
+
+# Re-solve the five astrometric parameters of one star, as a QTable of one row (see solve_many).
+def solve(star_name, use_flags=True, clip=None, compare=True):
+    from .star import as_star
+    star = as_star(star_name)
+    out = solve_many([star.hip], use_flags, clip, compare=False, fetch=star._fetch)
+    if compare:
+        # From the catalogue table of the star, which is then kept.
+        catalogue_errors = _catalogue_errors([star.hip], [star])
+        for i, name in enumerate(parameters):
+            out[f'{name}_error_catalogue'] = catalogue_errors[:,i]*units[f'{name}_error_catalogue']
+    return out
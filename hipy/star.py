@@ -0,0 +1,84 @@
+import numbers
+import functools
+from . import cache
+from . import resolve
+
+# One Hipparcos star. Each ESA page is requested at most once per Star (see page), and each type of data is parsed
+# at most once, the first time it is used. get_data, get_dmsa, propagate, plot_motion.plot and plot_lightcurve.plot
+# accept a Star instead of a star name, so that they all share its pages and tables.
+#
+#   star = hipy.Star('HIP 27989')
+#   star.catalogue, star.intermediate, star.epoch_photometry, star.dmsa, star.astrometry
+class Star:
+
+    # star_name: a HIP number, 'HIP<number>', or any name known to Simbad.
+    def __init__(self, star_name):
+        if isinstance(star_name, numbers.Integral):
+            self.hip = int(star_name)
+            self.name = f'HIP {self.hip}'
+        else:
+            self.hip = resolve.resolve(star_name)
+            self.name = star_name
+        self._pages = {}
+
+    def __repr__(self):
+        return f'Star({self.name!r}, hip={self.hip})'
+
+    # Raw bytes of one ESA page (kind: hipId, hipiId, hipepId or dmId), fetched once and kept. limiter: see cache.download.
+    def page(self, kind, limiter=None):
+        if kind not in self._pages:
+            self._pages[kind] = cache.fetch(kind, self.hip, limiter)
+        return self._pages[kind]
+
+    # Same signature as cache.fetch, for the parsers.
+    def _fetch(self, kind, HIP):
+        return self.page(kind)
+
+    @functools.cached_property
+    def catalogue(self):
+        from . import download
+        return download._get_catalogue(self.hip, self._fetch)
+
+    @functools.cached_property
+    def _intermediate(self):
+        from . import download
+        return download._intermediate_records(self.hip, self._fetch)
+
+    @functools.cached_property
+    def intermediate(self):
+        from . import download
+        return download._intermediate_table(*self._intermediate, HIP=self.hip)
+
+    # Abscissa records of the intermediate data, as a structured array (see download.iad_dtype),
+    # or a dict of views of its columns if the intermediate data have been ingested (see intermediate.ingest).
+    @property
+    def intermediate_records(self):
+        return self._intermediate[1]
+
+    # ra, dec (deg), parallax (mas), pmra, pmdec (mas/yr) at J1991.25, from the intermediate data page.
+    @property
+    def astrometry(self):
+        return self._intermediate[0]
+
+    @functools.cached_property
+    def epoch_photometry(self):
+        from . import download
+        return download._get_epd(self.hip, self._fetch)
+
+    # Solution type in the Double and Multiple Systems Annex: C, G, O, V, X, or none for a single star.
+    # Read from the catalogue QTable if it has been built, otherwise from a structured array of the catalogue data.
+    @functools.cached_property
+    def dmsa_flag(self):
+        if 'catalogue' in self.__dict__:
+            return self.catalogue['dmsa_flag'][0]
+        from . import download
+        return download._get_catalogue(self.hip, self._fetch, 'numpy')['dmsa_flag'][0]
+
+    @functools.cached_property
+    def dmsa(self):
+        from . import dmsa
+        return dmsa._get_dmsa(self.hip, self.dmsa_flag, self._fetch)
+
+# A Star from a star name, or the Star itself.
+def as_star(star_name):
+    return star_name if isinstance(star_name, Star) else Star(star_name)